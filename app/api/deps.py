@@ -0,0 +1,26 @@
+from fastapi import Request
+
+from app.core.config import get_settings
+from app.services.jobs import JobManager
+from app.services.pipeline import ExtractionPipeline
+
+
+def get_pipeline(request: Request) -> ExtractionPipeline:
+    """Return the pipeline created in the application lifespan."""
+    return request.app.state.pipeline
+
+
+def get_job_manager(request: Request) -> JobManager:
+    """Return the job manager created in the application lifespan."""
+    return request.app.state.jobs
+
+
+def profiling_requested(request: Request) -> bool:
+    """Whether to profile this request (``X-Profile: 1`` or ``?profile=1``).
+
+    Always False unless profiling is enabled in the settings.
+    """
+    if not get_settings().profiling_enabled:
+        return False
+    flag = request.headers.get("x-profile") or request.query_params.get("profile") or ""
+    return flag.lower() in ("1", "true", "yes")
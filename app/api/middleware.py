@@ -0,0 +1,147 @@
+import json
+import logging
+import time
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.uploads import too_large
+from app.core.logging import REQUEST_ID
+from app.core.metrics import REQUEST_SECONDS, request_timings
+
+
+LOGGER = logging.getLogger("app.requests")
+
+
+class BodySizeLimitMiddleware:
+    """Reject request bodies larger than ``max_bytes`` before they are read.
+
+    A declared ``Content-Length`` over the limit is refused up front; chunked
+    bodies are counted as they arrive, so multipart parsing stops at the
+    limit instead of spooling the whole request first.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.max_bytes <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        declared = headers.get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > self.max_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Handled by FastAPI's exception handlers, body parsing
+                    # included, and turned into a 413 response.
+                    raise too_large(self.max_bytes)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    async def _reject(self, send: Send) -> None:
+        body = b'{"detail":"Request body too large"}'
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"connection", b"close"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+class RequestContextMiddleware:
+    """Tag each request with an id and log its stage timings as JSON.
+
+    The id comes from an ``X-Request-ID`` header or is generated, is echoed
+    in the response and shows up in every log line of the request. Stage
+    timings recorded anywhere during the request, thread pool work
+    included, are summed into one ``request`` log record and, for responses
+    sent after the work is done, a ``Server-Timing`` header.
+    """
+
+    QUIET_PATHS = ("/health", "/metrics")
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        supplied = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")
+        request_id = supplied[:64] or uuid.uuid4().hex
+        token = REQUEST_ID.set(request_id)
+        status = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Request-ID", request_id)
+                if timings:
+                    headers.append("Server-Timing", _server_timing(timings))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            with request_timings(join=False) as timings:
+                await self.app(scope, receive, send_with_id)
+        finally:
+            duration = time.perf_counter() - start
+            REQUEST_SECONDS.labels(scope["method"], _route_template(scope), str(status)).observe(
+                duration
+            )
+            if scope["path"] not in self.QUIET_PATHS:
+                LOGGER.info(
+                    json.dumps(
+                        {
+                            "event": "request",
+                            "request_id": request_id,
+                            "method": scope["method"],
+                            "path": scope["path"],
+                            "status": status,
+                            "duration_ms": round(duration * 1000, 1),
+                            "stages_ms": {
+                                stage: round(seconds * 1000, 1)
+                                for stage, seconds in sorted(timings.items())
+                            },
+                        }
+                    )
+                )
+            REQUEST_ID.reset(token)
+
+
+def _server_timing(timings: dict[str, float]) -> str:
+    return ", ".join(
+        f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in sorted(timings.items())
+    )
+
+
+def _route_template(scope: Scope) -> str:
+    """Matched route template (``/v1/jobs/{job_id}``), to bound label cardinality."""
+    # Routes of an included router keep their router-relative path; newer
+    # FastAPI releases record the prefixed one alongside.
+    effective = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(effective, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or "unmatched"
@@ -0,0 +1,138 @@
+"""Lean encoding of extraction results.
+
+Callers can trim a result (``raw_text_chars``, ``fields``) and pick its
+encoding: MessagePack when ``Accept`` prefers it, JSON otherwise. Results
+are dumped once to plain data and encoded with orjson when installed,
+skipping FastAPI's ``response_model`` round trip, which revalidates the
+whole model and re-encodes it through ``jsonable_encoder``. Compression is
+left to the GZip middleware.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+from fastapi import HTTPException, Query, Request
+from fastapi.responses import Response
+
+from app.domain.models import TARGET_FIELDS, BatchItemResult, ExtractionResult
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency guard
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency guard
+    msgpack = None
+
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+JSON_MEDIA_TYPES = ("application/json", "application/*", "*/*")
+
+
+@dataclass(frozen=True)
+class ResultView:
+    """Which parts of an :class:`ExtractionResult` a caller wants back.
+
+    ``raw_text_chars`` truncates ``raw_text`` (0 leaves it out) and
+    ``fields`` keeps only the named fields.
+    """
+
+    raw_text_chars: Optional[int] = None
+    fields: Optional[frozenset[str]] = None
+
+    @property
+    def _exclude(self) -> Optional[set[str]]:
+        return {"raw_text"} if self.raw_text_chars == 0 else None
+
+    def dump(self, result: ExtractionResult) -> dict[str, Any]:
+        return self._trim(result.model_dump(exclude=self._exclude))
+
+    def dump_batch_item(self, item: BatchItemResult) -> dict[str, Any]:
+        exclude = {"result": self._exclude} if self._exclude else None
+        data = item.model_dump(exclude=exclude)
+        if data["result"] is not None:
+            self._trim(data["result"])
+        return data
+
+    def headers(self, result: ExtractionResult) -> dict[str, str]:
+        """Report the full ``raw_text`` length when it was cut."""
+        if self.raw_text_chars is not None and len(result.raw_text or "") > self.raw_text_chars:
+            return {"X-Raw-Text-Length": str(len(result.raw_text or ""))}
+        return {}
+
+    def _trim(self, data: dict[str, Any]) -> dict[str, Any]:
+        if self.raw_text_chars and data.get("raw_text"):
+            data["raw_text"] = data["raw_text"][: self.raw_text_chars]
+        if self.fields is not None:
+            data["fields"] = [field for field in data["fields"] if field["name"] in self.fields]
+        return data
+
+
+def result_view(
+    raw_text_chars: Optional[int] = Query(
+        None, ge=0, description="Truncate raw_text to this many characters; 0 leaves it out"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated field names to return (all by default)"
+    ),
+) -> ResultView:
+    selected = None
+    if fields is not None:
+        selected = frozenset(name.strip() for name in fields.split(",") if name.strip())
+        unknown = selected.difference(TARGET_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=422, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+    return ResultView(raw_text_chars=raw_text_chars, fields=selected)
+
+
+def dumps_json(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def prefers_msgpack(accept: str) -> bool:
+    """Whether an ``Accept`` header ranks MessagePack at least as high as JSON."""
+    if msgpack is None:
+        return False
+    best = {"msgpack": 0.0, "json": 0.0}
+    for item in accept.split(","):
+        media_type, _, params = item.partition(";")
+        media_type = media_type.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type in MSGPACK_MEDIA_TYPES:
+            best["msgpack"] = max(best["msgpack"], quality)
+        elif media_type in JSON_MEDIA_TYPES:
+            best["json"] = max(best["json"], quality)
+    return best["msgpack"] > 0 and best["msgpack"] >= best["json"]
+
+
+def result_response(
+    request: Request,
+    result: ExtractionResult,
+    view: ResultView,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Encode ``result`` as the caller asked; see the module docstring."""
+    data = view.dump(result)
+    headers = {**(headers or {}), **view.headers(result), "Vary": "Accept"}
+    if prefers_msgpack(request.headers.get("accept", "")):
+        return Response(
+            msgpack.packb(data, use_bin_type=True),
+            media_type=MSGPACK_MEDIA_TYPES[0],
+            headers=headers,
+        )
+    return Response(dumps_json(data), media_type="application/json", headers=headers)
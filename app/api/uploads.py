@@ -0,0 +1,66 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def too_large(limit: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Upload exceeds the {limit} byte limit")
+
+
+async def spool_chunks(
+    chunks: AsyncIterator[bytes],
+    suffix: str = "",
+    max_bytes: Optional[int] = None,
+    directory: Optional[str] = None,
+) -> Path:
+    """Write ``chunks`` to a temporary file and return its path.
+
+    Raises 413 as soon as more than ``max_bytes`` have arrived, so an
+    oversized upload is never fully received. The caller owns the file and
+    must remove it with :func:`discard`.
+    """
+    settings = get_settings()
+    max_bytes = max_bytes or settings.upload_max_bytes
+    fd, name = tempfile.mkstemp(suffix=suffix, dir=directory or settings.upload_spool_dir)
+    path = Path(name)
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise too_large(max_bytes)
+                await run_in_threadpool(handle.write, chunk)
+    except BaseException:
+        discard(path)
+        raise
+    return path
+
+
+async def spool_upload(
+    upload: UploadFile,
+    max_bytes: Optional[int] = None,
+    directory: Optional[str] = None,
+) -> Path:
+    """Spool a multipart upload to its own file, keeping the extension."""
+
+    async def chunks() -> AsyncIterator[bytes]:
+        while chunk := await upload.read(CHUNK_SIZE):
+            yield chunk
+
+    suffix = Path(upload.filename or "").suffix
+    return await spool_chunks(chunks(), suffix, max_bytes, directory)
+
+
+def discard(path: Optional[Path]) -> None:
+    if path is not None:
+        path.unlink(missing_ok=True)
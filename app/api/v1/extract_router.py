@@ -1,27 +1,205 @@
-from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import AsyncIterator
 
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_pipeline, profiling_requested
+from app.api.responses import ResultView, dumps_json, result_response, result_view
+from app.api.uploads import discard, spool_chunks, spool_upload
+from app.core.config import get_settings
+from app.core.profiling import ProfileSession, profile_request
 from app.domain.models import ExtractionResult
-from app.services.pipeline import run_extraction
+from app.services.batch import BatchLimitError, expand_zip, is_zip, iter_batch_results
+from app.services.pipeline import ExtractionPipeline
 
 
 router = APIRouter(prefix="/extract", tags=["extract"])
 
 
-@router.post("/", response_model=ExtractionResult)
+def _result_headers(
+    result: ExtractionResult, session: ProfileSession | None = None
+) -> dict[str, str]:
+    """Report how many fields each stage resolved, and how profiling went."""
+    headers = {
+        f"X-Fields-{source.capitalize()}": str(
+            sum(1 for field in result.fields if field.source == source)
+        )
+        for source in ("regex", "llm")
+    }
+    if session is not None:
+        headers["X-Profile-Status"] = session.status
+        if session.path is not None:
+            headers["X-Profile-ID"] = session.id
+    return headers
+
+
+@router.post(
+    "/",
+    response_model=ExtractionResult,
+    responses={200: {"content": {"application/msgpack": {}}}},
+)
 async def extract_contract(
+    request: Request,
     file: UploadFile = File(...),
     document_type: str = Query("kira_sozlesmesi"),
     document_type_body: str | None = Form(None),
-) -> ExtractionResult:
+    no_cache: bool = Query(False, description="Bypass the LLM response cache"),
+    pipeline: ExtractionPipeline = Depends(get_pipeline),
+    profile: bool = Depends(profiling_requested),
+    view: ResultView = Depends(result_view),
+) -> Response:
+    """Extract one uploaded document.
+
+    ``raw_text_chars`` and ``fields`` trim the result; ``Accept:
+    application/msgpack`` returns it as MessagePack instead of JSON.
+    """
+    # The upload is spooled to disk and handed over by path, so the document
+    # is never held in memory as a whole.
+    path = await spool_upload(file)
+    try:
+        # Saved under X-Profile-ID; see GET /v1/profiles/{profile_id}.
+        with profile_request(profile) as session:
+            result = await pipeline.run_async(
+                path,
+                filename=file.filename,
+                document_type=document_type_body or document_type,
+                use_llm_cache=not no_cache,
+            )
+    finally:
+        discard(path)
+    return result_response(request, result, view, _result_headers(result, session))
+
+
+@router.post(
+    "/pdf",
+    response_model=ExtractionResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/pdf": {"schema": {"type": "string", "format": "binary"}}},
+        }
+    },
+    responses={200: {"content": {"application/msgpack": {}}}},
+)
+async def extract_pdf(
+    request: Request,
+    filename: str = Query("document.pdf", description="Name reported for the document"),
+    document_type: str = Query("kira_sozlesmesi"),
+    no_cache: bool = Query(False, description="Bypass the LLM response cache"),
+    pipeline: ExtractionPipeline = Depends(get_pipeline),
+    profile: bool = Depends(profiling_requested),
+    view: ResultView = Depends(result_view),
+) -> Response:
+    """Extract a PDF sent as the raw request body.
+
+    Skips multipart parsing entirely: the body is streamed straight to a
+    spooled file as it arrives. Response options as for ``POST /extract/``.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type != "application/pdf":
+        raise HTTPException(status_code=415, detail="Content-Type must be application/pdf")
+    if not filename.lower().endswith(".pdf"):
+        filename = f"{filename}.pdf"
+
+    path = await spool_chunks(request.stream(), suffix=".pdf")
     try:
-        file_bytes = await file.read()
-    except Exception as exc:  # pragma: no cover - FastAPI handles exceptions
-        raise HTTPException(status_code=400, detail="Invalid file upload") from exc
+        with profile_request(profile) as session:
+            result = await pipeline.run_async(
+                path,
+                filename=filename,
+                document_type=document_type,
+                use_llm_cache=not no_cache,
+            )
+    finally:
+        discard(path)
+    return result_response(request, result, view, _result_headers(result, session))
 
-    selected_document_type = document_type_body or document_type
 
-    return run_extraction(
-    file_bytes=file_bytes,
-    document_type=selected_document_type,
-    filename=file.filename,
+@router.post(
+    "/batch",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
 )
+async def extract_batch(
+    files: list[UploadFile] = File(...),
+    document_type: str = Query("kira_sozlesmesi"),
+    document_type_body: str | None = Form(None),
+    no_cache: bool = Query(False, description="Bypass the LLM response cache"),
+    pipeline: ExtractionPipeline = Depends(get_pipeline),
+    view: ResultView = Depends(result_view),
+) -> StreamingResponse:
+    """Extract many documents (or ZIP archives of documents) in one request.
+
+    Results are streamed as NDJSON ``BatchItemResult`` lines in completion
+    order; ``index`` refers to the position in the expanded document list.
+    ``raw_text_chars`` and ``fields`` trim each result.
+    """
+    settings = get_settings()
+    # Uploads and ZIP members are spooled here; removed once the stream ends.
+    workdir = tempfile.mkdtemp(prefix="batch-", dir=settings.upload_spool_dir)
+    documents: list[tuple[str | None, Path]] = []
+    try:
+        for upload in files:
+            path = await spool_upload(upload, directory=workdir)
+            if is_zip(upload.filename, upload.content_type):
+                try:
+                    documents.extend(
+                        await pipeline.worker_pools.run_io(
+                            expand_zip,
+                            path,
+                            workdir,
+                            settings.batch_max_documents - len(documents),
+                            settings.upload_max_bytes,
+                        )
+                    )
+                except zipfile.BadZipFile as exc:
+                    raise HTTPException(
+                        status_code=400, detail=f"Invalid ZIP archive: {upload.filename}"
+                    ) from exc
+                except BatchLimitError as exc:
+                    raise HTTPException(status_code=413, detail=str(exc)) from exc
+                finally:
+                    discard(path)
+            else:
+                documents.append((upload.filename, path))
+
+            # Checked per upload so that no more is spooled past the limit.
+            if len(documents) > settings.batch_max_documents:
+                raise HTTPException(
+                    status_code=413,
+                    detail=(
+                        f"Batch holds more than {settings.batch_max_documents} documents"
+                    ),
+                )
+    except BaseException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+
+    async def ndjson() -> AsyncIterator[bytes]:
+        try:
+            async for item in iter_batch_results(
+                pipeline,
+                documents,
+                document_type_body or document_type,
+                settings.batch_max_concurrency,
+                use_llm_cache=not no_cache,
+            ):
+                yield dumps_json(view.dump_batch_item(item)) + b"\n"
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi.responses import JSONResponse
+
+from app.api.deps import get_job_manager
+from app.api.uploads import discard, spool_upload
+from app.domain.models import JobInfo
+from app.services.jobs import JobManager, JobQueueFullError
+
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.post("", response_model=JobInfo, status_code=202)
+async def create_job(
+    file: UploadFile = File(...),
+    document_type: str = Query("kira_sozlesmesi"),
+    document_type_body: str | None = Form(None),
+    no_cache: bool = Query(False, description="Bypass the LLM response cache"),
+    jobs: JobManager = Depends(get_job_manager),
+) -> JobInfo:
+    # The job takes ownership of the spooled file and removes it when done.
+    path = await spool_upload(file)
+    try:
+        job = jobs.submit(
+            path,
+            filename=file.filename,
+            document_type=document_type_body or document_type,
+            use_llm_cache=not no_cache,
+        )
+    except JobQueueFullError as exc:
+        discard(path)
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Job queue is full"},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+    return job.to_info()
+
+
+@router.get("/{job_id}", response_model=JobInfo)
+async def get_job(job_id: str, jobs: JobManager = Depends(get_job_manager)) -> JobInfo:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job.to_info()
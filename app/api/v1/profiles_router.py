@@ -0,0 +1,32 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, PlainTextResponse, Response
+
+from app.core.config import get_settings
+from app.core.profiling import profile_path, render_profile
+
+
+router = APIRouter(prefix="/profiles", tags=["debug"])
+
+
+@router.get("/{profile_id}", response_class=Response)
+async def get_profile(
+    profile_id: str,
+    format: str = Query("pstats", pattern="^(pstats|text)$"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|ncalls)$"),
+) -> Response:
+    """Profile captured for a request sent with ``X-Profile: 1``.
+
+    ``profile_id`` is the ``X-Profile-ID`` header of that request's response.
+
+    ``pstats`` returns the raw file for ``pstats``/snakeviz/flameprof;
+    ``text`` returns the top functions as plain text.
+    """
+    path = profile_path(profile_id) if get_settings().profiling_enabled else None
+    if path is None or not path.is_file():
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "text":
+        return PlainTextResponse(await run_in_threadpool(render_profile, path, sort))
+    return FileResponse(
+        path, media_type="application/octet-stream", filename=f"{profile_id}.prof"
+    )
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -7,10 +7,93 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     ollama_base_url: str = Field("http://localhost:11434", env="OLLAMA_BASE_URL")
+    # Several Ollama hosts (JSON list); overrides ollama_base_url when set.
+    ollama_base_urls: list[str] = Field(default_factory=list, env="OLLAMA_BASE_URLS")
     ollama_model: str = Field("llama3.1:8b", env="OLLAMA_MODEL")
+    ollama_pool_size: int = Field(10, env="OLLAMA_POOL_SIZE")
+    ollama_connect_timeout: float = Field(3.0, env="OLLAMA_CONNECT_TIMEOUT")
+    ollama_read_timeout: float = Field(30.0, env="OLLAMA_READ_TIMEOUT")
+    # A host is ejected after this many consecutive failures and probed
+    # every ollama_probe_interval seconds until it answers again.
+    ollama_failure_threshold: int = Field(3, env="OLLAMA_FAILURE_THRESHOLD")
+    ollama_eject_seconds: float = Field(30.0, env="OLLAMA_EJECT_SECONDS")
+    ollama_probe_interval: float = Field(5.0, env="OLLAMA_PROBE_INTERVAL")
+    # Send a second copy of a call to another host once it has run longer
+    # than this latency percentile (e.g. 95); unset disables hedging.
+    ollama_hedge_percentile: Optional[float] = Field(default=None, env="OLLAMA_HEDGE_PERCENTILE")
+    ollama_hedge_min_samples: int = Field(20, env="OLLAMA_HEDGE_MIN_SAMPLES")
+    ollama_stream: bool = Field(True, env="OLLAMA_STREAM")
+    # "schema" sends a JSON schema of the requested fields, "json" plain JSON
+    # mode, and an empty string leaves the output format unconstrained.
+    ollama_format: str = Field("schema", env="OLLAMA_FORMAT")
+    ollama_options: dict[str, Any] = Field(default_factory=dict, env="OLLAMA_OPTIONS")
+    llm_context_token_budget: int = Field(2000, env="LLM_CONTEXT_TOKEN_BUDGET")
+    llm_context_window_chars: int = Field(300, env="LLM_CONTEXT_WINDOW_CHARS")
+    llm_cache_enabled: bool = Field(True, env="LLM_CACHE_ENABLED")
+    llm_cache_ttl_seconds: float = Field(24 * 3600, env="LLM_CACHE_TTL_SECONDS")
+    llm_cache_memory_bytes: int = Field(16 * 1024 * 1024, env="LLM_CACHE_MEMORY_BYTES")
+    llm_cache_dir: Optional[str] = Field(default=None, env="LLM_CACHE_DIR")
+    llm_cache_disk_bytes: int = Field(256 * 1024 * 1024, env="LLM_CACHE_DISK_BYTES")
+    # "tesseract" (pytesseract subprocess) or "tesserocr" (warm in-process API).
     ocr_engine: str = Field("tesseract", env="OCR_ENGINE")
     tesseract_cmd: Optional[str] = Field(default=None, env="TESSERACT_CMD")
     tesseract_lang: str = Field("tur+eng", env="TESSERACT_LANG")
+    tessdata_dir: Optional[str] = Field(default=None, env="TESSDATA_DIR")
+    ocr_dpi: int = Field(400, env="OCR_DPI")
+    # Adaptive OCR: render at the first DPI, re-render at the next one while
+    # mean OCR confidence (0-1) stays below the threshold. Empty derives the
+    # steps from ocr_dpi (half, three quarters, full); a single value renders
+    # once at that DPI.
+    ocr_dpi_steps: list[int] = Field(default_factory=list, env="OCR_DPI_STEPS")
+    ocr_escalation_confidence: float = Field(0.8, env="OCR_ESCALATION_CONFIDENCE")
+    # Skip blank pages and crop to the text area before OCR.
+    ocr_preprocess: bool = Field(True, env="OCR_PREPROCESS")
+    # Blank when under this share of the page is ink, or when that darkest
+    # share is within ocr_blank_min_contrast grey levels of the background.
+    ocr_blank_ink_ratio: float = Field(0.0001, env="OCR_BLANK_INK_RATIO")
+    ocr_blank_min_contrast: float = Field(40.0, env="OCR_BLANK_MIN_CONTRAST")
+    ocr_deskew: bool = Field(False, env="OCR_DESKEW")
+    ocr_binarize: bool = Field(False, env="OCR_BINARIZE")
+    # Retry words below this OCR confidence (0-1) on an upscaled crop of the
+    # same render (no new pixels, just a size Tesseract reads better); 0
+    # disables. At most ocr_upscale_retry_max_words words per page. Unset,
+    # it is on (0.6) for tesserocr and off for tesseract, where every retried
+    # word would start another tesseract process.
+    ocr_upscale_retry_confidence: Optional[float] = Field(
+        default=None, env="OCR_UPSCALE_RETRY_CONFIDENCE"
+    )
+    ocr_upscale_retry_scale: float = Field(2.0, env="OCR_UPSCALE_RETRY_SCALE")
+    ocr_upscale_retry_max_words: int = Field(24, env="OCR_UPSCALE_RETRY_MAX_WORDS")
+    ocr_max_pages_in_flight: int = Field(4, env="OCR_MAX_PAGES_IN_FLIGHT")
+    # Pages per OCR pool task; a task renders its pages and reads them as
+    # one batch on the worker's engine (one warm tesserocr API per worker).
+    ocr_pages_per_task: int = Field(1, env="OCR_PAGES_PER_TASK")
+    artifact_cache_enabled: bool = Field(True, env="ARTIFACT_CACHE_ENABLED")
+    artifact_cache_memory_bytes: int = Field(64 * 1024 * 1024, env="ARTIFACT_CACHE_MEMORY_BYTES")
+    artifact_cache_dir: Optional[str] = Field(default=None, env="ARTIFACT_CACHE_DIR")
+    artifact_cache_disk_bytes: int = Field(1024 * 1024 * 1024, env="ARTIFACT_CACHE_DISK_BYTES")
+    # Responses at least this large are gzipped for clients that accept it;
+    # level 0 turns compression off.
+    gzip_min_bytes: int = Field(1024, env="GZIP_MIN_BYTES")
+    gzip_level: int = Field(6, env="GZIP_LEVEL")
+    upload_max_bytes: int = Field(256 * 1024 * 1024, env="UPLOAD_MAX_BYTES")
+    # Cap on a whole request body; batches may carry several uploads.
+    request_max_bytes: int = Field(1024 * 1024 * 1024, env="REQUEST_MAX_BYTES")
+    upload_spool_dir: Optional[str] = Field(default=None, env="UPLOAD_SPOOL_DIR")
+    # Identical extractions in flight at the same time share one computation.
+    coalesce_requests: bool = Field(True, env="COALESCE_REQUESTS")
+    batch_max_concurrency: int = Field(4, env="BATCH_MAX_CONCURRENCY")
+    batch_max_documents: int = Field(500, env="BATCH_MAX_DOCUMENTS")
+    jobs_queue_size: int = Field(100, env="JOBS_QUEUE_SIZE")
+    jobs_workers: int = Field(2, env="JOBS_WORKERS")
+    jobs_retention_seconds: float = Field(3600, env="JOBS_RETENTION_SECONDS")
+    cpu_pool_workers: Optional[int] = Field(default=None, env="CPU_POOL_WORKERS")
+    io_pool_workers: int = Field(16, env="IO_POOL_WORKERS")
+    # Per-request profiling (X-Profile header or ?profile=1); ignored when off.
+    profiling_enabled: bool = Field(False, env="PROFILING_ENABLED")
+    profile_dir: str = Field("/tmp/rda-profiles", env="PROFILE_DIR")
+    # Oldest profiles beyond this many are deleted; 0 keeps them all.
+    profile_max_files: int = Field(200, env="PROFILE_MAX_FILES")
 
     class Config:
         env_file = ".env"
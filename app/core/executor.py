@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.config import get_settings
+from app.core.profiling import current_session, profiled_call
+
+
+T = TypeVar("T")
+
+
+class WorkerPools:
+    """Process pool for CPU-bound stages and thread pool for blocking I/O.
+
+    ``cpu_workers=0`` disables the process pool; CPU-bound work then runs on
+    the thread pool, which keeps the event loop free but stays GIL-bound.
+    """
+
+    def __init__(self, cpu_workers: Optional[int] = None, io_workers: int = 16) -> None:
+        if cpu_workers is None:
+            cpu_workers = os.cpu_count() or 1
+        self.cpu: Optional[Executor] = None
+        if cpu_workers > 0:
+            # spawn avoids forking a process that already runs uvicorn threads
+            self.cpu = ProcessPoolExecutor(
+                max_workers=cpu_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        self.io: Executor = ThreadPoolExecutor(
+            max_workers=io_workers, thread_name_prefix="rda-io"
+        )
+
+    async def run_cpu(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        session = current_session()
+        if session is None:
+            return await loop.run_in_executor(self.cpu or self.io, partial(func, *args, **kwargs))
+        # Profiled in the worker; the stats come back with the result.
+        result, stats = await loop.run_in_executor(
+            self.cpu or self.io, partial(profiled_call, func, *args, **kwargs)
+        )
+        session.add(stats)
+        return result
+
+    async def run_io(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        # Carry context variables (request id, stage timings) into the thread,
+        # as asyncio.to_thread does.
+        context = contextvars.copy_context()
+        session = current_session()
+        if session is not None:
+            func = partial(session.call, func)
+        return await loop.run_in_executor(
+            self.io, partial(context.run, func, *args, **kwargs)
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self.cpu is not None:
+            self.cpu.shutdown(wait=wait, cancel_futures=True)
+        self.io.shutdown(wait=wait, cancel_futures=True)
+
+
+@lru_cache()
+def get_worker_pools() -> WorkerPools:
+    settings = get_settings()
+    return WorkerPools(
+        cpu_workers=settings.cpu_pool_workers,
+        io_workers=settings.io_pool_workers,
+    )
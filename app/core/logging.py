@@ -1,24 +1,40 @@
 import logging
+from contextvars import ContextVar
 from logging.config import dictConfig
 
 
 LOG_LEVEL = logging.getLevelName("INFO")
 
+# Set per HTTP request by RequestContextMiddleware; "-" outside requests.
+REQUEST_ID: ContextVar[str] = ContextVar("rda_request_id", default="-")
+
+
+class RequestIdFilter(logging.Filter):
+    """Add the current request id to every record as ``request_id``."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = REQUEST_ID.get()
+        return True
+
 
 def configure_logging() -> None:
     """Configure a simple logging setup for the application."""
     logging_config = {
         "version": 1,
         "disable_existing_loggers": False,
+        "filters": {
+            "request_id": {"()": RequestIdFilter},
+        },
         "formatters": {
             "default": {
-                "format": "%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+                "format": "%(asctime)s [%(levelname)s] %(name)s [%(request_id)s] - %(message)s",
             }
         },
         "handlers": {
             "console": {
                 "class": "logging.StreamHandler",
                 "formatter": "default",
+                "filters": ["request_id"],
                 "level": LOG_LEVEL,
             }
         },
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator, Mapping, Optional
+
+from prometheus_client import CollectorRegistry, Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.services.cache import CacheStats
+    from app.services.text_extractor import OcrStats
+
+
+# Own registry so that only service metrics are exported.
+REGISTRY = CollectorRegistry()
+
+STAGE_SECONDS = Histogram(
+    "rda_stage_duration_seconds",
+    "Time spent per pipeline stage, summed over one request.",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+    registry=REGISTRY,
+)
+REQUEST_SECONDS = Histogram(
+    "rda_request_duration_seconds",
+    "HTTP request latency.",
+    ["method", "route", "status"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+    registry=REGISTRY,
+)
+PAGES = Counter(
+    "rda_pages_total", "Pages extracted, by text source.", ["source"], registry=REGISTRY
+)
+OCR_ESCALATIONS = Counter(
+    "rda_ocr_escalations_total",
+    "Pages re-rendered at a higher DPI because OCR confidence was low.",
+    registry=REGISTRY,
+)
+LLM_TOKENS = Counter(
+    "rda_llm_tokens_total",
+    "LLM tokens, by kind (prompt or response).",
+    ["kind"],
+    registry=REGISTRY,
+)
+LLM_ENDPOINT_EVENTS = Counter(
+    "rda_llm_endpoint_events_total",
+    "Ollama endpoint failures, ejections, readmissions and hedged calls.",
+    ["endpoint", "event"],
+    registry=REGISTRY,
+)
+COALESCED_REQUESTS = Counter(
+    "rda_coalesced_requests_total",
+    "Extractions answered by an identical request already in progress.",
+    registry=REGISTRY,
+)
+
+_TIMINGS: ContextVar[Optional[dict[str, float]]] = ContextVar("rda_stage_timings", default=None)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Add ``seconds`` to ``stage`` in the timings being collected, if any."""
+    timings = _TIMINGS.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+def add_timings(timings: Mapping[str, float]) -> None:
+    for stage, seconds in timings.items():
+        record_stage(stage, seconds)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+
+@contextmanager
+def request_timings(join: bool = True) -> Iterator[dict[str, float]]:
+    """Collect stage timings for one request and report them on exit.
+
+    Nested use joins the outer collection, so the HTTP layer and the
+    pipeline can both open one and each stage is reported once. Timings
+    follow the context into the I/O pool (see :class:`WorkerPools`).
+    ``join=False`` always starts a new collection; the HTTP layer needs it
+    because the server may start a keep-alive connection's next request in
+    a copy of the previous request's context.
+    """
+    active = _TIMINGS.get()
+    if join and active is not None:
+        yield active
+        return
+    timings: dict[str, float] = {}
+    token = _TIMINGS.set(timings)
+    try:
+        yield timings
+    finally:
+        _TIMINGS.reset(token)
+        for stage, seconds in timings.items():
+            STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+@contextmanager
+def capture_timings() -> Iterator[dict[str, float]]:
+    """Collect timings into a fresh dict without reporting them.
+
+    For work that may run in another process: the caller ships the dict
+    back and merges it with :func:`add_timings`.
+    """
+    timings: dict[str, float] = {}
+    token = _TIMINGS.set(timings)
+    try:
+        yield timings
+    finally:
+        _TIMINGS.reset(token)
+
+
+class _CacheCollector(Collector):
+    def __init__(self) -> None:
+        self.caches: dict[str, CacheStats] = {}
+
+    def collect(self) -> Iterator[CounterMetricFamily | GaugeMetricFamily]:
+        lookups = CounterMetricFamily(
+            "rda_cache_lookups", "Cache lookups, by cache and result.", labels=["cache", "result"]
+        )
+        hit_rate = GaugeMetricFamily(
+            "rda_cache_hit_ratio", "Share of lookups served from cache.", labels=["cache"]
+        )
+        for name, stats in list(self.caches.items()):
+            lookups.add_metric([name, "memory_hit"], stats.memory_hits)
+            lookups.add_metric([name, "disk_hit"], stats.disk_hits)
+            lookups.add_metric([name, "miss"], stats.misses)
+            hit_rate.add_metric([name], stats.hit_rate)
+        yield lookups
+        yield hit_rate
+
+
+_CACHES = _CacheCollector()
+REGISTRY.register(_CACHES)
+
+
+def register_cache(name: str, stats: CacheStats) -> None:
+    """Export ``stats`` under ``name``; a later registration replaces it."""
+    _CACHES.caches[name] = stats
+
+
+class _OcrCollector(Collector):
+    def __init__(self) -> None:
+        self.stats: Optional[OcrStats] = None
+
+    def collect(self) -> Iterator[CounterMetricFamily | GaugeMetricFamily]:
+        if self.stats is None:
+            return
+        snapshot = self.stats.snapshot()
+        renders = CounterMetricFamily(
+            "rda_ocr_page_renders", "PDF pages rendered for OCR, by DPI.", labels=["dpi"]
+        )
+        for dpi, count in sorted(snapshot["renders"].items()):
+            renders.add_metric([str(dpi)], count)
+        yield renders
+        yield CounterMetricFamily(
+            "rda_ocr_blank_pages",
+            "Pages skipped as blank before OCR.",
+            value=snapshot["blank_pages"],
+        )
+        yield GaugeMetricFamily(
+            "rda_ocr_escalation_ratio",
+            "Share of OCRed pages re-rendered at a higher DPI.",
+            value=snapshot["escalation_rate"],
+        )
+        yield GaugeMetricFamily(
+            "rda_ocr_trimmed_pixel_ratio",
+            "Share of preprocessed pixels cropped away before OCR.",
+            value=snapshot["trimmed_ratio"],
+        )
+
+
+_OCR = _OcrCollector()
+REGISTRY.register(_OCR)
+
+
+def register_ocr_stats(stats: OcrStats) -> None:
+    """Export ``stats``; a later registration replaces it."""
+    _OCR.stats = stats
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import re
+import threading
+import uuid
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from app.core.config import get_settings
+
+
+T = TypeVar("T")
+
+LOGGER = logging.getLogger(__name__)
+
+# cProfile's raw stats: {(file, line, function): (cc, nc, tt, ct, callers)}.
+RawStats = dict[tuple[str, int, str], tuple]
+
+_PROFILE_ID = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+_ACTIVE: ContextVar[Optional[ProfileSession]] = ContextVar("rda_profile", default=None)
+
+
+class ProfileSession:
+    """Deterministic profile of one request, gathered across worker pools.
+
+    cProfile only sees the thread it is enabled in, so each piece of pool
+    work is profiled where it runs and its stats are merged here: I/O pool
+    threads add theirs directly, process pool workers send theirs back with
+    the result. The event loop thread is left alone since it interleaves
+    other requests.
+    """
+
+    def __init__(self) -> None:
+        # Generated here, never taken from the client: it names the file.
+        self.id = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._parts: list[RawStats] = []
+        # Pool calls that ran without a profiler (see profiled_call).
+        self.skipped = 0
+        # Where the profile was written, once the session is over.
+        self.path: Optional[Path] = None
+
+    def add(self, stats: Optional[RawStats]) -> None:
+        with self._lock:
+            if stats is None:
+                self.skipped += 1
+            else:
+                self._parts.append(stats)
+
+    @property
+    def status(self) -> str:
+        """``complete``, ``partial`` (some calls unprofiled) or ``unprofiled``."""
+        if self.path is None:
+            return "unprofiled"
+        return "partial" if self.skipped else "complete"
+
+    def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``func`` in this thread under a profiler and keep its stats."""
+        result, stats = profiled_call(func, *args, **kwargs)
+        self.add(stats)
+        return result
+
+    def stats(self) -> Optional[pstats.Stats]:
+        with self._lock:
+            parts = list(self._parts)
+        parts = [part for part in parts if part]
+        if not parts:
+            return None
+        merged = pstats.Stats(_Snapshot(parts[0]))
+        for part in parts[1:]:
+            merged.add(_Snapshot(part))
+        return merged
+
+
+class _Snapshot:
+    """Raw stats in the shape :class:`pstats.Stats` loads from a profiler."""
+
+    def __init__(self, stats: RawStats) -> None:
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def profiled_call(
+    func: Callable[..., T], *args: Any, **kwargs: Any
+) -> tuple[T, Optional[RawStats]]:
+    """Run ``func`` under cProfile; returns its result and picklable stats.
+
+    The stats are None when the call could not be profiled. Module level so
+    that process pool workers can run it.
+    """
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Python 3.12+ allows one profiler per process at a time; the
+        # overlapping call goes unprofiled and its session is marked so.
+        LOGGER.warning(
+            "Profiler already active in this process; %s runs unprofiled",
+            getattr(func, "__qualname__", func),
+        )
+        return func(*args, **kwargs), None
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        profile.disable()
+    profile.create_stats()
+    return result, profile.stats
+
+
+def current_session() -> Optional[ProfileSession]:
+    return _ACTIVE.get()
+
+
+def submit(executor: Executor, func: Callable[..., T], *args: Any) -> Future:
+    """``executor.submit`` that profiles the call when a session is active."""
+    session = _ACTIVE.get()
+    if session is None:
+        return executor.submit(func, *args)
+    inner = executor.submit(profiled_call, func, *args)
+    outer: Future = Future()
+
+    def unwrap(done: Future) -> None:
+        try:
+            result, stats = done.result()
+        except BaseException as exc:
+            outer.set_exception(exc)
+            return
+        session.add(stats)
+        outer.set_result(result)
+
+    inner.add_done_callback(unwrap)
+    return outer
+
+
+@contextmanager
+def profile_request(enabled: bool) -> Iterator[Optional[ProfileSession]]:
+    """Profile the pool work of the enclosed block and save it under the session id.
+
+    Does nothing unless ``enabled``. The profile is written even when the
+    block fails, since slow failures are worth a look too.
+    """
+    if not enabled:
+        yield None
+        return
+    session = ProfileSession()
+    token = _ACTIVE.set(session)
+    try:
+        yield session
+    finally:
+        _ACTIVE.reset(token)
+        stats = session.stats()
+        path = profile_path(session.id)
+        if stats is not None and path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            stats.dump_stats(path)
+            session.path = path
+            prune_profiles(path.parent, get_settings().profile_max_files)
+        if session.skipped:
+            LOGGER.warning(
+                "Profile %s is %s: %d pool calls ran without a profiler",
+                session.id,
+                session.status,
+                session.skipped,
+            )
+
+
+def profile_path(profile_id: str) -> Optional[Path]:
+    """Where the profile for ``profile_id`` lives; None for unsafe ids."""
+    if not _PROFILE_ID.match(profile_id) or profile_id.strip(".") == "":
+        return None
+    return Path(get_settings().profile_dir) / f"{profile_id}.prof"
+
+
+def prune_profiles(directory: Path, max_files: int) -> None:
+    """Delete the oldest saved profiles beyond ``max_files``; 0 keeps all."""
+    if max_files <= 0:
+        return
+    profiles = []
+    for path in directory.glob("*.prof"):
+        try:
+            profiles.append((path.stat().st_mtime, path))
+        except FileNotFoundError:  # removed by a concurrent prune
+            continue
+    profiles.sort(reverse=True)
+    for _, path in profiles[max_files:]:
+        path.unlink(missing_ok=True)
+
+
+def render_profile(path: Path, sort: str = "cumulative", limit: int = 60) -> str:
+    """Text report of a saved profile, as ``python -m pstats`` would print it."""
+    out = io.StringIO()
+    pstats.Stats(str(path), stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
@@ -25,9 +25,40 @@ class FieldResult(BaseModel):
     source: Literal["regex", "llm", "merged"]
 
 
+class PageProvenance(BaseModel):
+    index: int
+    source: Literal["native", "ocr"]
+    confidence: Optional[float] = None
+    chars: int
+    dpi: Optional[int] = None
+    blank: bool = False
+
+
 class ExtractionResult(BaseModel):
     document_type: str
     ocr_engine: Optional[str]
     ocr_confidence: Optional[float]
     fields: list[FieldResult]
-    raw_text: str
+    # Always set by the pipeline; API callers may ask to leave it out.
+    raw_text: Optional[str] = None
+    pages: list[PageProvenance] = []
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    filename: Optional[str]
+    status: Literal["ok", "error"]
+    result: Optional[ExtractionResult] = None
+    error: Optional[str] = None
+
+
+class JobInfo(BaseModel):
+    id: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    stage: Optional[str] = None
+    pages_done: int = 0
+    pages_total: Optional[int] = None
+    created_at: float
+    finished_at: Optional[float] = None
+    result: Optional[ExtractionResult] = None
+    error: Optional[str] = None
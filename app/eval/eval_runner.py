@@ -1,10 +1,330 @@
-"""Placeholder for evaluation tooling.
+"""Accuracy and latency evaluation of the extraction pipeline.
 
-Future work can load datasets of contracts and compare extraction outputs against
-expected targets, producing metrics such as recall/precision per field.
+Usage: python -m app.eval.eval_runner DATASET_DIR [--concurrency 4] [--output report.json]
+
+A dataset is a directory of contracts with their expected field values,
+either listed in a ``manifest.json`` (``{"documents": [{"file": ...,
+"expected": {field: value}}]}``, as written by ``benchmarks.corpus``) or given
+as a sidecar ``<name>.expected.json`` next to each document. Fields missing
+from the expectations are expected to be absent.
+
+Documents run through :class:`ExtractionPipeline` concurrently, on the same
+worker pools as the service. OCR text and LLM answers are cached on disk
+under ``--cache-dir`` (``DATASET_DIR/.eval-cache`` by default), so a rerun
+after a prompt change only repeats the LLM calls and a rerun after a
+preprocessing change only repeats OCR. The report gives per-field precision
+and recall, per-stage latency and throughput.
 """
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from app.core.config import get_settings
+from app.core.executor import WorkerPools
+from app.core.metrics import request_timings
+from app.domain.models import TARGET_FIELDS, ExtractionResult
+from app.services.pipeline import ExtractionPipeline, build_pipeline
+
+
+DOCUMENT_SUFFIXES = (".pdf", ".png", ".jpg", ".jpeg", ".tif", ".tiff", ".txt")
+EXPECTED_SUFFIX = ".expected.json"
+
+
+@dataclass
+class EvalDocument:
+    path: Path
+    expected: dict[str, str]
+
+
+@dataclass
+class FieldScore:
+    true_positives: int = 0
+    false_positives: int = 0
+    false_negatives: int = 0
+
+    @property
+    def precision(self) -> float:
+        predicted = self.true_positives + self.false_positives
+        return self.true_positives / predicted if predicted else 1.0
+
+    @property
+    def recall(self) -> float:
+        relevant = self.true_positives + self.false_negatives
+        return self.true_positives / relevant if relevant else 1.0
+
+    def add(self, expected: Optional[str], predicted: Optional[str]) -> bool:
+        """Score one value; returns whether it was right."""
+        expected, predicted = normalize_value(expected), normalize_value(predicted)
+        if predicted and predicted == expected:
+            self.true_positives += 1
+            return True
+        # A wrong value is both a false positive and a missed field.
+        if predicted:
+            self.false_positives += 1
+        if expected:
+            self.false_negatives += 1
+        return not predicted and not expected
+
+    def snapshot(self) -> dict[str, float]:
+        return {**asdict(self), "precision": self.precision, "recall": self.recall}
+
+
+@dataclass
+class DocumentOutcome:
+    file: str
+    seconds: float
+    stages: dict[str, float]
+    errors: dict[str, dict[str, Optional[str]]] = field(default_factory=dict)
+    failure: Optional[str] = None
+
+
+@dataclass
+class EvalReport:
+    documents: list[DocumentOutcome]
+    fields: dict[str, FieldScore]
+    elapsed: float
+    caches: dict[str, dict[str, float]]
+
+    @property
+    def overall(self) -> FieldScore:
+        total = FieldScore()
+        for score in self.fields.values():
+            total.true_positives += score.true_positives
+            total.false_positives += score.false_positives
+            total.false_negatives += score.false_negatives
+        return total
+
+    def to_dict(self) -> dict[str, Any]:
+        done = [outcome for outcome in self.documents if outcome.failure is None]
+        stage_names = sorted({stage for outcome in done for stage in outcome.stages})
+        return {
+            "documents": len(self.documents),
+            "failed": sum(1 for outcome in self.documents if outcome.failure),
+            "elapsed_s": self.elapsed,
+            "throughput_docs_per_s": len(done) / self.elapsed if self.elapsed else 0.0,
+            "overall": self.overall.snapshot(),
+            "fields": {name: score.snapshot() for name, score in self.fields.items()},
+            "latency_s": _summary([outcome.seconds for outcome in done]),
+            # Over the documents that went through the stage.
+            "stages_s": {
+                stage: _summary(
+                    [outcome.stages[stage] for outcome in done if stage in outcome.stages]
+                )
+                for stage in stage_names
+            },
+            "caches": self.caches,
+            "per_document": [asdict(outcome) for outcome in self.documents],
+        }
+
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_value(value: Optional[str]) -> str:
+    """Compare values case-insensitively, ignoring spacing and edge punctuation."""
+    if value is None:
+        return ""
+    text = _SPACES.sub(" ", str(value)).strip().strip(".,;:").strip()
+    return text.replace(" %", "%").replace("% ", "%").casefold()
+
+
+def load_dataset(directory: Path) -> list[EvalDocument]:
+    manifest = directory / "manifest.json"
+    if manifest.is_file():
+        data = json.loads(manifest.read_text(encoding="utf-8"))
+        return [
+            EvalDocument(path=directory / entry["file"], expected=dict(entry.get("expected", {})))
+            for entry in data["documents"]
+        ]
+    documents = []
+    for path in sorted(directory.iterdir()):
+        sidecar = path.with_name(path.name.rsplit(".", 1)[0] + EXPECTED_SUFFIX)
+        if path.suffix.lower() in DOCUMENT_SUFFIXES and sidecar.is_file():
+            expected = json.loads(sidecar.read_text(encoding="utf-8"))
+            documents.append(EvalDocument(path=path, expected=expected))
+    return documents
+
+
+def score_result(
+    document: EvalDocument,
+    result: ExtractionResult,
+    scores: dict[str, FieldScore],
+    fields: Sequence[str] = TARGET_FIELDS,
+) -> dict[str, dict[str, Optional[str]]]:
+    """Add ``result`` to ``scores``; returns the fields it got wrong."""
+    predicted = {item.name: item.value for item in result.fields}
+    errors = {}
+    for name in fields:
+        expected = document.expected.get(name)
+        if not scores.setdefault(name, FieldScore()).add(expected, predicted.get(name)):
+            errors[name] = {"expected": expected, "predicted": predicted.get(name)}
+    return errors
+
+
+async def evaluate(
+    pipeline: ExtractionPipeline,
+    documents: Sequence[EvalDocument],
+    concurrency: int = 4,
+    document_type: str = "kira_sozlesmesi",
+    use_llm_cache: bool = True,
+) -> EvalReport:
+    scores: dict[str, FieldScore] = {name: FieldScore() for name in TARGET_FIELDS}
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(document: EvalDocument) -> DocumentOutcome:
+        async with limit:
+            # Each document gets its own task, hence its own timings.
+            with request_timings(join=False) as timings:
+                start = time.perf_counter()
+                try:
+                    result = await pipeline.run_async(
+                        document.path,
+                        filename=document.path.name,
+                        document_type=document_type,
+                        use_llm_cache=use_llm_cache,
+                    )
+                except Exception as exc:
+                    return DocumentOutcome(
+                        file=document.path.name,
+                        seconds=time.perf_counter() - start,
+                        stages=dict(timings),
+                        failure=f"{type(exc).__name__}: {exc}",
+                    )
+                seconds = time.perf_counter() - start
+            return DocumentOutcome(
+                file=document.path.name,
+                seconds=seconds,
+                stages=dict(timings),
+                errors=score_result(document, result, scores),
+            )
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(run_one(document) for document in documents))
+    elapsed = time.perf_counter() - start
+    return EvalReport(
+        documents=list(outcomes),
+        fields=scores,
+        elapsed=elapsed,
+        caches=_cache_stats(pipeline),
+    )
+
+
+def run_eval(
+    dataset: Path,
+    concurrency: int = 4,
+    cache_dir: Optional[Path] = None,
+    use_cache: bool = True,
+    document_type: str = "kira_sozlesmesi",
+) -> EvalReport:
+    """Evaluate the production pipeline on ``dataset``; see the module docstring."""
+    documents = load_dataset(dataset)
+    if not documents:
+        raise ValueError(f"No documents with expected values found in {dataset}")
+
+    overrides: dict[str, Any] = {
+        "artifact_cache_enabled": use_cache,
+        "llm_cache_enabled": use_cache,
+    }
+    if use_cache:
+        cache_dir = cache_dir or dataset / ".eval-cache"
+        overrides["artifact_cache_dir"] = str(cache_dir / "artifacts")
+        overrides["llm_cache_dir"] = str(cache_dir / "llm")
+    # A copy, so the process-wide settings stay as they were.
+    settings = get_settings().model_copy(update=overrides)
+    pools = WorkerPools(
+        cpu_workers=settings.cpu_pool_workers,
+        io_workers=max(settings.io_pool_workers, 2 * concurrency),
+    )
+    pipeline = build_pipeline(pools, settings)
+    try:
+        return asyncio.run(
+            evaluate(
+                pipeline,
+                documents,
+                concurrency=concurrency,
+                document_type=document_type,
+                use_llm_cache=use_cache,
+            )
+        )
+    finally:
+        pipeline.close()
+        pools.shutdown()
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    return {
+        "mean": statistics.fmean(ordered),
+        "p50": statistics.median(ordered),
+        "p95": ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))],
+        "max": ordered[-1],
+    }
+
+
+def _cache_stats(pipeline: ExtractionPipeline) -> dict[str, dict[str, float]]:
+    caches = {
+        "artifacts": pipeline.deps.text_extractor.cache,
+        "llm": getattr(pipeline.deps.llm_client, "cache", None),
+    }
+    return {name: cache.stats.snapshot() for name, cache in caches.items() if cache is not None}
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    print(
+        f"{report['documents']} documents ({report['failed']} failed) in "
+        f"{report['elapsed_s']:.1f}s, {report['throughput_docs_per_s']:.2f} docs/s"
+    )
+    print(f"{'field':<28} {'precision':>9} {'recall':>7} {'tp':>5} {'fp':>5} {'fn':>5}")
+    rows = list(report["fields"].items()) + [("(all fields)", report["overall"])]
+    for name, score in rows:
+        print(
+            f"{name:<28} {score['precision']:>9.3f} {score['recall']:>7.3f} "
+            f"{score['true_positives']:>5} {score['false_positives']:>5} "
+            f"{score['false_negatives']:>5}"
+        )
+    print(f"{'stage':<28} {'mean s':>9} {'p50 s':>7} {'p95 s':>7}")
+    for stage, summary in [("(document)", report["latency_s"])] + list(report["stages_s"].items()):
+        print(f"{stage:<28} {summary['mean']:>9.3f} {summary['p50']:>7.3f} {summary['p95']:>7.3f}")
+    for name, stats in report["caches"].items():
+        print(f"cache {name}: hit rate {stats['hit_rate']:.0%}")
+    for outcome in report["per_document"]:
+        if outcome["failure"]:
+            print(f"failed: {outcome['file']}: {outcome['failure']}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("dataset", type=Path)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--cache-dir", type=Path, default=None)
+    parser.add_argument("--no-cache", action="store_true", help="recompute OCR and LLM answers")
+    parser.add_argument("--document-type", default="kira_sozlesmesi")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    report = run_eval(
+        args.dataset,
+        concurrency=args.concurrency,
+        cache_dir=args.cache_dir,
+        use_cache=not args.no_cache,
+        document_type=args.document_type,
+    ).to_dict()
+    _print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
 
 
-def run_eval() -> None:  # pragma: no cover - placeholder
-    """Entry point for future evaluation routines."""
-    raise NotImplementedError("Evaluation runner not yet implemented.")
+if __name__ == "__main__":
+    main()
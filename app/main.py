@@ -1,15 +1,66 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
+from fastapi import FastAPI, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from app.api.middleware import BodySizeLimitMiddleware, RequestContextMiddleware
 from app.api.v1.extract_router import router as extract_router
+from app.api.v1.jobs_router import router as jobs_router
+from app.api.v1.profiles_router import router as profiles_router
+from app.core.config import get_settings
+from app.core.executor import get_worker_pools
 from app.core.logging import configure_logging
+from app.core.metrics import REGISTRY
+from app.services.jobs import JobManager
+from app.services.pipeline import build_pipeline
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings = get_settings()
+    pools = get_worker_pools()
+    app.state.pipeline = build_pipeline(pools)
+    app.state.jobs = JobManager(
+        app.state.pipeline,
+        max_queue=settings.jobs_queue_size,
+        workers=settings.jobs_workers,
+        retention_seconds=settings.jobs_retention_seconds,
+    )
+    await app.state.jobs.start()
+    try:
+        yield
+    finally:
+        await app.state.jobs.stop()
+        app.state.pipeline.close()
+        pools.shutdown()
+        get_worker_pools.cache_clear()
 
 
 configure_logging()
-app = FastAPI(title="RDA Service", version="0.1.0")
+app = FastAPI(title="RDA Service", version="0.1.0", lifespan=lifespan)
+if get_settings().gzip_level > 0:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=get_settings().gzip_min_bytes,
+        compresslevel=get_settings().gzip_level,
+    )
+app.add_middleware(BodySizeLimitMiddleware, max_bytes=get_settings().request_max_bytes)
+# Added last so it wraps everything, including requests rejected for size.
+app.add_middleware(RequestContextMiddleware)
 app.include_router(extract_router, prefix="/v1")
+app.include_router(jobs_router, prefix="/v1")
+app.include_router(profiles_router, prefix="/v1")
 
 
 @app.get("/health")
 async def health() -> dict[str, str]:
     """Simple health check endpoint."""
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus metrics in text exposition format."""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
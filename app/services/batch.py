@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import IO, AsyncIterator, Optional
+
+from app.domain.models import BatchItemResult
+from app.services.pipeline import ExtractionPipeline
+from app.services.text_extractor import DocumentSource
+
+
+LOGGER = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class BatchLimitError(Exception):
+    """A ZIP archive holds too many documents or an oversized member."""
+
+
+def expand_zip(
+    archive: DocumentSource,
+    directory: str,
+    max_documents: int,
+    max_member_bytes: int,
+) -> list[tuple[str, Path]]:
+    """Extract every regular file of a ZIP archive into ``directory``.
+
+    Returns ``(name, path)`` pairs; members are streamed to disk one at a
+    time rather than decompressed into memory. The member count is checked
+    against ``max_documents`` before anything is written, and each member
+    is capped at ``max_member_bytes`` both by its declared size and by the
+    bytes actually decompressed, so a ZIP bomb cannot fill the disk.
+    """
+    documents: list[tuple[str, Path]] = []
+    source = io.BytesIO(archive) if isinstance(archive, bytes) else archive
+    with zipfile.ZipFile(source) as zip_file:
+        members = [info for info in zip_file.infolist() if _is_document(info)]
+        if len(members) > max_documents:
+            raise BatchLimitError(
+                f"Archive holds {len(members)} documents, more than the {max_documents} allowed"
+            )
+        for info in members:
+            if info.file_size > max_member_bytes:
+                raise BatchLimitError(
+                    f"{info.filename} exceeds the {max_member_bytes} byte limit"
+                )
+            basename = info.filename.rsplit("/", 1)[-1]
+            fd, target = tempfile.mkstemp(suffix=Path(basename).suffix, dir=directory)
+            documents.append((info.filename, Path(target)))
+            with os.fdopen(fd, "wb") as handle, zip_file.open(info) as member:
+                _copy_limited(member, handle, max_member_bytes, info.filename)
+    return documents
+
+
+def _is_document(info: zipfile.ZipInfo) -> bool:
+    basename = info.filename.rsplit("/", 1)[-1]
+    # Skip folders and macOS resource-fork / hidden entries.
+    return not (
+        info.is_dir() or info.filename.startswith("__MACOSX/") or basename.startswith(".")
+    )
+
+
+def _copy_limited(source: IO[bytes], target: IO[bytes], max_bytes: int, name: str) -> None:
+    # The declared size may lie; count what actually comes out.
+    copied = 0
+    while chunk := source.read(CHUNK_SIZE):
+        copied += len(chunk)
+        if copied > max_bytes:
+            raise BatchLimitError(f"{name} exceeds the {max_bytes} byte limit")
+        target.write(chunk)
+
+
+def is_zip(filename: Optional[str], content_type: Optional[str]) -> bool:
+    return (filename or "").lower().endswith(".zip") or content_type in (
+        "application/zip",
+        "application/x-zip-compressed",
+    )
+
+
+async def iter_batch_results(
+    pipeline: ExtractionPipeline,
+    documents: list[tuple[Optional[str], DocumentSource]],
+    document_type: str,
+    max_concurrency: int,
+    use_llm_cache: bool = True,
+) -> AsyncIterator[BatchItemResult]:
+    """Run documents through the pipeline and yield results as they finish.
+
+    At most ``max_concurrency`` documents are in the pipeline at once; a
+    failing document yields an error item instead of aborting the batch.
+    Pending documents are cancelled if the consumer stops iterating.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def process(
+        index: int, filename: Optional[str], document: DocumentSource
+    ) -> BatchItemResult:
+        async with semaphore:
+            try:
+                result = await pipeline.run_async(
+                    document,
+                    filename=filename,
+                    document_type=document_type,
+                    use_llm_cache=use_llm_cache,
+                )
+            except Exception as exc:
+                LOGGER.exception("Batch document %s (%s) failed", index, filename)
+                return BatchItemResult(
+                    index=index,
+                    filename=filename,
+                    status="error",
+                    error=str(exc) or type(exc).__name__,
+                )
+            return BatchItemResult(index=index, filename=filename, status="ok", result=result)
+
+    tasks = [
+        asyncio.create_task(process(index, filename, document))
+        for index, (filename, document) in enumerate(documents)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
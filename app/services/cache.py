@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Iterator, Optional
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return hits / total if total else 0.0
+
+    def snapshot(self) -> dict[str, float]:
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class MemoryLruCache:
+    """Thread-safe in-process LRU bounded by the total size of stored values.
+
+    With ``ttl_seconds`` entries older than the TTL are treated as misses and
+    dropped on access.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: Optional[float] = None) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[Optional[float], bytes]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                self._size -= len(value)
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        expires = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[key] = (expires, value)
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteCache:
+    """Size-bounded SQLite store that several worker processes can share.
+
+    WAL mode lets readers proceed while another process writes; entries are
+    evicted least-recently-accessed first once ``max_bytes`` is exceeded, and
+    entries past ``ttl_seconds`` are treated as misses.
+    """
+
+    def __init__(self, path: str, max_bytes: int, ttl_seconds: Optional[float] = None) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed REAL NOT NULL, expires REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A short-lived connection per call keeps the store usable from any
+        # thread without sharing sqlite3 connections.
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with self._connect() as conn:
+                now = time.time()
+                row = conn.execute(
+                    "SELECT value, expires FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                value, expires = row
+                if expires is not None and expires <= now:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self.evictions += 1
+                    return None
+                conn.execute(
+                    "UPDATE entries SET accessed = ? WHERE key = ?", (now, key)
+                )
+                return value
+        except sqlite3.Error as exc:  # pragma: no cover - disk level issues
+            LOGGER.warning("Disk cache read failed: %s", exc)
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        try:
+            now = time.time()
+            expires = now + self.ttl_seconds if self.ttl_seconds else None
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, accessed, expires) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value), now, expires),
+                )
+                self._evict(conn)
+        except sqlite3.Error as exc:  # pragma: no cover - disk level issues
+            LOGGER.warning("Disk cache write failed: %s", exc)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (time.time(),)
+        )
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+
+class TieredCache:
+    """Memory LRU in front of an optional shared disk tier."""
+
+    def __init__(self, memory: MemoryLruCache, disk: Optional[SqliteCache] = None) -> None:
+        self.memory = memory
+        self.disk = disk
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.memory.get(key)
+        if value is not None:
+            self.stats.memory_hits += 1
+            return value
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.stats.disk_hits += 1
+                self.memory.set(key, value)
+                return value
+        self.stats.misses += 1
+        return None
+
+    def set(self, key: str, value: bytes) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+        self.stats.evictions = self.memory.evictions + (
+            self.disk.evictions if self.disk is not None else 0
+        )
+
+
+def build_tiered_cache(
+    memory_bytes: int,
+    disk_path: Optional[str] = None,
+    disk_bytes: int = 0,
+    ttl_seconds: Optional[float] = None,
+) -> TieredCache:
+    disk = (
+        SqliteCache(disk_path, disk_bytes, ttl_seconds)
+        if disk_path and disk_bytes > 0
+        else None
+    )
+    return TieredCache(MemoryLruCache(memory_bytes, ttl_seconds), disk)
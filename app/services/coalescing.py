@@ -0,0 +1,148 @@
+"""Single-flight coalescing of identical extractions.
+
+A client retrying after a timeout, or two users uploading the same lease,
+should not OCR and prompt for the same document twice at once. The first
+request for a key leads and does the work; requests arriving while it runs
+follow and get its result, or its exception, instead of starting their own.
+
+The work runs in the leader's own task, on the leader's own upload. If the
+leader is cancelled (its client went away), the followers do not inherit
+the cancellation: one of them takes over as the new leader and starts
+again with its own copy of the document.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, TypeVar
+
+from app.core.metrics import COALESCED_REQUESTS, timed
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.services.pipeline import PipelineProgress
+
+
+T = TypeVar("T")
+
+
+class _LeaderCancelled(Exception):
+    """The leading request was cancelled; followers have to retry."""
+
+
+class _ProgressFanout:
+    """Forwards the leader's progress to every waiting request.
+
+    Late joiners are brought up to date with the last stage and page count.
+    """
+
+    def __init__(self) -> None:
+        self.listeners: list[PipelineProgress] = []
+        self._stage: Optional[str] = None
+        self._pages: Optional[tuple[int, int]] = None
+
+    def add(self, listener: PipelineProgress) -> None:
+        if self._stage is not None:
+            listener.on_stage(self._stage)
+        if self._pages is not None:
+            listener.on_page(*self._pages)
+        self.listeners.append(listener)
+
+    def remove(self, listener: PipelineProgress) -> None:
+        self.listeners.remove(listener)
+
+    def on_stage(self, stage: str) -> None:
+        self._stage = stage
+        for listener in list(self.listeners):
+            listener.on_stage(stage)
+
+    def on_page(self, pages_done: int, pages_total: int) -> None:
+        # Called from worker threads; list() keeps iteration safe against
+        # a follower joining or leaving on the event loop meanwhile.
+        self._pages = (pages_done, pages_total)
+        for listener in list(self.listeners):
+            listener.on_page(pages_done, pages_total)
+
+
+class _Flight:
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.outcome: asyncio.Future = loop.create_future()
+        self.progress = _ProgressFanout()
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one computation.
+
+    Keys are only shared while a computation is in flight; nothing is
+    cached once it finishes. Use from a single event loop.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[str, _Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def run(
+        self,
+        key: str,
+        func: Callable[[Optional[PipelineProgress]], Awaitable[T]],
+        progress: Optional[PipelineProgress] = None,
+    ) -> T:
+        """Return ``await func(progress)``, shared with concurrent callers of ``key``.
+
+        ``func`` receives a progress sink that reports to every caller
+        waiting on the computation.
+        """
+        while True:
+            flight = self._flights.get(key)
+            if flight is None:
+                return await self._lead(key, func, progress)
+            try:
+                return await self._follow(flight, progress)
+            except _LeaderCancelled:
+                continue
+
+    async def _lead(
+        self,
+        key: str,
+        func: Callable[[Optional[PipelineProgress]], Awaitable[T]],
+        progress: Optional[PipelineProgress],
+    ) -> T:
+        flight = _Flight(asyncio.get_running_loop())
+        if progress is not None:
+            flight.progress.add(progress)
+        self._flights[key] = flight
+        try:
+            result = await func(flight.progress)
+        except asyncio.CancelledError:
+            self._settle(flight, _LeaderCancelled())
+            raise
+        except BaseException as exc:
+            self._settle(flight, exc)
+            raise
+        else:
+            flight.outcome.set_result(result)
+            return result
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    async def _follow(self, flight: _Flight, progress: Optional[PipelineProgress]) -> T:
+        if progress is not None:
+            flight.progress.add(progress)
+        try:
+            with timed("coalesced"):
+                # Shielded: a follower giving up must not cancel the outcome
+                # the others are waiting on.
+                return await asyncio.shield(flight.outcome)
+        finally:
+            if progress is not None:
+                flight.progress.remove(progress)
+            outcome = flight.outcome
+            if outcome.done() and not isinstance(outcome.exception(), _LeaderCancelled):
+                COALESCED_REQUESTS.inc()
+
+    @staticmethod
+    def _settle(flight: _Flight, exc: BaseException) -> None:
+        flight.outcome.set_exception(exc)
+        # Marks the exception as retrieved when nobody was following.
+        flight.outcome.exception()
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from app.domain.models import ExtractionResult, JobInfo
+from app.services.pipeline import ExtractionPipeline
+from app.services.text_extractor import DocumentSource
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when the job queue cannot take another job."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Job queue is full")
+        self.retry_after = retry_after
+
+
+@dataclass
+class Job:
+    id: str
+    document: Optional[DocumentSource]
+    filename: Optional[str]
+    document_type: str
+    use_llm_cache: bool = True
+    status: str = "queued"
+    stage: Optional[str] = None
+    pages_done: int = 0
+    pages_total: Optional[int] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    result: Optional[ExtractionResult] = None
+    error: Optional[str] = None
+
+    def on_stage(self, stage: str) -> None:
+        self.stage = stage
+
+    def on_page(self, pages_done: int, pages_total: int) -> None:
+        self.pages_done = pages_done
+        self.pages_total = pages_total
+
+    def to_info(self) -> JobInfo:
+        return JobInfo(
+            id=self.id,
+            status=self.status,
+            stage=self.stage,
+            pages_done=self.pages_done,
+            pages_total=self.pages_total,
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+            result=self.result,
+            error=self.error,
+        )
+
+
+class JobManager:
+    """Bounded in-process job queue in front of an :class:`ExtractionPipeline`.
+
+    ``submit`` never waits: when the queue is full it raises
+    :class:`JobQueueFullError` with a ``Retry-After`` estimate so callers can
+    push back instead of letting latency grow. Finished jobs are kept for
+    ``retention_seconds`` and then forgotten.
+    """
+
+    def __init__(
+        self,
+        pipeline: ExtractionPipeline,
+        max_queue: int,
+        workers: int,
+        retention_seconds: float,
+    ) -> None:
+        self.pipeline = pipeline
+        self.workers = max(1, workers)
+        self.retention_seconds = retention_seconds
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=max(1, max_queue))
+        self._jobs: dict[str, Job] = {}
+        self._tasks: list[asyncio.Task] = []
+        # Moving average of job duration, used for Retry-After.
+        self._avg_duration = 10.0
+
+    async def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Jobs nobody picked up will never run; fail them and drop their uploads.
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            job.status = "failed"
+            job.error = "cancelled"
+            job.finished_at = time.time()
+            self._discard(job)
+            self._queue.task_done()
+
+    def submit(
+        self,
+        document: DocumentSource,
+        filename: Optional[str],
+        document_type: str,
+        use_llm_cache: bool = True,
+    ) -> Job:
+        """Queue ``document`` for extraction.
+
+        A :class:`~pathlib.Path` is treated as a spooled upload owned by the
+        job and deleted once the job has run.
+        """
+        self._purge_expired()
+        job = Job(
+            id=uuid.uuid4().hex,
+            document=document,
+            filename=filename,
+            document_type=document_type,
+            use_llm_cache=use_llm_cache,
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFullError(self.retry_after()) from None
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge_expired()
+        return self._jobs.get(job_id)
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up.
+
+        A slot frees when a worker picks up the next job, i.e. roughly when
+        one of the running jobs finishes.
+        """
+        return max(1, math.ceil(self._avg_duration / self.workers))
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = "running"
+        started = time.monotonic()
+        try:
+            job.result = await self.pipeline.run_async(
+                job.document or b"",
+                filename=job.filename,
+                document_type=job.document_type,
+                use_llm_cache=job.use_llm_cache,
+                progress=job,
+            )
+            job.status = "succeeded"
+            job.stage = "done"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "cancelled"
+            raise
+        except Exception as exc:
+            LOGGER.exception("Job %s failed", job.id)
+            job.status = "failed"
+            job.error = str(exc) or type(exc).__name__
+        finally:
+            job.finished_at = time.time()
+            # Drop the upload as soon as it is no longer needed.
+            self._discard(job)
+            self._avg_duration = 0.8 * self._avg_duration + 0.2 * (time.monotonic() - started)
+
+    @staticmethod
+    def _discard(job: Job) -> None:
+        if isinstance(job.document, Path):
+            job.document.unlink(missing_ok=True)
+        job.document = None
+
+    def _purge_expired(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
-from typing import Protocol
+from typing import Optional, Protocol, Sequence
 
 
 class ILlmClient(Protocol):
-    def extract_fields(self, raw_text: str, document_type: str) -> dict:
-        """Extract structured fields from raw text."""
+    def extract_fields(
+        self,
+        raw_text: str,
+        document_type: str,
+        use_cache: bool = True,
+        fields: Optional[Sequence[str]] = None,
+    ) -> dict:
+        """Extract structured fields from raw text.
 
+        ``fields`` limits the request to a subset of the target fields and
+        ``use_cache=False`` bypasses any response cache for this call.
+        """
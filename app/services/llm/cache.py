@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Optional, Protocol
+
+from app.services.cache import CacheStats, TieredCache
+
+
+class ILlmResponseCache(Protocol):
+    """Protocol for caches of parsed LLM field responses."""
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached response for ``key`` or ``None``."""
+
+    def set(self, key: str, value: dict) -> None:
+        """Store a parsed response under ``key``."""
+
+
+def make_cache_key(
+    prompt: str,
+    model: str,
+    options: Optional[dict[str, Any]] = None,
+    output_format: Optional[str] = None,
+) -> str:
+    """Hash everything that determines the model output."""
+    material = json.dumps(
+        {
+            "prompt": prompt,
+            "model": model,
+            "options": options or {},
+            "format": output_format or "",
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return "llm:" + hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LlmResponseCache(ILlmResponseCache):
+    """JSON response cache backed by a :class:`TieredCache` (TTL + LRU)."""
+
+    def __init__(self, store: TieredCache) -> None:
+        self.store = store
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.store.stats
+
+    def get(self, key: str) -> Optional[dict]:
+        cached = self.store.get(key)
+        if cached is None:
+            return None
+        return json.loads(cached)
+
+    def set(self, key: str, value: dict) -> None:
+        self.store.set(key, json.dumps(value, ensure_ascii=False).encode("utf-8"))
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Iterable, Optional
+
+from app.domain.models import TARGET_FIELDS
+
+
+# Anchors are matched against folded text (see ``fold``), so they are written
+# lowercase without Turkish diacritics.
+FIELD_ANCHORS: dict[str, tuple[str, ...]] = {
+    "Mahal_Kodu": ("mahal kodu", "mahal no", "magaza no", "bagimsiz bolum"),
+    "M2": ("m2", "m²", "metrekare", "brut alan", "net alan", "kiralanan alan"),
+    "Asgari_Kira": ("asgari kira", "minimum kira", "aylik kira", "sabit kira"),
+    "Ciro_Kira_Orani": ("ciro kira", "ciro orani", "cirodan"),
+    "Dekorasyon_Koordinasyon": ("dekorasyon", "koordinasyon"),
+    "Mali_Sorumluluk_Sigortasi": ("mali sorumluluk", "sorumluluk sigorta"),
+    "Gecikme_Faizi": ("gecikme faizi", "temerrut faizi", "gecikme zammi"),
+    "Bir_Yil_Uzama_Artis": ("uzama", "uzatma", "yenileme", "artis orani"),
+    "Bir_Yil_Uzama_Ciro_Kira": ("uzama", "uzatma", "ciro kira"),
+    "Ceza_Bedeli": ("ceza bedeli", "cezai sart", "ceza"),
+}
+
+_FOLD_TABLE = str.maketrans(
+    {"İ": "i", "I": "i", "ı": "i", "Ş": "s", "ş": "s", "Ğ": "g", "ğ": "g",
+     "Ü": "u", "ü": "u", "Ö": "o", "ö": "o", "Ç": "c", "ç": "c"}
+)
+_DIGITS = re.compile(r"\d+")
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip Turkish diacritics without changing string length."""
+    folded = text.translate(_FOLD_TABLE).lower()
+    # lower() can expand a few exotic code points; offsets must stay aligned.
+    return folded if len(folded) == len(text) else text.translate(_FOLD_TABLE)
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for Llama-style tokenizers.
+    return (len(text) + 3) // 4
+
+
+class ContextSelector:
+    """Reduce a contract to the passages relevant to the requested fields.
+
+    Lines repeated at the top or bottom of most pages (headers, footers, page
+    numbers) are dropped first. If the remainder still exceeds the token
+    budget, only windows around field anchors are kept, taking the first hit
+    of every field before any second hit, and returned in document order.
+    """
+
+    EDGE_LINES = 3
+    SEPARATOR = "\n[...]\n"
+
+    def __init__(
+        self,
+        token_budget: int,
+        window_chars: int,
+        anchors: Optional[dict[str, tuple[str, ...]]] = None,
+    ) -> None:
+        self.token_budget = token_budget
+        self.window_chars = window_chars
+        self.anchor_patterns = {
+            field: re.compile("|".join(re.escape(anchor) for anchor in field_anchors))
+            for field, field_anchors in (anchors or FIELD_ANCHORS).items()
+        }
+
+    def select(self, raw_text: str, fields: Optional[Iterable[str]] = None) -> str:
+        text = self.strip_repeated_edges(raw_text)
+        if estimate_tokens(text) <= self.token_budget:
+            return text
+
+        windows = self._ranked_windows(text, list(fields or TARGET_FIELDS))
+        if not windows:
+            return text[: self.token_budget * 4]
+
+        budget_chars = self.token_budget * 4
+        chosen: list[tuple[int, int]] = []
+        used = 0
+        for start, end in windows:
+            if any(start < c_end and c_start < end for c_start, c_end in chosen):
+                continue
+            if used + (end - start) > budget_chars:
+                continue
+            chosen.append((start, end))
+            used += end - start + len(self.SEPARATOR)
+
+        return self.SEPARATOR.join(text[start:end].strip() for start, end in sorted(chosen))
+
+    def _ranked_windows(self, text: str, fields: list[str]) -> list[tuple[int, int]]:
+        folded = fold(text)
+        hits_per_field: list[list[tuple[int, int]]] = []
+        for field in fields:
+            pattern = self.anchor_patterns.get(field)
+            if pattern is None:
+                continue
+            hits = [self._window(text, m.start(), m.end()) for m in pattern.finditer(folded)]
+            if hits:
+                hits_per_field.append(_merge_overlapping(hits))
+
+        ranked: list[tuple[int, int]] = []
+        depth = 0
+        while any(depth < len(hits) for hits in hits_per_field):
+            ranked.extend(hits[depth] for hits in hits_per_field if depth < len(hits))
+            depth += 1
+        return ranked
+
+    def _window(self, text: str, start: int, end: int) -> tuple[int, int]:
+        # Snap to line boundaries so values are not cut mid-line.
+        window_start = text.rfind("\n", 0, max(0, start - self.window_chars // 3)) + 1
+        window_end = text.find("\n", min(len(text), end + self.window_chars))
+        return window_start, len(text) if window_end == -1 else window_end
+
+    @classmethod
+    def strip_repeated_edges(cls, raw_text: str) -> str:
+        pages = raw_text.split("\f")
+        if len(pages) < 3:
+            return raw_text.replace("\f", "\n")
+
+        page_lines = [page.splitlines() for page in pages]
+        counts: Counter[str] = Counter()
+        for lines in page_lines:
+            counts.update(
+                {_edge_key(line) for line in _edge_lines(lines, cls.EDGE_LINES) if line.strip()}
+            )
+        threshold = max(2, len(pages) // 2 + 1)
+        repeated = {key for key, count in counts.items() if count >= threshold}
+
+        kept_pages = []
+        for lines in page_lines:
+            edges = set(range(min(cls.EDGE_LINES, len(lines)))) | set(
+                range(max(0, len(lines) - cls.EDGE_LINES), len(lines))
+            )
+            kept_pages.append(
+                "\n".join(
+                    line
+                    for index, line in enumerate(lines)
+                    if not (index in edges and _edge_key(line) in repeated)
+                )
+            )
+        return "\n".join(kept_pages)
+
+
+def _edge_lines(lines: list[str], count: int) -> list[str]:
+    return lines[:count] + lines[max(count, len(lines) - count):]
+
+
+def _edge_key(line: str) -> str:
+    # "Sayfa 3 / 40" and "Sayfa 4 / 40" should count as the same footer.
+    return _DIGITS.sub("#", fold(line.strip()))
+
+
+def _merge_overlapping(windows: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged: list[tuple[int, int]] = []
+    for start, end in windows:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
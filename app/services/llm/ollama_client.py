@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import contextvars
 import json
 import logging
-from typing import Dict, Optional
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional, Sequence
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.core.metrics import LLM_ENDPOINT_EVENTS, LLM_TOKENS, timed
 from app.services.llm.base import ILlmClient
+from app.services.llm.cache import ILlmResponseCache, make_cache_key
+from app.services.llm.context import ContextSelector, estimate_tokens
+from app.services.llm.routing import Endpoint, EndpointRouter, NoEndpointAvailable
+from app.services.llm.streaming import IncrementalFieldParser, build_fields_schema
 
 
 LOGGER = logging.getLogger(__name__)
@@ -27,14 +37,80 @@ TARGET_FIELDS = [
 ]
 
 
+class _Abandoned(Exception):
+    """A hedged call whose twin already answered."""
+
+
 class OllamaLlmClient(ILlmClient):
-    def __init__(self, model: Optional[str] = None, endpoint: Optional[str] = None) -> None:
-        settings = get_settings()
+    """Field extraction over one or more Ollama hosts.
+
+    Calls are routed by :class:`EndpointRouter`; a call that fails on one
+    host is retried on the next available one. With hedging enabled, a call
+    still running after the configured latency percentile is also sent to
+    a second host and the first answer wins.
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        options: Optional[dict[str, Any]] = None,
+        cache: Optional[ILlmResponseCache] = None,
+        context_selector: Optional[ContextSelector] = None,
+        endpoints: Optional[Sequence[str]] = None,
+        settings: Optional[Settings] = None,
+    ) -> None:
+        settings = settings or get_settings()
         self.model = model or settings.ollama_model
-        self.endpoint = endpoint or settings.ollama_base_url
+        if not endpoints:
+            endpoints = [endpoint] if endpoint else settings.ollama_base_urls
+        self.options = options if options is not None else dict(settings.ollama_options)
+        self.cache = cache
+        self.stream = settings.ollama_stream
+        self.output_format = settings.ollama_format
+        if context_selector is None and settings.llm_context_token_budget > 0:
+            context_selector = ContextSelector(
+                token_budget=settings.llm_context_token_budget,
+                window_chars=settings.llm_context_window_chars,
+            )
+        self.context_selector = context_selector
+        self.timeout = (settings.ollama_connect_timeout, settings.ollama_read_timeout)
+        self.router = EndpointRouter(
+            endpoints or [settings.ollama_base_url],
+            failure_threshold=settings.ollama_failure_threshold,
+            eject_seconds=settings.ollama_eject_seconds,
+            probe_interval=settings.ollama_probe_interval,
+            probe=self._probe,
+        )
+        self.hedge_percentile = settings.ollama_hedge_percentile
+        self.hedge_min_samples = settings.ollama_hedge_min_samples
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        self._hedge_pool_size = 2 * settings.ollama_pool_size
+        self._hedge_pool_lock = threading.Lock()
+        # One keep-alive session per client; the adapter keeps a connection
+        # pool per Ollama host, each bounded for concurrent calls.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=len(self.router.endpoints),
+            pool_maxsize=settings.ollama_pool_size,
+            pool_block=True,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        self.router.close()
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
 
-    def _build_prompt(self, raw_text: str, document_type: str) -> str:
-        fields = ", ".join(TARGET_FIELDS)
+    def _build_prompt(
+        self,
+        raw_text: str,
+        document_type: str,
+        fields: Sequence[str] = TARGET_FIELDS,
+    ) -> str:
+        fields = ", ".join(fields)
         return (
             "Aşağıdaki metinden belirtilen alanları JSON olarak çıkar.\n"
             f"Belge tipi: {document_type or 'kira sözleşmesi'}\n"
@@ -44,26 +120,249 @@ class OllamaLlmClient(ILlmClient):
             f"Metin:\n{raw_text}"
         )
 
-    def extract_fields(self, raw_text: str, document_type: str) -> Dict[str, dict]:
-        prompt = self._build_prompt(raw_text, document_type or "kira sözleşmesi")
-        payload = {"model": self.model, "prompt": prompt, "stream": False}
-        try:
-            response = requests.post(
-                f"{self.endpoint}/api/generate", json=payload, timeout=30
+    def extract_fields(
+        self,
+        raw_text: str,
+        document_type: str,
+        use_cache: bool = True,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, dict]:
+        """Return parsed ``fields`` (all target fields by default).
+
+        ``use_cache=False`` forces a fresh generation; a bypassed lookup still
+        refreshes the cached entry with the new answer.
+        """
+        fields = [field for field in (fields or TARGET_FIELDS) if field in TARGET_FIELDS]
+        if not fields:
+            return {}
+        with timed("llm_context"):
+            context = (
+                self.context_selector.select(raw_text, fields)
+                if self.context_selector
+                else raw_text
             )
-            response.raise_for_status()
-            parsed_response = json.loads(response.text)
-            llm_output = parsed_response.get("response", parsed_response)
-            if isinstance(llm_output, str):
-                llm_output = json.loads(llm_output)
-            if not isinstance(llm_output, dict):
-                return {}
-            return {
-                field: llm_output.get(field, {})
-                for field in TARGET_FIELDS
-                if isinstance(llm_output.get(field, {}), dict)
-            }
-        except Exception as exc:  # pragma: no cover - external dependency
-            LOGGER.warning("Ollama request failed: %s", exc)
+        prompt = self._build_prompt(context, document_type or "kira sözleşmesi", fields)
+        if self.cache is None:
+            return self._generate(prompt, fields)
+
+        key = make_cache_key(prompt, self.model, self.options, self.output_format)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        result = self._generate(prompt, fields)
+        # Failed calls come back empty; never cache those.
+        if result:
+            self.cache.set(key, result)
+        return result
+
+    def _payload(self, prompt: str, fields: Sequence[str]) -> dict[str, Any]:
+        payload: dict[str, Any] = {"model": self.model, "prompt": prompt, "stream": self.stream}
+        if self.options:
+            payload["options"] = self.options
+        if self.output_format == "schema":
+            payload["format"] = build_fields_schema(fields)
+        elif self.output_format:
+            payload["format"] = self.output_format
+        return payload
+
+    @staticmethod
+    def _select_fields(llm_output: Any, fields: Sequence[str]) -> Dict[str, dict]:
+        if not isinstance(llm_output, dict):
             return {}
+        return {
+            field: llm_output.get(field, {})
+            for field in fields
+            if isinstance(llm_output.get(field, {}), dict)
+        }
+
+    def _generate(self, prompt: str, fields: Sequence[str]) -> Dict[str, dict]:
+        payload = self._payload(prompt, fields)
+        hedge_after = self._hedge_delay()
+        if hedge_after is None:
+            return self._generate_with_failover(payload, fields)
+        return self._generate_hedged(payload, fields, hedge_after)
+
+    def _generate_with_failover(
+        self, payload: dict[str, Any], fields: Sequence[str]
+    ) -> Dict[str, dict]:
+        tried: list[Endpoint] = []
+        while True:
+            try:
+                endpoint = self.router.acquire(exclude=tried)
+            except NoEndpointAvailable:
+                break
+            tried.append(endpoint)
+            try:
+                return self._attempt(endpoint, payload, fields)
+            except requests.RequestException as exc:
+                LOGGER.warning("Ollama request to %s failed: %s", endpoint.url, exc)
+            except Exception as exc:
+                LOGGER.warning("Unusable Ollama response from %s: %s", endpoint.url, exc)
+                return {}
+        LOGGER.warning("No Ollama endpoint could serve the request (%d tried)", len(tried))
+        return {}
+
+    def _generate_hedged(
+        self, payload: dict[str, Any], fields: Sequence[str], hedge_after: float
+    ) -> Dict[str, dict]:
+        """Like :meth:`_generate_with_failover`, adding one hedge after ``hedge_after``."""
+        abandoned = threading.Event()
+        tried: list[Endpoint] = []
+        pending: dict[Future, Endpoint] = {}
+
+        def start() -> bool:
+            try:
+                endpoint = self.router.acquire(exclude=tried)
+            except NoEndpointAvailable:
+                return False
+            tried.append(endpoint)
+            # The attempt runs on a helper thread; keep the caller's context
+            # so its stage timings and request id carry over.
+            context = contextvars.copy_context()
+            future = self._hedge_executor().submit(
+                context.run, self._attempt, endpoint, payload, fields, abandoned
+            )
+            pending[future] = endpoint
+            return True
+
+        delay: Optional[float] = hedge_after
+        try:
+            start()
+            while pending:
+                done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+                if not done:
+                    delay = None
+                    if start():
+                        LLM_ENDPOINT_EVENTS.labels(tried[-1].url, "hedged").inc()
+                    continue
+                for future in done:
+                    endpoint = pending.pop(future)
+                    try:
+                        return future.result()
+                    except requests.RequestException as exc:
+                        LOGGER.warning("Ollama request to %s failed: %s", endpoint.url, exc)
+                    except Exception as exc:
+                        LOGGER.warning("Unusable Ollama response from %s: %s", endpoint.url, exc)
+                        return {}
+                if not pending:
+                    start()
+        finally:
+            # Stops the losing stream at its next chunk.
+            abandoned.set()
+        LOGGER.warning("No Ollama endpoint could serve the request (%d tried)", len(tried))
+        return {}
+
+    def _hedge_delay(self) -> Optional[float]:
+        if self.hedge_percentile is None or len(self.router.endpoints) < 2:
+            return None
+        return self.router.latency_percentile(self.hedge_percentile, self.hedge_min_samples)
+
+    def _hedge_executor(self) -> ThreadPoolExecutor:
+        with self._hedge_pool_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(
+                    max_workers=self._hedge_pool_size, thread_name_prefix="ollama-hedge"
+                )
+            return self._hedge_pool
+
+    def _attempt(
+        self,
+        endpoint: Endpoint,
+        payload: dict[str, Any],
+        fields: Sequence[str],
+        abandoned: Optional[threading.Event] = None,
+    ) -> Dict[str, dict]:
+        """One call to ``endpoint``, reporting its outcome to the router.
+
+        Only transport errors and HTTP error statuses count against the
+        host; a malformed answer or an abandoned hedge leaves it alone.
+        """
+        start = time.perf_counter()
+        try:
+            if self.stream:
+                result = self._generate_streaming(endpoint.url, payload, fields, abandoned)
+            else:
+                result = self._generate_single(endpoint.url, payload, fields)
+        except requests.RequestException:
+            self.router.release(endpoint, failed=True)
+            raise
+        except BaseException:
+            self.router.release(endpoint)
+            raise
+        self.router.release(endpoint, seconds=time.perf_counter() - start)
+        return result
+
+    def _probe(self, url: str) -> bool:
+        response = self.session.get(f"{url}/api/tags", timeout=self.timeout[0])
+        response.close()
+        return response.ok
+
+    def _generate_single(
+        self, url: str, payload: dict[str, Any], fields: Sequence[str]
+    ) -> Dict[str, dict]:
+        response = self.session.post(f"{url}/api/generate", json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        parsed_response = json.loads(response.text)
+        self._record_tokens(payload["prompt"], parsed_response)
+        llm_output = parsed_response.get("response", parsed_response)
+        if isinstance(llm_output, str):
+            llm_output = json.loads(llm_output)
+        return self._select_fields(llm_output, fields)
+
+    @staticmethod
+    def _record_tokens(prompt: str, response: dict[str, Any]) -> None:
+        """Count tokens from Ollama's final stats, estimating when cut short."""
+        prompt_tokens = response.get("prompt_eval_count")
+        response_tokens = response.get("eval_count")
+        text = response.get("response")
+        LLM_TOKENS.labels("prompt").inc(
+            prompt_tokens if prompt_tokens is not None else estimate_tokens(prompt)
+        )
+        LLM_TOKENS.labels("response").inc(
+            response_tokens
+            if response_tokens is not None
+            else estimate_tokens(text if isinstance(text, str) else "")
+        )
+
+    def _generate_streaming(
+        self,
+        url: str,
+        payload: dict[str, Any],
+        fields: Sequence[str],
+        abandoned: Optional[threading.Event] = None,
+    ) -> Dict[str, dict]:
+        """Consume Ollama's NDJSON stream and stop once every field is parsed.
+
+        Closing the response drops the connection, which makes Ollama abort
+        the generation instead of producing the model's trailing output; the
+        same happens once ``abandoned`` is set.
+        """
+        parser = IncrementalFieldParser(fields)
+        final: dict[str, Any] = {}
+        response = self.session.post(
+            f"{url}/api/generate", json=payload, timeout=self.timeout, stream=True
+        )
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if abandoned is not None and abandoned.is_set():
+                    raise _Abandoned()
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                parser.feed(chunk.get("response", ""))
+                if parser.complete:
+                    LOGGER.debug("All requested fields parsed; stopping generation early")
+                    break
+                if chunk.get("done"):
+                    final = chunk
+                    break
+        finally:
+            response.close()
+        self._record_tokens(payload["prompt"], {**final, "response": parser.text})
 
+        if parser.values:
+            return self._select_fields(parser.values, fields)
+        # The output was not an object we could follow member by member.
+        return self._select_fields(json.loads(parser.text), fields)
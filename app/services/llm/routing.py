@@ -0,0 +1,180 @@
+"""Dispatch of LLM calls over several Ollama hosts.
+
+Each call goes to the available host with the fewest requests in flight.
+A host that fails ``failure_threshold`` times in a row is ejected for
+``eject_seconds``; while any host is ejected a background thread probes it
+every ``probe_interval`` and readmits it as soon as it answers. Once the
+ejection expires the host is half-open: it gets a single trial request,
+whose outcome closes or reopens the breaker.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Collection, Optional, Sequence
+
+from app.core.metrics import LLM_ENDPOINT_EVENTS
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class NoEndpointAvailable(RuntimeError):
+    """Every endpoint is ejected or was already tried for this call."""
+
+
+class Endpoint:
+    def __init__(self, url: str, latency_window: int) -> None:
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.dispatched = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.trial_in_flight = False
+        self.latencies: deque[float] = deque(maxlen=latency_window)
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.url!r}, outstanding={self.outstanding})"
+
+
+class EndpointRouter:
+    """Least-outstanding-requests routing with a per-host circuit breaker.
+
+    Callers :meth:`acquire` an endpoint, make the request and
+    :meth:`release` it with the outcome. ``probe(url)`` reports whether an
+    ejected host is healthy again.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        failure_threshold: int = 3,
+        eject_seconds: float = 30.0,
+        probe_interval: float = 5.0,
+        probe: Optional[Callable[[str], bool]] = None,
+        latency_window: int = 200,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not urls:
+            raise ValueError("At least one endpoint is required")
+        self.endpoints = [Endpoint(url, latency_window) for url in dict.fromkeys(urls)]
+        self.failure_threshold = max(1, failure_threshold)
+        self.eject_seconds = eject_seconds
+        self.probe_interval = probe_interval
+        self.probe = probe
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._prober: Optional[threading.Thread] = None
+
+    def acquire(self, exclude: Collection[Endpoint] = ()) -> Endpoint:
+        """Reserve the least busy available endpoint not in ``exclude``."""
+        with self._lock:
+            now = self._clock()
+            candidates = [
+                endpoint
+                for endpoint in self.endpoints
+                if endpoint not in exclude and self._available(endpoint, now)
+            ]
+            if not candidates:
+                raise NoEndpointAvailable("No Ollama endpoint available")
+            # Ties go to the host that has served the fewest calls, so idle
+            # hosts share the load instead of the first one taking it all.
+            endpoint = min(candidates, key=lambda item: (item.outstanding, item.dispatched))
+            if endpoint.ejected_until:
+                endpoint.trial_in_flight = True
+            endpoint.outstanding += 1
+            endpoint.dispatched += 1
+            return endpoint
+
+    def release(
+        self, endpoint: Endpoint, seconds: Optional[float] = None, failed: bool = False
+    ) -> None:
+        """Return ``endpoint``; ``seconds`` is the latency of a successful call.
+
+        A call released with neither (e.g. an abandoned hedge) leaves the
+        breaker as it was.
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            trial = endpoint.trial_in_flight
+            endpoint.trial_in_flight = False
+            if failed:
+                self._record_failure(endpoint, trial)
+            elif seconds is not None:
+                endpoint.latencies.append(seconds)
+                if endpoint.ejected_until:
+                    LOGGER.info("Ollama endpoint %s recovered", endpoint.url)
+                    LLM_ENDPOINT_EVENTS.labels(endpoint.url, "readmitted").inc()
+                endpoint.consecutive_failures = 0
+                endpoint.ejected_until = 0.0
+
+    def latency_percentile(self, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """Recent successful call latency across hosts, None until enough samples."""
+        with self._lock:
+            samples = sorted(value for item in self.endpoints for value in item.latencies)
+        if not samples or len(samples) < min_samples:
+            return None
+        rank = math.ceil(percentile / 100 * len(samples)) - 1
+        return samples[min(len(samples) - 1, max(0, rank))]
+
+    def probe_ejected(self) -> None:
+        """Probe every ejected endpoint once and readmit the healthy ones."""
+        if self.probe is None:
+            return
+        with self._lock:
+            ejected = [endpoint for endpoint in self.endpoints if endpoint.ejected_until]
+        for endpoint in ejected:
+            try:
+                healthy = self.probe(endpoint.url)
+            except Exception:  # a probe must never kill the prober
+                healthy = False
+            if not healthy:
+                continue
+            with self._lock:
+                if endpoint.ejected_until:
+                    LOGGER.info("Ollama endpoint %s passed its health probe", endpoint.url)
+                    LLM_ENDPOINT_EVENTS.labels(endpoint.url, "readmitted").inc()
+                    endpoint.consecutive_failures = 0
+                    endpoint.ejected_until = 0.0
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._prober is not None:
+            self._prober.join(timeout=1.0)
+
+    def _available(self, endpoint: Endpoint, now: float) -> bool:
+        if not endpoint.ejected_until:
+            return True
+        # Half-open: one trial request once the ejection has run out.
+        return endpoint.ejected_until <= now and not endpoint.trial_in_flight
+
+    def _record_failure(self, endpoint: Endpoint, trial: bool) -> None:
+        LLM_ENDPOINT_EVENTS.labels(endpoint.url, "failure").inc()
+        endpoint.consecutive_failures += 1
+        if trial or endpoint.consecutive_failures >= self.failure_threshold:
+            LOGGER.warning(
+                "Ejecting Ollama endpoint %s for %.0fs after %d failures",
+                endpoint.url,
+                self.eject_seconds,
+                endpoint.consecutive_failures,
+            )
+            LLM_ENDPOINT_EVENTS.labels(endpoint.url, "ejected").inc()
+            endpoint.ejected_until = self._clock() + self.eject_seconds
+            self._start_prober()
+
+    def _start_prober(self) -> None:
+        # Started on the first ejection; healthy fleets never pay for it.
+        if self.probe is None or self._prober is not None or self._stop.is_set():
+            return
+        self._prober = threading.Thread(
+            target=self._probe_loop, name="ollama-prober", daemon=True
+        )
+        self._prober.start()
+
+    def _probe_loop(self) -> None:
+        while not self._stop.wait(self.probe_interval):
+            self.probe_ejected()
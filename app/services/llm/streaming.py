@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+from typing import Iterable, Sequence
+
+
+def build_fields_schema(fields: Sequence[str]) -> dict:
+    """JSON schema for Ollama's ``format`` parameter covering ``fields``."""
+    field_schema = {
+        "type": "object",
+        "properties": {
+            "value": {"type": ["string", "null"]},
+            "confidence": {"type": "number"},
+            "source_quote": {"type": ["string", "null"]},
+        },
+        "required": ["value", "confidence", "source_quote"],
+    }
+    return {
+        "type": "object",
+        "properties": {field: field_schema for field in fields},
+        "required": list(fields),
+    }
+
+
+class IncrementalFieldParser:
+    """Collect the top-level members of a JSON object while it is streamed.
+
+    Text can be fed in arbitrary chunks. A member is parsed as soon as its
+    value is closed, so a caller can stop the generation once every field it
+    asked for is present instead of waiting for the end of the stream.
+    """
+
+    def __init__(self, fields: Iterable[str]) -> None:
+        self.fields = set(fields)
+        self.values: dict[str, dict] = {}
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_start: int | None = None
+        self._key: str | None = None
+        self._awaiting_value = False
+        self._value_start: int | None = None
+
+    @property
+    def complete(self) -> bool:
+        return self.fields.issubset(self.values)
+
+    def feed(self, chunk: str) -> None:
+        self.text += chunk
+        text = self.text
+        for index in range(self._pos, len(text)):
+            self._step(text, index, text[index])
+        self._pos = len(text)
+
+    def _step(self, text: str, index: int, char: str) -> None:
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if self._depth == 1 and self._key_start is not None:
+                    self._key = json.loads(text[self._key_start : index + 1])
+                    self._key_start = None
+            return
+
+        if self._depth == 0:
+            # Anything before the opening brace is chatter, not JSON.
+            if char == "{":
+                self._depth = 1
+            return
+
+        if self._depth == 1 and self._awaiting_value and not char.isspace():
+            self._value_start = index
+            self._awaiting_value = False
+
+        if char == '"':
+            self._in_string = True
+            if self._depth == 1 and self._key is None:
+                self._key_start = index
+        elif char in "{[":
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth == 1 and self._value_start is not None:
+                self._finish_member(text, index + 1)
+            elif self._depth == 0 and self._value_start is not None:
+                self._finish_member(text, index)
+        elif char == ":" and self._depth == 1 and self._key is not None:
+            self._awaiting_value = True
+        elif char == "," and self._depth == 1:
+            if self._value_start is not None:
+                self._finish_member(text, index)
+            self._key = None
+
+    def _finish_member(self, text: str, end: int) -> None:
+        key, start = self._key, self._value_start
+        self._key = None
+        self._value_start = None
+        if key not in self.fields or start is None:
+            return
+        try:
+            value = json.loads(text[start:end])
+        except ValueError:
+            return
+        if isinstance(value, dict):
+            self.values[key] = value
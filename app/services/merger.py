@@ -1,9 +1,33 @@
-from app.domain.models import FieldResult
+from typing import Iterable, Optional
+
+from app.domain.models import TARGET_FIELDS, FieldResult
+
+
+# Regex values at or above this confidence win over the LLM.
+REGEX_CONFIDENCE_THRESHOLD = 0.9
 
 
 class ResultMerger:
     @staticmethod
+    def is_settled(field: Optional[FieldResult]) -> bool:
+        return bool(
+            field
+            and field.value not in (None, "")
+            and field.confidence >= REGEX_CONFIDENCE_THRESHOLD
+        )
+
+    @classmethod
+    def unresolved_fields(
+        cls,
+        regex_fields: dict[str, FieldResult],
+        fields: Iterable[str] = TARGET_FIELDS,
+    ) -> list[str]:
+        """Fields whose regex result would not survive :meth:`merge_fields`."""
+        return [name for name in fields if not cls.is_settled(regex_fields.get(name))]
+
+    @classmethod
     def merge_fields(
+        cls,
         regex_fields: dict[str, FieldResult],
         llm_fields: dict[str, FieldResult],
     ) -> dict[str, FieldResult]:
@@ -14,11 +38,7 @@ class ResultMerger:
             regex_field = regex_fields.get(field_name)
             llm_field = llm_fields.get(field_name)
 
-            if (
-                regex_field
-                and regex_field.value not in (None, "")
-                and regex_field.confidence >= 0.9
-            ):
+            if cls.is_settled(regex_field):
                 merged[field_name] = regex_field
             elif llm_field and llm_field.value not in (None, ""):
                 merged[field_name] = llm_field
@@ -9,5 +9,5 @@ class IOcrEngine(Protocol):
     """Protocol describing OCR engines."""
 
     def run(self, image: np.ndarray) -> tuple[str, float]:
-        """Run OCR on a BGR image and return text with average confidence."""
+        """Run OCR on a BGR or grayscale image and return text with average confidence."""
 
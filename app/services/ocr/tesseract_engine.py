@@ -1,30 +1,63 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from typing import Optional, Sequence
 
 import cv2
 import numpy as np
 from PIL import Image
 import pytesseract
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.core.metrics import timed
 from app.services.ocr.base import IOcrEngine
+from app.services.ocr.words import OcrWords, reread_weak_words_upscaled
 
 
 LOGGER = logging.getLogger(__name__)
 
+# Tesseract page segmentation mode for re-reading a single cropped word.
+PSM_SINGLE_WORD = 8
+
 
 class TesseractOcrEngine(IOcrEngine):
-    def __init__(self, language: Optional[str] = None, resize_max_dim: Optional[int] = None) -> None:
-        settings = get_settings()
-        if settings.tesseract_cmd:
-            pytesseract.pytesseract.tesseract_cmd = settings.tesseract_cmd
+    # Off by default: each weak word would cost a tesseract process launch.
+    DEFAULT_UPSCALE_RETRY_CONFIDENCE = 0.0
+
+    def __init__(
+        self,
+        language: Optional[str] = None,
+        resize_max_dim: Optional[int] = None,
+        upscale_retry_confidence: Optional[float] = None,
+        upscale_retry_scale: Optional[float] = None,
+        upscale_retry_max_words: Optional[int] = None,
+        settings: Optional[Settings] = None,
+    ) -> None:
+        settings = settings or get_settings()
+        self.tesseract_cmd = settings.tesseract_cmd
+        if self.tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
         self.language = language or settings.tesseract_lang
         self.resize_max_dim = resize_max_dim
+        # Words read below this confidence (0-1) are cropped from the same
+        # image, upscaled and read again; 0 disables the retry.
+        if upscale_retry_confidence is None:
+            upscale_retry_confidence = settings.ocr_upscale_retry_confidence
+        self.upscale_retry_confidence = (
+            upscale_retry_confidence
+            if upscale_retry_confidence is not None
+            else self.DEFAULT_UPSCALE_RETRY_CONFIDENCE
+        )
+        self.upscale_retry_scale = upscale_retry_scale or settings.ocr_upscale_retry_scale
+        self.upscale_retry_max_words = (
+            upscale_retry_max_words
+            if upscale_retry_max_words is not None
+            else settings.ocr_upscale_retry_max_words
+        )
 
     def _preprocess(self, image: np.ndarray) -> np.ndarray:
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        # Preprocessed pages arrive as grayscale already.
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
         if self.resize_max_dim:
             height, width = gray.shape[:2]
             max_dim = max(height, width)
@@ -34,31 +67,51 @@ class TesseractOcrEngine(IOcrEngine):
                 gray = cv2.resize(gray, new_size, interpolation=cv2.INTER_CUBIC)
         return gray
 
-    def run(self, image: np.ndarray) -> tuple[str, float]:  # pragma: no cover - requires binary
+    def _ocr_words(self, image: np.ndarray, psm: Optional[int] = None) -> OcrWords:  # pragma: no cover - requires binary
+        data = pytesseract.image_to_data(
+            Image.fromarray(image),
+            lang=self.language,
+            config=f"--psm {psm}" if psm else "",
+            output_type=pytesseract.Output.DICT,
+        )
+        return OcrWords.from_tesseract_data(data)
+
+    def run_words(self, image: np.ndarray) -> OcrWords:
+        """OCR ``image`` into word columns, retrying weak words upscaled if enabled."""
+        processed = self._preprocess(image)
+        with timed("ocr"):
+            words = self._ocr_words(processed)
+        if self.upscale_retry_confidence > 0 and self.upscale_retry_max_words > 0 and len(words):
+            with timed("ocr_upscale_retry"):
+                words = reread_weak_words_upscaled(
+                    lambda region: self._ocr_words(region, psm=PSM_SINGLE_WORD),
+                    processed,
+                    words,
+                    threshold=self.upscale_retry_confidence,
+                    scale=self.upscale_retry_scale,
+                    max_words=self.upscale_retry_max_words,
+                )
+        return words
+
+    def read(self, image: np.ndarray) -> OcrWords:
+        """Like :meth:`run_words`, but a failed read yields no words."""
+        if self.tesseract_cmd:
+            # The engine may have been unpickled in a pool worker process.
+            pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
         try:
-            processed = self._preprocess(image)
-            pil_image = Image.fromarray(processed)
-            data = pytesseract.image_to_data(
-                pil_image,
-                lang=self.language,
-                output_type=pytesseract.Output.DICT,
-            )
+            return self.run_words(image)
         except Exception as exc:  # pragma: no cover - library level issues
             LOGGER.warning("Tesseract OCR failed: %s", exc)
-            return "", 0.0
-
-        words = [text for text in data.get("text", []) if text.strip()]
-        text = " ".join(words).strip()
+            return OcrWords.empty()
 
-        confidences = []
-        for conf in data.get("conf", []):
-            try:
-                value = float(conf)
-            except (TypeError, ValueError):
-                continue
-            if value >= 0:
-                confidences.append(value)
-        avg_confidence = (sum(confidences) / len(confidences) / 100) if confidences else 0.0
+    def run(self, image: np.ndarray) -> tuple[str, float]:
+        words = self.read(image)
+        return words.text, words.mean_confidence()
 
-        return text, avg_confidence
+    def read_batch(self, images: Sequence[np.ndarray]) -> list[OcrWords]:
+        """OCR several pages in order, as handed over by one pool task.
 
+        In a worker process all of them run on the same warm engine (one
+        ``PyTessBaseAPI`` per thread for :class:`TesserocrEngine`).
+        """
+        return [self.read(image) for image in images]
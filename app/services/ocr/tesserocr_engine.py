@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+import numpy as np
+
+try:
+    import tesserocr
+except ImportError:  # pragma: no cover - optional dependency guard
+    tesserocr = None
+
+from app.core.config import Settings, get_settings
+from app.services.ocr.tesseract_engine import TesseractOcrEngine
+from app.services.ocr.words import OcrWords
+
+
+# One warm Tesseract API per thread of each worker process. The engine itself
+# only carries configuration, so it pickles cheaply into pool workers, and
+# the language data is loaded on first use and then kept.
+_LOCAL = threading.local()
+
+
+class TesserocrEngine(TesseractOcrEngine):
+    """Tesseract through its C API, without a subprocess per image.
+
+    ``pytesseract`` starts a ``tesseract`` process for each call, which
+    re-reads the traineddata and round-trips the image through a temp PNG.
+    This engine keeps a long-lived ``PyTessBaseAPI`` in every pool worker and
+    hands it the raw grayscale buffer, which also makes re-reading weak
+    words cheap. Requires the optional ``tesserocr`` package; select it with
+    ``OCR_ENGINE=tesserocr``.
+    """
+
+    # Re-reads run on the warm API, so the upscale retry is on by default.
+    DEFAULT_UPSCALE_RETRY_CONFIDENCE = 0.6
+
+    def __init__(
+        self,
+        language: Optional[str] = None,
+        resize_max_dim: Optional[int] = None,
+        tessdata_dir: Optional[str] = None,
+        upscale_retry_confidence: Optional[float] = None,
+        upscale_retry_scale: Optional[float] = None,
+        upscale_retry_max_words: Optional[int] = None,
+        settings: Optional[Settings] = None,
+    ) -> None:
+        if tesserocr is None:
+            raise RuntimeError("OCR_ENGINE=tesserocr requires the 'tesserocr' package")
+        super().__init__(
+            language=language,
+            resize_max_dim=resize_max_dim,
+            upscale_retry_confidence=upscale_retry_confidence,
+            upscale_retry_scale=upscale_retry_scale,
+            upscale_retry_max_words=upscale_retry_max_words,
+            settings=settings,
+        )
+        self.tessdata_dir = tessdata_dir or (settings or get_settings()).tessdata_dir
+
+    def _api(self) -> "tesserocr.PyTessBaseAPI":
+        apis = getattr(_LOCAL, "apis", None)
+        if apis is None:
+            apis = _LOCAL.apis = {}
+        key = (self.tessdata_dir, self.language)
+        api = apis.get(key)
+        if api is None:
+            kwargs = {"lang": self.language}
+            if self.tessdata_dir:
+                kwargs["path"] = self.tessdata_dir
+            api = apis[key] = tesserocr.PyTessBaseAPI(**kwargs)
+        return api
+
+    def _ocr_words(self, image: np.ndarray, psm: Optional[int] = None) -> OcrWords:  # pragma: no cover - requires binary
+        gray = np.ascontiguousarray(image)
+        height, width = gray.shape[:2]
+        api = self._api()
+        api.SetPageSegMode(psm or tesserocr.PSM.AUTO)
+        api.SetImageBytes(gray.tobytes(), width, height, 1, width)
+        api.Recognize()
+
+        level = tesserocr.RIL.WORD
+        words: list[str] = []
+        boxes: list[tuple[int, int, int, int]] = []
+        confidences: list[float] = []
+        line_ids: list[int] = []
+        line = -1
+        for word in tesserocr.iterate_level(api.GetIterator(), level):
+            if word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                line += 1
+            text = (word.GetUTF8Text(level) or "").strip()
+            box = word.BoundingBox(level)
+            if not text or box is None:
+                continue
+            x0, y0, x1, y1 = box
+            words.append(text)
+            boxes.append((x0, y0, x1 - x0, y1 - y0))
+            confidences.append(word.Confidence(level) / 100)
+            line_ids.append(max(line, 0))
+        if not words:
+            return OcrWords.empty()
+        return OcrWords(
+            words=words,
+            boxes=np.asarray(boxes, dtype=np.int32),
+            confidences=np.asarray(confidences, dtype=np.float32),
+            line_ids=np.asarray(line_ids, dtype=np.int32),
+        )
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+import cv2
+import numpy as np
+
+
+@dataclass
+class OcrWords:
+    """Word-level OCR output stored column-wise.
+
+    ``boxes`` holds ``(left, top, width, height)`` rows in pixels of the
+    image that was OCRed, ``confidences`` is 0-1 (-1 when the engine gave
+    none) and ``line_ids`` numbers text lines in reading order, so line
+    structure survives for the regexes and weak words can be revisited.
+    """
+
+    words: list[str]
+    boxes: np.ndarray
+    confidences: np.ndarray
+    line_ids: np.ndarray
+
+    @classmethod
+    def empty(cls) -> OcrWords:
+        return cls(
+            words=[],
+            boxes=np.zeros((0, 4), dtype=np.int32),
+            confidences=np.zeros(0, dtype=np.float32),
+            line_ids=np.zeros(0, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_tesseract_data(cls, data: Mapping[str, list[Any]]) -> OcrWords:
+        """Build from ``pytesseract.image_to_data(..., output_type=DICT)``."""
+        texts = [str(text) for text in data.get("text", [])]
+        keep = np.array([bool(text.strip()) for text in texts], dtype=bool)
+        if not keep.any():
+            return cls.empty()
+
+        def column(name: str, dtype: Any) -> np.ndarray:
+            return np.asarray(data[name], dtype=dtype)[keep]
+
+        boxes = np.stack(
+            [column(name, np.int32) for name in ("left", "top", "width", "height")], axis=1
+        )
+        confidences = np.asarray(
+            [_to_float(value) for value in data["conf"]], dtype=np.float32
+        )[keep]
+        confidences = np.where(confidences >= 0, confidences / 100, -1).astype(np.float32)
+        # A line is identified by its (page, block, paragraph, line) numbers;
+        # renumber them 0..n in reading order.
+        line_keys = np.stack(
+            [column(name, np.int64) for name in ("page_num", "block_num", "par_num", "line_num")],
+            axis=1,
+        )
+        changed = np.any(line_keys[1:] != line_keys[:-1], axis=1)
+        line_ids = np.concatenate([[0], np.cumsum(changed)]).astype(np.int32)
+        words = [text.strip() for text, kept in zip(texts, keep) if kept]
+        return cls(words=words, boxes=boxes, confidences=confidences, line_ids=line_ids)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    @property
+    def text(self) -> str:
+        """Words joined with spaces, lines with newlines."""
+        if not self.words:
+            return ""
+        starts = np.flatnonzero(np.diff(self.line_ids)) + 1
+        bounds = zip(np.concatenate([[0], starts]), np.concatenate([starts, [len(self.words)]]))
+        return "\n".join(" ".join(self.words[start:end]) for start, end in bounds)
+
+    def mean_confidence(self) -> float:
+        scored = self.confidences[self.confidences >= 0]
+        return float(scored.mean()) if scored.size else 0.0
+
+    def weak(self, threshold: float) -> np.ndarray:
+        """Indices of scored words below ``threshold``, weakest first."""
+        candidates = np.flatnonzero((self.confidences >= 0) & (self.confidences < threshold))
+        return candidates[np.argsort(self.confidences[candidates], kind="stable")]
+
+
+def reread_weak_words_upscaled(
+    ocr_region: Callable[[np.ndarray], OcrWords],
+    image: np.ndarray,
+    words: OcrWords,
+    threshold: float,
+    scale: float = 2.0,
+    max_words: int = 24,
+    padding: int = 4,
+) -> OcrWords:
+    """Retry only the low-confidence words on upscaled crops and patch them in place.
+
+    Each weak word is cropped from ``image``, upscaled by ``scale`` and read
+    again with ``ocr_region``; the new reading replaces the old one when it
+    is more confident. The upscale adds no detail that was not rendered; it
+    helps where glyphs are too small for Tesseract, and a single-word read
+    avoids the page layout analysis. At most ``max_words`` words (weakest
+    first) are retried.
+    """
+    height, width = image.shape[:2]
+    for index in words.weak(threshold)[:max_words]:
+        left, top, box_width, box_height = (int(value) for value in words.boxes[index])
+        x0, y0 = max(0, left - padding), max(0, top - padding)
+        x1 = min(width, left + box_width + padding)
+        y1 = min(height, top + box_height + padding)
+        if x1 <= x0 or y1 <= y0:
+            continue
+        region = cv2.resize(
+            image[y0:y1, x0:x1], None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC
+        )
+        reread = ocr_region(region)
+        confidence = reread.mean_confidence()
+        text = " ".join(reread.words)
+        if text and confidence > words.confidences[index]:
+            words.words[index] = text
+            words.confidences[index] = confidence
+    return words
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return -1.0
+
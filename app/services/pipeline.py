@@ -1,14 +1,47 @@
+import hashlib
+import os
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Protocol
 
-from app.domain.models import ExtractionResult, FieldResult
+from app.core.config import Settings, get_settings
+from app.core.executor import WorkerPools, get_worker_pools
+from app.core.metrics import (
+    PAGES,
+    register_cache,
+    register_ocr_stats,
+    request_timings,
+    timed,
+)
+from app.domain.models import ExtractionResult, FieldResult, PageProvenance
+from app.services.cache import TieredCache, build_tiered_cache
+from app.services.coalescing import SingleFlight
 from app.services.ocr.base import IOcrEngine
+from app.services.ocr.preprocess import PagePreprocessor
 from app.services.ocr.tesseract_engine import TesseractOcrEngine
+from app.services.ocr.tesserocr_engine import TesserocrEngine
 from app.services.regex_extractor import RegexExtractor
 from app.services.llm.base import ILlmClient
+from app.services.llm.cache import LlmResponseCache
 from app.services.llm.ollama_client import OllamaLlmClient
 from app.services.merger import ResultMerger
-from app.services.text_extractor import TextExtractor
+from app.services.text_extractor import (
+    DocumentSource,
+    ExtractedText,
+    PageProgress,
+    TextExtractor,
+    document_digest,
+)
+
+
+class PipelineProgress(Protocol):
+    """Receives progress updates from :meth:`ExtractionPipeline.run_async`."""
+
+    def on_stage(self, stage: str) -> None:
+        """Called when the pipeline enters ``stage``."""
+
+    def on_page(self, pages_done: int, pages_total: int) -> None:
+        """Called from a worker thread as OCR pages complete."""
 
 
 @dataclass
@@ -21,6 +54,8 @@ class PipelineDependencies:
 
 
 class ExtractionPipeline:
+    """Long-lived extraction pipeline; build once and share across requests."""
+
     def __init__(
         self,
         text_extractor: TextExtractor,
@@ -28,6 +63,9 @@ class ExtractionPipeline:
         regex_extractor: RegexExtractor,
         llm_client: ILlmClient,
         merger: ResultMerger,
+        pools: Optional[WorkerPools] = None,
+        flights: Optional[SingleFlight] = None,
+        flight_scope: str = "",
     ) -> None:
         self.deps = PipelineDependencies(
             text_extractor=text_extractor,
@@ -36,35 +74,209 @@ class ExtractionPipeline:
             llm_client=llm_client,
             merger=merger,
         )
+        self.pools = pools
+        self.flights = flights
+        # Part of every coalescing key; build_pipeline sets it to a hash of
+        # the settings the pipeline was built from.
+        self.flight_scope = flight_scope
 
         if self.deps.text_extractor.ocr_engine is None:
             self.deps.text_extractor.ocr_engine = self.deps.ocr_engine
 
+    @property
+    def worker_pools(self) -> WorkerPools:
+        return self.pools or get_worker_pools()
+
     def _extract_text(
-        self, file_bytes: bytes, filename: Optional[str]
-    ) -> tuple[str, Optional[float], str]:
-        return self.deps.text_extractor.extract_text(
-            file_bytes, filename or "unknown"
+        self,
+        document: DocumentSource,
+        filename: Optional[str],
+        on_page: Optional[PageProgress] = None,
+        digest: Optional[str] = None,
+    ) -> ExtractedText:
+        return self.deps.text_extractor.extract_document(
+            document, filename or "unknown", on_page=on_page, digest=digest
         )
 
-    def run(self, file_bytes: bytes, filename: Optional[str] = None) -> ExtractionResult:
-        raw_text, ocr_confidence, source = self._extract_text(file_bytes, filename)
-        used_ocr = source == "ocr"
-        regex_fields = self.deps.regex_extractor.extract_by_regex(raw_text)
-        llm_fields_raw = self.deps.llm_client.extract_fields(
-            raw_text, filename or "kira sözleşmesi"
+    def _ocr_engine_name(self, text_source: str) -> Optional[str]:
+        ocr_engine = self.deps.text_extractor.ocr_engine
+        if text_source in ("ocr", "hybrid") and ocr_engine:
+            return ocr_engine.__class__.__name__
+        return None
+
+    def run(
+        self,
+        document: DocumentSource,
+        filename: Optional[str] = None,
+        document_type: Optional[str] = None,
+        use_llm_cache: bool = True,
+    ) -> ExtractionResult:
+        document_type = document_type or filename or "unknown"
+        with request_timings(), timed("pipeline"):
+            with timed("text_extraction"):
+                extracted = self._extract_text(document, filename or document_type)
+            raw_text = extracted.text
+            if not _is_text_meaningful(raw_text):
+                return self._build_result(document_type, extracted, {})
+
+            regex_fields, unresolved = self._regex_fields(raw_text)
+            llm_fields_raw: dict = {}
+            if unresolved:
+                with timed("llm"):
+                    llm_fields_raw = self.deps.llm_client.extract_fields(
+                        raw_text, document_type, use_cache=use_llm_cache, fields=unresolved
+                    )
+            return self._merge(document_type, extracted, regex_fields, llm_fields_raw)
+
+    async def run_async(
+        self,
+        document: DocumentSource,
+        filename: Optional[str] = None,
+        document_type: Optional[str] = None,
+        use_llm_cache: bool = True,
+        progress: Optional[PipelineProgress] = None,
+    ) -> ExtractionResult:
+        """Same as :meth:`run` without blocking the event loop.
+
+        Text extraction is orchestrated on the I/O thread pool and submits its
+        CPU-bound steps to the process pool; the LLM call runs on the I/O pool.
+        ``document`` may be a path to a spooled upload, which is read from disk
+        by the stages that need it instead of being loaded up front.
+
+        With ``flights`` set, a request identical to one already in progress
+        (same document, type, cache mode and settings) waits for that one's
+        result instead of repeating the work; see :class:`SingleFlight`.
+        """
+        document_type = document_type or filename or "unknown"
+        if self.flights is None:
+            return await self._run_async(
+                document, filename, document_type, use_llm_cache, progress
+            )
+        # Hashed once: the digest is reused by the artifact cache key.
+        with timed("coalescing_key"):
+            digest = await self.worker_pools.run_io(document_digest, document)
+        key = self._flight_key(digest, filename, document_type, use_llm_cache)
+        return await self.flights.run(
+            key,
+            lambda fanout: self._run_async(
+                document, filename, document_type, use_llm_cache, fanout, digest
+            ),
+            progress,
         )
-        llm_fields = self._to_field_results(llm_fields_raw)
-        merged_fields = self.deps.merger.merge_fields(regex_fields, llm_fields)
-        field_results = list(merged_fields.values())
+
+    async def _run_async(
+        self,
+        document: DocumentSource,
+        filename: Optional[str],
+        document_type: str,
+        use_llm_cache: bool,
+        progress: Optional[PipelineProgress],
+        digest: Optional[str] = None,
+    ) -> ExtractionResult:
+        pools = self.worker_pools
+        with request_timings(), timed("pipeline"):
+            if progress:
+                progress.on_stage("text_extraction")
+            with timed("text_extraction"):
+                extracted = await pools.run_io(
+                    self._extract_text,
+                    document,
+                    filename or document_type,
+                    progress.on_page if progress else None,
+                    digest,
+                )
+            raw_text = extracted.text
+            if not _is_text_meaningful(raw_text):
+                return self._build_result(document_type, extracted, {})
+
+            regex_fields, unresolved = self._regex_fields(raw_text)
+            llm_fields_raw: dict = {}
+            if unresolved:
+                if progress:
+                    progress.on_stage("llm")
+                with timed("llm"):
+                    llm_fields_raw = await pools.run_io(
+                        self.deps.llm_client.extract_fields,
+                        raw_text,
+                        document_type,
+                        use_cache=use_llm_cache,
+                        fields=unresolved,
+                    )
+            return self._merge(document_type, extracted, regex_fields, llm_fields_raw)
+
+    def _regex_fields(self, raw_text: str) -> tuple[dict[str, FieldResult], list[str]]:
+        """Run the regex stage; returns its fields and the ones left for the LLM.
+
+        Only what regex did not settle goes to the LLM, which is skipped
+        entirely when nothing is left.
+        """
+        with timed("regex"):
+            regex_fields = self.deps.regex_extractor.extract_by_regex(raw_text)
+        return regex_fields, self.deps.merger.unresolved_fields(regex_fields)
+
+    def _merge(
+        self,
+        document_type: str,
+        extracted: ExtractedText,
+        regex_fields: dict[str, FieldResult],
+        llm_fields_raw: dict,
+    ) -> ExtractionResult:
+        with timed("merge"):
+            merged_fields = self.deps.merger.merge_fields(
+                regex_fields, self._to_field_results(llm_fields_raw)
+            )
+        return self._build_result(document_type, extracted, merged_fields)
+
+    def _flight_key(
+        self,
+        digest: str,
+        filename: Optional[str],
+        document_type: str,
+        use_llm_cache: bool,
+    ) -> str:
+        # The extension picks the extraction path; the scope covers OCR,
+        # model and prompt configuration.
+        parts = (
+            digest,
+            os.path.splitext(filename or "")[1].lower(),
+            document_type,
+            str(use_llm_cache),
+            self.flight_scope,
+        )
+        return "|".join(parts)
+
+    def _build_result(
+        self,
+        document_type: str,
+        extracted: ExtractedText,
+        fields: dict[str, FieldResult],
+    ) -> ExtractionResult:
+        for page in extracted.pages:
+            PAGES.labels("blank" if page.blank else page.source).inc()
         return ExtractionResult(
-            document_type=filename or "unknown",
-            ocr_engine=self.deps.ocr_engine.__class__.__name__ if used_ocr else None,
-            ocr_confidence=ocr_confidence,
-            fields=field_results,
-            raw_text=raw_text,
+            document_type=document_type,
+            ocr_engine=self._ocr_engine_name(extracted.source),
+            ocr_confidence=extracted.confidence,
+            fields=list(fields.values()),
+            raw_text=extracted.text,
+            pages=[
+                PageProvenance(
+                    index=page.index,
+                    source=page.source,
+                    confidence=page.confidence,
+                    chars=len(page.text),
+                    dpi=page.dpi,
+                    blank=page.blank,
+                )
+                for page in extracted.pages
+            ],
         )
 
+    def close(self) -> None:
+        close = getattr(self.deps.llm_client, "close", None)
+        if close:
+            close()
+
     @staticmethod
     def _to_field_results(fields: dict) -> dict[str, FieldResult]:
         results: dict[str, FieldResult] = {}
@@ -96,48 +308,103 @@ def _is_text_meaningful(raw_text: str) -> bool:
     return any(keyword in content for keyword in keywords)
 
 
-def run_extraction(
-    file_bytes: bytes,
-    document_type: str,
-    filename: str | None = None,
-) -> ExtractionResult:
-    text_extractor = TextExtractor(ocr_engine=TesseractOcrEngine())
+def build_ocr_engine(settings: Settings) -> IOcrEngine:
+    name = settings.ocr_engine.lower()
+    if name == "tesseract":
+        return TesseractOcrEngine(settings=settings)
+    if name == "tesserocr":
+        return TesserocrEngine(settings=settings)
+    raise ValueError(f"Unknown OCR_ENGINE: {settings.ocr_engine!r}")
 
-    # filename varsa onu kullan, yoksa document_type’yi fallback yap
-    raw_text, ocr_conf, text_source = text_extractor.extract_text(
-        file_bytes, filename or document_type
+
+def build_page_preprocessor(settings: Settings) -> Optional[PagePreprocessor]:
+    if not settings.ocr_preprocess:
+        return None
+    return PagePreprocessor(
+        blank_ink_ratio=settings.ocr_blank_ink_ratio,
+        min_contrast=settings.ocr_blank_min_contrast,
+        deskew=settings.ocr_deskew,
+        binarize=settings.ocr_binarize,
     )
 
-    ocr_engine_name = (
-        text_extractor.ocr_engine.__class__.__name__
-        if text_source == "ocr" and text_extractor.ocr_engine
+
+def build_artifact_cache(settings: Settings) -> Optional[TieredCache]:
+    if not settings.artifact_cache_enabled:
+        return None
+    disk_path = (
+        os.path.join(settings.artifact_cache_dir, "artifacts.sqlite3")
+        if settings.artifact_cache_dir
         else None
     )
+    return build_tiered_cache(
+        settings.artifact_cache_memory_bytes, disk_path, settings.artifact_cache_disk_bytes
+    )
 
-    if not _is_text_meaningful(raw_text):
-        return ExtractionResult(
-            document_type=document_type,
-            ocr_engine=ocr_engine_name,
-            ocr_confidence=ocr_conf,
-            fields=[],
-            raw_text=raw_text,
-        )
 
-    regex_extractor = RegexExtractor()
-    regex_fields = regex_extractor.extract_by_regex(raw_text)
+def build_llm_cache(settings: Settings) -> Optional[LlmResponseCache]:
+    if not settings.llm_cache_enabled:
+        return None
+    disk_path = (
+        os.path.join(settings.llm_cache_dir, "llm_responses.sqlite3")
+        if settings.llm_cache_dir
+        else None
+    )
+    return LlmResponseCache(
+        build_tiered_cache(
+            settings.llm_cache_memory_bytes,
+            disk_path,
+            settings.llm_cache_disk_bytes,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+        )
+    )
 
-    llm_client = OllamaLlmClient()
-    llm_fields_raw = llm_client.extract_fields(raw_text, document_type)
-    llm_fields = ExtractionPipeline._to_field_results(llm_fields_raw)
 
-    merger = ResultMerger()
-    merged_fields = merger.merge_fields(regex_fields, llm_fields)
+def build_pipeline(
+    pools: Optional[WorkerPools] = None, settings: Optional[Settings] = None
+) -> ExtractionPipeline:
+    """Build the production pipeline from ``settings`` (the global ones by default).
 
-    return ExtractionResult(
-        document_type=document_type,
-        ocr_engine=ocr_engine_name,
-        ocr_confidence=ocr_conf,
-        fields=list(merged_fields.values()),
-        raw_text=raw_text,
+    With ``pools`` the text extractor submits CPU-bound work to ``pools.cpu``.
+    """
+    settings = settings or get_settings()
+    ocr_engine = build_ocr_engine(settings)
+    artifact_cache = build_artifact_cache(settings)
+    llm_cache = build_llm_cache(settings)
+    if artifact_cache is not None:
+        register_cache("artifacts", artifact_cache.stats)
+    if llm_cache is not None:
+        register_cache("llm", llm_cache.stats)
+    text_extractor = TextExtractor(
+        ocr_engine=ocr_engine,
+        executor=pools.cpu if pools else None,
+        cache=artifact_cache,
+        preprocessor=build_page_preprocessor(settings),
+        settings=settings,
+    )
+    register_ocr_stats(text_extractor.ocr_stats)
+    return ExtractionPipeline(
+        text_extractor=text_extractor,
+        ocr_engine=ocr_engine,
+        regex_extractor=RegexExtractor(),
+        llm_client=OllamaLlmClient(cache=llm_cache, settings=settings),
+        merger=ResultMerger(),
+        pools=pools,
+        flights=SingleFlight() if settings.coalesce_requests else None,
+        flight_scope=hashlib.sha256(settings.model_dump_json().encode("utf-8")).hexdigest(),
     )
 
+
+@lru_cache()
+def get_default_pipeline() -> ExtractionPipeline:
+    return build_pipeline()
+
+
+def run_extraction(
+    file_bytes: bytes,
+    document_type: str,
+    filename: str | None = None,
+) -> ExtractionResult:
+    # filename varsa onu kullan, yoksa document_type’yi fallback yap
+    return get_default_pipeline().run(
+        file_bytes, filename=filename, document_type=document_type
+    )
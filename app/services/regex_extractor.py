@@ -1,54 +1,129 @@
+import bisect
 import re
-from typing import Dict, Optional
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
 
 from app.domain.models import TARGET_FIELDS, FieldResult
 
 
+# field -> (anchor, full pattern). The anchor is what the single-pass scanner
+# looks for; the full pattern is then matched at the anchor position to parse
+# the value, so values may run over other labels without hiding them.
+FIELD_PATTERNS: dict[str, tuple[str, str]] = {
+    "Mahal_Kodu": (r"Mahal[\s_-]?Kodu", r"Mahal[\s_-]?Kodu[:\s]+(?P<value>\w+)"),
+    "M2": (r"\d+(?:[,.]\d+)?\s*m2", r"(?P<value>\d+(?:[,.]\d+)?)\s*m2"),
+    "Asgari_Kira": (r"Asgari\s+Kira", r"Asgari\s+Kira[:\s]+(?P<value>[\d.,]+)"),
+    "Ciro_Kira_Orani": (
+        r"Ciro\s+Kira\s+Orani",
+        r"Ciro\s+Kira\s+Orani[:\s]+(?P<value>[\d.,]+%?)",
+    ),
+    "Dekorasyon_Koordinasyon": (
+        r"Dekorasyon\s+Koordinasyon",
+        r"Dekorasyon\s+Koordinasyon[:\s]+(?P<value>[\w\s]+)",
+    ),
+    "Mali_Sorumluluk_Sigortasi": (
+        r"Mali\s+Sorumluluk\s+Sigortasi",
+        r"Mali\s+Sorumluluk\s+Sigortasi[:\s]+(?P<value>[\w\s]+)",
+    ),
+    "Gecikme_Faizi": (r"Gecikme\s+Faizi", r"Gecikme\s+Faizi[:\s]+(?P<value>[\d.,]+%?)"),
+    "Bir_Yil_Uzama_Artis": (
+        r"Bir\s+Yil\s+Uzama\s+Artis",
+        r"Bir\s+Yil\s+Uzama\s+Artis[:\s]+(?P<value>[\d.,]+%?)",
+    ),
+    "Bir_Yil_Uzama_Ciro_Kira": (
+        r"Bir\s+Yil\s+Uzama\s+Ciro\s+Kira",
+        r"Bir\s+Yil\s+Uzama\s+Ciro\s+Kira[:\s]+(?P<value>[\d.,]+%?)",
+    ),
+    "Ceza_Bedeli": (r"Ceza\s+Bedeli", r"Ceza\s+Bedeli[:\s]+(?P<value>[\d.,]+)"),
+}
+
+# Must cover the first character of every anchor above. The lookahead lets
+# the regex engine reject most positions with one set test instead of trying
+# every alternative.
+ANCHOR_FIRST_CHARS = r"[mMaAcCdDgGbB\d]"
+
+
+@dataclass(frozen=True)
+class RegexCandidate:
+    name: str
+    value: str
+    start: int
+    end: int
+    page: int
+    source_quote: str
+
+
 class RegexExtractor:
     def __init__(self) -> None:
         self.patterns = {
-            "Mahal_Kodu": re.compile(r"Mahal[\s_-]?Kodu[:\s]+(?P<value>\w+)", re.IGNORECASE),
-            "M2": re.compile(r"(?P<value>\d+(?:[,.]\d+)?)\s*m2", re.IGNORECASE),
-            "Asgari_Kira": re.compile(r"Asgari\s+Kira[:\s]+(?P<value>[\d.,]+)", re.IGNORECASE),
-            "Ciro_Kira_Orani": re.compile(r"Ciro\s+Kira\s+Orani[:\s]+(?P<value>[\d.,]+%?)", re.IGNORECASE),
-            "Dekorasyon_Koordinasyon": re.compile(
-                r"Dekorasyon\s+Koordinasyon[:\s]+(?P<value>[\w\s]+)", re.IGNORECASE
-            ),
-            "Mali_Sorumluluk_Sigortasi": re.compile(
-                r"Mali\s+Sorumluluk\s+Sigortasi[:\s]+(?P<value>[\w\s]+)", re.IGNORECASE
-            ),
-            "Gecikme_Faizi": re.compile(r"Gecikme\s+Faizi[:\s]+(?P<value>[\d.,]+%?)", re.IGNORECASE),
-            "Bir_Yil_Uzama_Artis": re.compile(
-                r"Bir\s+Yil\s+Uzama\s+Artis[:\s]+(?P<value>[\d.,]+%?)", re.IGNORECASE
-            ),
-            "Bir_Yil_Uzama_Ciro_Kira": re.compile(
-                r"Bir\s+Yil\s+Uzama\s+Ciro\s+Kira[:\s]+(?P<value>[\d.,]+%?)",
-                re.IGNORECASE,
-            ),
-            "Ceza_Bedeli": re.compile(r"Ceza\s+Bedeli[:\s]+(?P<value>[\d.,]+)", re.IGNORECASE),
+            name: re.compile(full, re.IGNORECASE) for name, (_, full) in FIELD_PATTERNS.items()
         }
+        # One alternation of all anchors, one named group per field, so the
+        # text is scanned once regardless of the number of fields. The anchors
+        # are zero-width: a matched label does not consume the text, so a
+        # label starting inside it (e.g. "Ciro Kira Orani" within "Bir Yil
+        # Uzama Ciro Kira Orani") is still tried at its own position.
+        anchors = "|".join(
+            f"(?=(?P<{name}>{anchor}))" for name, (anchor, _) in FIELD_PATTERNS.items()
+        )
+        self.anchor_pattern = re.compile(
+            f"(?={ANCHOR_FIRST_CHARS})(?:{anchors})", re.IGNORECASE
+        )
+
+    def iter_scan(self, text: str) -> Iterator[RegexCandidate]:
+        """Yield every field candidate in document order.
+
+        ``page`` is the 0-based page index, counted from the form feeds that
+        :class:`TextExtractor` places between pages.
+        """
+        page_breaks = [match.start() for match in re.finditer("\f", text)]
+        # Where each field's last match ended. Like a per-field finditer, a
+        # field's matches do not overlap one another ("120 m2" is not also
+        # read as "20 m2").
+        field_ends: dict[str, int] = {}
+        for anchor in self.anchor_pattern.finditer(text):
+            name = anchor.lastgroup
+            if anchor.start() < field_ends.get(name, 0):
+                continue
+            match = self.patterns[name].match(text, anchor.start())
+            if not match:
+                continue
+            field_ends[name] = max(match.end(), match.start() + 1)
+            yield RegexCandidate(
+                name=name,
+                value=match.group("value").strip(),
+                start=match.start("value"),
+                end=match.end("value"),
+                page=bisect.bisect_right(page_breaks, match.start()),
+                source_quote=match.group(0).strip(),
+            )
+
+    def scan(self, text: str) -> list[RegexCandidate]:
+        return list(self.iter_scan(text))
+
+    def _first_candidates(self, text: str) -> dict[str, RegexCandidate]:
+        first: dict[str, RegexCandidate] = {}
+        for candidate in self.iter_scan(text):
+            first.setdefault(candidate.name, candidate)
+            # Stop early once every field has its first hit.
+            if len(first) == len(self.patterns):
+                break
+        return {name: first[name] for name in self.patterns if name in first}
 
     def extract(self, text: str) -> Dict[str, Optional[str]]:
         results: Dict[str, Optional[str]] = {field: None for field in TARGET_FIELDS}
-        for key, pattern in self.patterns.items():
-            match = pattern.search(text)
-            if match:
-                results[key] = match.group("value").strip()
+        for name, candidate in self._first_candidates(text).items():
+            results[name] = candidate.value
         return results
 
     def extract_by_regex(self, text: str) -> dict[str, FieldResult]:
         results: dict[str, FieldResult] = {}
-        for name, pattern in self.patterns.items():
-            match = pattern.search(text)
-            if not match:
-                continue
-
-            value = match.group("value").strip()
+        for name, candidate in self._first_candidates(text).items():
             results[name] = FieldResult(
                 name=name,
-                value=value,
+                value=candidate.value,
                 confidence=0.95,
-                source_quote=match.group(0).strip(),
+                source_quote=candidate.source_quote,
                 source="regex",
             )
 
@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+import hashlib
 import io
+import json
 import logging
-from typing import Optional
+import re
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Sequence, TypeVar, Union
 
 import numpy as np
 import cv2
 
 try:
-    from pdf2image import convert_from_bytes
+    from pdf2image import convert_from_path, pdfinfo_from_path
 except ImportError:  # pragma: no cover - optional dependency guard
-    convert_from_bytes = None
+    convert_from_path = None
+    pdfinfo_from_path = None
 
 try:
     import pdfplumber
@@ -21,41 +32,198 @@ try:
     from pypdf import PdfReader
 except ImportError:  # pragma: no cover - optional dependency guard
     PdfReader = None
+from app.core import profiling
+from app.core.config import Settings, get_settings
+from app.core.metrics import OCR_ESCALATIONS, add_timings, capture_timings, timed
+from app.services.cache import TieredCache
 from app.services.ocr.base import IOcrEngine
+from app.services.ocr.preprocess import PagePreprocessor
+from app.services.ocr.words import OcrWords
 
 
 LOGGER = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Called with (pages_done, pages_total) as OCR pages complete.
+PageProgress = Callable[[int, int], None]
+
+# Pages are joined with a form feed, as pdftotext does, so that later stages
+# can recover page boundaries from the joined text.
+PAGE_SEPARATOR = "\f"
+
+# A document is either held in memory or spooled to a file. Paths are
+# preferred for large uploads: workers open the file themselves, so the
+# document is never copied into memory or across process boundaries.
+DocumentSource = Union[bytes, Path]
+
+
+@dataclass
+class PageText:
+    index: int
+    text: str
+    confidence: Optional[float]
+    source: str
+    # Resolution of the render the text came from, and every resolution the
+    # page was rendered at, in order; OCRed PDF pages only.
+    dpi: Optional[int] = None
+    rendered_dpis: list[int] = field(default_factory=list)
+    # Set by the preprocessor: blank pages are not OCRed, and the pixel
+    # counts show how much of the render was trimmed before OCR.
+    blank: bool = False
+    page_pixels: Optional[int] = None
+    ocr_pixels: Optional[int] = None
+    # Word columns behind ``text`` (boxes, confidences, line ids) when the
+    # engine provides them; kept for later stages, never cached.
+    words: Optional[OcrWords] = None
+    # Stage timings measured where the page was processed (possibly in a
+    # pool worker); merged into the request's timings, never cached.
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class OcrStats:
+    """What OCR cost: escalated re-renders, skipped blank pages, trimmed pixels."""
+
+    pages: int = 0
+    escalated: int = 0
+    blank_pages: int = 0
+    page_pixels: int = 0
+    ocr_pixels: int = 0
+    renders: dict[int, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, page: PageText) -> None:
+        with self._lock:
+            self.pages += 1
+            self.blank_pages += page.blank
+            if page.page_pixels is not None:
+                self.page_pixels += page.page_pixels
+                self.ocr_pixels += page.ocr_pixels or 0
+            # Counted from the renders that happened, not from the winning
+            # one: an escalated page may still be read best at its first DPI.
+            if len(page.rendered_dpis) > 1:
+                self.escalated += 1
+                OCR_ESCALATIONS.inc()
+            for dpi in page.rendered_dpis:
+                self.renders[dpi] = self.renders.get(dpi, 0) + 1
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalated / self.pages if self.pages else 0.0
+
+    @property
+    def trimmed_ratio(self) -> float:
+        """Share of preprocessed pixels that never reached the OCR engine."""
+        if not self.page_pixels:
+            return 0.0
+        return 1 - self.ocr_pixels / self.page_pixels
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "pages": self.pages,
+                "escalated": self.escalated,
+                "escalation_rate": self.escalation_rate,
+                "blank_pages": self.blank_pages,
+                "trimmed_ratio": self.trimmed_ratio,
+                "renders": dict(self.renders),
+            }
+
+
+@dataclass
+class ExtractedText:
+    text: str
+    confidence: Optional[float]
+    # "native", "ocr", or "hybrid" when pages came from both.
+    source: str
+    pages: list[PageText]
+
+
+# Glyphs pdfplumber could not map to characters; they are not real text.
+UNMAPPED_GLYPH = re.compile(r"\(cid:\d+\)")
+
 
 class TextExtractor:
-    """Extract text from PDF or image-like files using native layers and OCR."""
+    """Extract text from PDF or image-like files using native layers and OCR.
+
+    PDFs are classified page by page: a page keeps its text layer when it
+    holds enough real text and only the remaining pages are rendered and
+    OCRed, so mixed documents (digital pages with scanned annexes) are cheap.
 
-    KEYWORDS = ["kira", "kiracı", "kiralayan", "tl", "mahal"]
+    Pages are rendered at the first of ``dpi_steps`` and re-rendered at the
+    next step only while OCR confidence stays below ``escalation_confidence``.
+    An explicit ``dpi`` renders every page once at that resolution.
+    """
 
-    def __init__(self, ocr_engine: Optional[IOcrEngine] = None) -> None:
+    NATIVE_MIN_CHARS = 40
+    NATIVE_MIN_ALNUM_RATIO = 0.5
+
+    def __init__(
+        self,
+        ocr_engine: Optional[IOcrEngine] = None,
+        executor: Optional[Executor] = None,
+        dpi: Optional[int] = None,
+        max_pages_in_flight: Optional[int] = None,
+        cache: Optional[TieredCache] = None,
+        dpi_steps: Optional[Sequence[int]] = None,
+        escalation_confidence: Optional[float] = None,
+        preprocessor: Optional[PagePreprocessor] = None,
+        pages_per_task: Optional[int] = None,
+        settings: Optional[Settings] = None,
+    ) -> None:
+        settings = settings or get_settings()
         self.ocr_engine = ocr_engine
+        # CPU-bound steps (PDF parsing, rasterisation, OCR) are submitted here
+        # when set; arguments must be picklable for process pools.
+        self.executor = executor
+        if dpi:
+            steps: Sequence[int] = [dpi]
+        else:
+            steps = dpi_steps or settings.ocr_dpi_steps or default_dpi_steps(settings.ocr_dpi)
+        self.dpi_steps = tuple(sorted(set(steps)))
+        self.dpi = self.dpi_steps[-1]
+        self.escalation_confidence = (
+            escalation_confidence
+            if escalation_confidence is not None
+            else settings.ocr_escalation_confidence
+        )
+        # Applied to every image before OCR when set; see PagePreprocessor.
+        self.preprocessor = preprocessor
+        self.ocr_stats = OcrStats()
+        self.max_pages_in_flight = max(
+            1, max_pages_in_flight or settings.ocr_max_pages_in_flight
+        )
+        # Pages rendered and OCRed by one pool task, in one engine batch.
+        self.pages_per_task = max(1, pages_per_task or settings.ocr_pages_per_task)
+        self.cache = cache
+
+    def _submit(self, func: Callable[..., T], *args: Any) -> T:
+        if self.executor is None:
+            return func(*args)
+        return profiling.submit(self.executor, func, *args).result()
 
     @staticmethod
-    def _extract_pdfplumber(file_obj: io.BytesIO) -> str:
+    def _extract_pdfplumber(file_obj: Union[io.BytesIO, str]) -> Optional[list[str]]:
         if not pdfplumber:
-            return ""
+            return None
         try:
             with pdfplumber.open(file_obj) as pdf:
-                return "\n".join(page.extract_text() or "" for page in pdf.pages)
+                return [page.extract_text() or "" for page in pdf.pages]
         except Exception as exc:  # pragma: no cover - library level issues
             LOGGER.warning("pdfplumber failed to extract text: %s", exc)
-            return ""
+            return None
 
     @staticmethod
-    def _extract_pypdf(file_obj: io.BytesIO) -> str:
+    def _extract_pypdf(file_obj: Union[io.BytesIO, str]) -> Optional[list[str]]:
         if not PdfReader:
-            return ""
+            return None
         try:
             reader = PdfReader(file_obj)
-            return "\n".join(page.extract_text() or "" for page in reader.pages)
+            return [page.extract_text() or "" for page in reader.pages]
         except Exception as exc:  # pragma: no cover - library level issues
             LOGGER.warning("PyPDF failed to extract text: %s", exc)
-            return ""
+            return None
 
     @staticmethod
     def _decode_text(file_bytes: bytes) -> str:
@@ -67,69 +235,433 @@ class TextExtractor:
             except UnicodeDecodeError:
                 return ""
 
-    def _is_native_valid(self, text: str) -> bool:
-        content = text.strip().lower()
-        if len(content) < 80:
+    def _is_page_native(self, text: str) -> bool:
+        """Whether a page's text layer holds enough real text to skip OCR."""
+        content = "".join(UNMAPPED_GLYPH.sub("", text).split())
+        if len(content) < self.NATIVE_MIN_CHARS:
             return False
-        return any(keyword in content for keyword in self.KEYWORDS)
+        alnum = sum(1 for char in content if char.isalnum())
+        return alnum / len(content) >= self.NATIVE_MIN_ALNUM_RATIO
 
     @staticmethod
-    def _load_image(file_bytes: bytes) -> Optional[np.ndarray]:
-        if not file_bytes:
+    def _load_image(source: DocumentSource) -> Optional[np.ndarray]:
+        if isinstance(source, Path):
+            return cv2.imread(str(source), cv2.IMREAD_COLOR)
+        if not source:
             return None
-        np_bytes = np.frombuffer(file_bytes, np.uint8)
+        np_bytes = np.frombuffer(source, np.uint8)
         image = cv2.imdecode(np_bytes, cv2.IMREAD_COLOR)
         return image
 
     @staticmethod
-    def _load_pdf_page(file_bytes: bytes, dpi: int = 400) -> Optional[np.ndarray]:
-        if not convert_from_bytes:
+    def _load_pdf_page(pdf_path: str, page_number: int, dpi: int) -> Optional[np.ndarray]:
+        """Render a single 1-based PDF page so only one bitmap is held at a time."""
+        if not convert_from_path:
             LOGGER.warning("pdf2image is not available; skipping OCR fallback for PDF")
             return None
         try:
-            pages = convert_from_bytes(file_bytes, dpi=dpi)
+            pages = convert_from_path(
+                pdf_path, dpi=dpi, first_page=page_number, last_page=page_number
+            )
         except Exception as exc:  # pragma: no cover - library level issues
-            LOGGER.warning("Failed to convert PDF to image for OCR fallback: %s", exc)
+            LOGGER.warning("Failed to convert PDF page %s to image: %s", page_number, exc)
             return None
         if not pages:
             return None
-        first_page = pages[0].convert("RGB")
-        return cv2.cvtColor(np.array(first_page), cv2.COLOR_RGB2BGR)
+        page = pages[0].convert("RGB")
+        return cv2.cvtColor(np.array(page), cv2.COLOR_RGB2BGR)
+
+    @staticmethod
+    def _count_pdf_pages(pdf_path: str) -> int:
+        if not pdfinfo_from_path:
+            return 0
+        try:
+            return int(pdfinfo_from_path(pdf_path).get("Pages", 0))
+        except Exception as exc:  # pragma: no cover - library level issues
+            LOGGER.warning("Failed to read PDF page count: %s", exc)
+            return 0
+
+    @staticmethod
+    def _join_pages(pages: list[PageText]) -> tuple[str, Optional[float]]:
+        """Join page texts in order with a text-length weighted confidence."""
+        if len(pages) == 1:
+            return pages[0].text, pages[0].confidence
+        text = PAGE_SEPARATOR.join(page.text for page in pages)
+        scored = [page for page in pages if page.confidence is not None]
+        if not scored:
+            return text, None
+        total_weight = sum(len(page.text) for page in scored)
+        if not total_weight:
+            return text, sum(page.confidence for page in scored) / len(scored)
+        confidence = sum(page.confidence * len(page.text) for page in scored) / total_weight
+        return text, confidence
+
+    def _ocr_image(self, source: DocumentSource) -> list[PageText]:
+        page = self._submit(
+            _load_and_ocr, self.ocr_engine, self._load_image, source, self.preprocessor
+        )
+        self._record_page(page)
+        return [page]
+
+    def _record_page(self, page: PageText) -> None:
+        self.ocr_stats.record(page)
+        add_timings(page.timings)
+        if page.blank:
+            # Also visible as PageProvenance.blank and rda_ocr_blank_pages.
+            LOGGER.info("Page %d looks blank; skipped OCR", page.index + 1)
+
+    def _ocr_pdf_pages(
+        self,
+        source: DocumentSource,
+        on_page: Optional[PageProgress] = None,
+        page_numbers: Optional[list[int]] = None,
+    ) -> list[PageText]:
+        """OCR ``page_numbers`` (1-based; all pages by default) in order.
+
+        Pages go to workers in tasks of ``pages_per_task``, with bounded
+        tasks in flight. Workers render their own pages from the PDF on
+        disk, so neither the document nor page bitmaps are copied between
+        processes and at most ``max_pages_in_flight`` bitmaps (or one task's
+        worth) exist per document.
+        """
+        with _as_path(source, ".pdf") as pdf_path:
+            if page_numbers is None:
+                page_numbers = list(range(1, self._count_pdf_pages(pdf_path) + 1))
+            page_count = len(page_numbers)
+            if not page_count:
+                return []
+
+            pages: list[PageText] = []
+            in_flight: deque[Future] = deque()
+            max_tasks = max(1, self.max_pages_in_flight // self.pages_per_task)
+
+            def collect() -> None:
+                for page in in_flight.popleft().result():
+                    self._record_page(page)
+                    pages.append(page)
+                    if on_page:
+                        on_page(len(pages), page_count)
+
+            for start in range(0, page_count, self.pages_per_task):
+                batch = page_numbers[start : start + self.pages_per_task]
+                in_flight.append(self._submit_pages(pdf_path, batch))
+                if len(in_flight) >= max_tasks:
+                    collect()
+            while in_flight:
+                collect()
+            return pages
+
+    def _submit_pages(self, pdf_path: str, page_numbers: list[int]) -> Future:
+        args = (
+            self.ocr_engine,
+            pdf_path,
+            page_numbers,
+            self.dpi_steps,
+            self.escalation_confidence,
+            self.preprocessor,
+        )
+        if self.executor is not None:
+            return profiling.submit(self.executor, _render_and_ocr_pages, *args)
+        future: Future = Future()
+        future.set_result(_render_and_ocr_pages(*args))
+        return future
+
+    def _extract_pages(
+        self, source: DocumentSource, is_pdf: bool, on_page: Optional[PageProgress] = None
+    ) -> tuple[list[PageText], str]:
+        native = None
+        if is_pdf:
+            with timed("pdf_parse"):
+                native = self._submit(_extract_native_pages, source)
+        if native is not None:
+            pages = [
+                PageText(index=index, text=text, confidence=None, source="native")
+                for index, text in enumerate(native)
+            ]
+            weak = [page.index + 1 for page in pages if not self._is_page_native(page.text)]
+            if weak and not self.ocr_engine:
+                LOGGER.warning(
+                    "OCR engine is not configured; keeping the text layer of %s pages", len(weak)
+                )
+            elif weak:
+                for page in self._ocr_pdf_pages(source, on_page, weak):
+                    # A failed render keeps whatever the text layer had.
+                    if page.text or not pages[page.index].text:
+                        pages[page.index] = page
+            return pages, _document_source(pages)
 
-    def _extract_via_ocr(self, image: Optional[np.ndarray]) -> tuple[str, Optional[float], str]:
         if not self.ocr_engine:
             LOGGER.warning("OCR engine is not configured; returning empty text from OCR fallback")
-            return "", None, "ocr"
-        if image is None:
-           LOGGER.warning("No image provided for OCR fallback; returning empty text")
-           return "", None, "ocr"
-        text, confidence = self.ocr_engine.run(image)
-        return text, confidence, "ocr"
+            return [], "ocr"
+        if is_pdf:
+            # The PDF could not be parsed at all; rasterise every page.
+            return self._ocr_pdf_pages(source, on_page), "ocr"
+        # For image-like inputs, rely on OCR directly
+        return self._ocr_image(source), "ocr"
 
-    def extract_text(self, file_bytes: bytes, document_type: str) -> tuple[str, Optional[float], str]:
-        extension = (document_type or "").lower()
+    def _cache_key(
+        self, source: DocumentSource, is_pdf: bool, digest: Optional[str] = None
+    ) -> str:
+        engine = self.ocr_engine
+        parts = (
+            digest or document_digest(source),
+            "pdf" if is_pdf else "image",
+            engine.__class__.__name__ if engine else "none",
+            getattr(engine, "language", ""),
+            # The upscale retry patches weak words, so it changes the text.
+            ",".join(
+                str(getattr(engine, name, ""))
+                for name in (
+                    "upscale_retry_confidence",
+                    "upscale_retry_scale",
+                    "upscale_retry_max_words",
+                )
+            ),
+            ",".join(str(dpi) for dpi in self.dpi_steps),
+            str(self.escalation_confidence),
+            json.dumps(vars(self.preprocessor), sort_keys=True) if self.preprocessor else "raw",
+        )
+        # Bump the version when page classification or OCR output format
+        # changes what is stored.
+        return "text:v3:" + "|".join(parts)
+
+    def _extract_pages_cached(
+        self,
+        source: DocumentSource,
+        is_pdf: bool,
+        on_page: Optional[PageProgress] = None,
+        digest: Optional[str] = None,
+    ) -> tuple[list[PageText], str]:
+        if self.cache is None:
+            return self._extract_pages(source, is_pdf, on_page)
+
+        key = self._cache_key(source, is_pdf, digest)
+        cached = self.cache.get(key)
+        if cached is not None:
+            payload = json.loads(cached)
+            return [PageText(**page) for page in payload["pages"]], payload["source"]
 
-        if not file_bytes:
-            if extension.endswith(".txt") or extension.endswith(".md"):
-                return "", None, "native"
-            return self._extract_via_ocr(None)
+        pages, text_source = self._extract_pages(source, is_pdf, on_page)
+        # Empty output usually means a missing binary or a failed render;
+        # do not pin that failure in the cache.
+        if any(page.text for page in pages):
+            payload = {
+                "source": text_source,
+                "pages": [asdict(replace(page, words=None, timings={})) for page in pages],
+            }
+            self.cache.set(key, json.dumps(payload).encode("utf-8"))
+        return pages, text_source
+
+    def extract_document(
+        self,
+        source: DocumentSource,
+        document_type: str,
+        on_page: Optional[PageProgress] = None,
+        digest: Optional[str] = None,
+    ) -> ExtractedText:
+        """Extract text with per-page provenance from in-memory or spooled input.
+
+        ``digest`` is the document's :func:`document_digest` when the caller
+        already has it, so the cache key does not hash the document again.
+        """
+        extension = (document_type or "").lower()
 
         if extension.endswith(".txt") or extension.endswith(".md"):
-            return self._decode_text(file_bytes), None, "native"
+            file_bytes = source.read_bytes() if isinstance(source, Path) else source
+            text = self._decode_text(file_bytes)
+            page = PageText(index=0, text=text, confidence=None, source="native")
+            return ExtractedText(text=text, confidence=None, source="native", pages=[page])
 
-        if extension.endswith(".pdf"):
-            buffer = io.BytesIO(file_bytes)
-            text = self._extract_pdfplumber(buffer)
-            if not text:
-                buffer.seek(0)
-                text = self._extract_pypdf(buffer)
+        if _is_empty(source):
+            if not self.ocr_engine:
+                LOGGER.warning("OCR engine is not configured; returning empty text from OCR fallback")
+            else:
+                LOGGER.warning("No image provided for OCR fallback; returning empty text")
+            return ExtractedText(text="", confidence=None, source="ocr", pages=[])
 
-            if text and self._is_native_valid(text):
-                return text, None, "native"
+        pages, text_source = self._extract_pages_cached(
+            source, extension.endswith(".pdf"), on_page, digest
+        )
+        text, confidence = self._join_pages(pages)
+        return ExtractedText(text=text, confidence=confidence, source=text_source, pages=pages)
 
-            image = self._load_pdf_page(file_bytes)
-            return self._extract_via_ocr(image)
+    def extract_text(
+        self,
+        source: DocumentSource,
+        document_type: str,
+        on_page: Optional[PageProgress] = None,
+    ) -> tuple[str, Optional[float], str]:
+        """Return ``(text, confidence, source)`` for in-memory or spooled input."""
+        extracted = self.extract_document(source, document_type, on_page)
+        return extracted.text, extracted.confidence, extracted.source
 
-        # For image-like inputs, rely on OCR directly
-        image = self._load_image(file_bytes)
-        return self._extract_via_ocr(image)
+
+def _document_source(pages: list[PageText]) -> str:
+    sources = {page.source for page in pages}
+    if len(sources) > 1:
+        return "hybrid"
+    return sources.pop() if sources else "ocr"
+
+
+def _is_empty(source: DocumentSource) -> bool:
+    if isinstance(source, Path):
+        return source.stat().st_size == 0
+    return not source
+
+
+def default_dpi_steps(dpi: int) -> list[int]:
+    """Escalation steps ending at ``dpi``: half, three quarters, then full."""
+    return [dpi // 2, dpi * 3 // 4, dpi]
+
+
+def document_digest(source: DocumentSource) -> str:
+    """SHA-256 of an in-memory or spooled document."""
+    if isinstance(source, Path):
+        with source.open("rb") as handle:
+            return hashlib.file_digest(handle, "sha256").hexdigest()
+    return hashlib.sha256(source).hexdigest()
+
+
+@contextmanager
+def _as_path(source: DocumentSource, suffix: str) -> Iterator[str]:
+    """Yield a file path for ``source``, spooling in-memory bytes if needed."""
+    if isinstance(source, Path):
+        yield str(source)
+        return
+    with tempfile.NamedTemporaryFile(suffix=suffix) as handle:
+        handle.write(source)
+        handle.flush()
+        yield handle.name
+
+
+def _extract_native_pages(source: DocumentSource) -> Optional[list[str]]:
+    """Return the text layer of every page, or None if the PDF cannot be parsed.
+
+    pypdf is only tried when pdfplumber could not read the file; an empty
+    text layer is an answer (a scanned page), not a reason to parse again.
+    """
+    # Both libraries read a path lazily; bytes are wrapped without copying.
+    target = str(source) if isinstance(source, Path) else io.BytesIO(source)
+    pages = TextExtractor._extract_pdfplumber(target)
+    if pages is None:
+        if isinstance(target, io.BytesIO):
+            target.seek(0)
+        pages = TextExtractor._extract_pypdf(target)
+    return pages
+
+
+def _ocr_pages(
+    ocr_engine: IOcrEngine,
+    images: Sequence[np.ndarray],
+    preprocessor: Optional[PagePreprocessor],
+    indices: Sequence[int],
+    dpi: Optional[int] = None,
+) -> list[PageText]:
+    """Preprocess ``images`` and OCR the non-blank ones in one engine batch."""
+    prepared = None
+    if preprocessor is not None:
+        with timed("preprocess"):
+            prepared = [preprocessor.run(image) for image in images]
+        images = [item.image for item in prepared]
+    blank = [prepared is not None and prepared[position].blank for position in range(len(images))]
+    inputs = [image for image, skip in zip(images, blank) if not skip]
+    read_batch = getattr(ocr_engine, "read_batch", None)
+    if read_batch is not None:
+        results = iter(
+            [(words.text, words.mean_confidence(), words) for words in read_batch(inputs)]
+        )
+    else:
+        results = iter([(*ocr_engine.run(image), None) for image in inputs])
+
+    pages = []
+    for position, index in enumerate(indices):
+        text, confidence, words = ("", None, None) if blank[position] else next(results)
+        page = PageText(
+            index=index, text=text, confidence=confidence, source="ocr", dpi=dpi, words=words
+        )
+        if prepared is not None:
+            page.blank = prepared[position].blank
+            page.page_pixels = prepared[position].page_pixels
+            page.ocr_pixels = prepared[position].ocr_pixels
+        pages.append(page)
+    return pages
+
+
+def _load_and_ocr(
+    ocr_engine: IOcrEngine,
+    loader: Callable[[DocumentSource], Optional[np.ndarray]],
+    source: DocumentSource,
+    preprocessor: Optional[PagePreprocessor] = None,
+) -> PageText:
+    # Decoding happens next to OCR so that only the compressed file bytes
+    # (or just its path), not the decoded page bitmap, cross the process boundary.
+    with capture_timings() as timings:
+        with timed("image_decode"):
+            image = loader(source)
+        if image is None:
+            LOGGER.warning("No image provided for OCR fallback; returning empty text")
+            page = PageText(index=0, text="", confidence=None, source="ocr")
+        else:
+            page = _ocr_pages(ocr_engine, [image], preprocessor, indices=[0])[0]
+    page.timings = timings
+    return page
+
+
+def _render_and_ocr_pages(
+    ocr_engine: IOcrEngine,
+    pdf_path: str,
+    page_numbers: Sequence[int],
+    dpi_steps: Sequence[int],
+    escalation_confidence: float,
+    preprocessor: Optional[PagePreprocessor] = None,
+) -> list[PageText]:
+    """Render and OCR pages, escalating each through ``dpi_steps`` as needed.
+
+    Escalation happens inside the task so the pages cost one round trip to
+    the worker, and each DPI step OCRs the pages still pending as one batch.
+    The most confident attempt wins, since a sharper render does not always
+    read better. A blank page is never re-rendered.
+    """
+    best = {
+        number: PageText(index=number - 1, text="", confidence=None, source="ocr")
+        for number in page_numbers
+    }
+    rendered_dpis: dict[int, list[int]] = {number: [] for number in page_numbers}
+    pending = list(page_numbers)
+    with capture_timings() as timings:
+        for dpi in dpi_steps:
+            rendered: list[tuple[int, np.ndarray]] = []
+            for number in pending:
+                with timed("render"):
+                    image = TextExtractor._load_pdf_page(pdf_path, number, dpi)
+                if image is not None:
+                    rendered.append((number, image))
+            if not rendered:
+                break
+            pages = _ocr_pages(
+                ocr_engine,
+                [image for _, image in rendered],
+                preprocessor,
+                [number - 1 for number, _ in rendered],
+                dpi,
+            )
+            pending = []
+            for (number, _), page in zip(rendered, pages):
+                rendered_dpis[number].append(dpi)
+                if page.blank:
+                    best[number] = page
+                    continue
+                confidence = page.confidence or 0.0
+                current = best[number].confidence
+                if current is None or confidence > current:
+                    best[number] = page
+                if confidence < escalation_confidence:
+                    pending.append(number)
+            if not pending:
+                break
+    results = [best[number] for number in page_numbers]
+    for number, page in zip(page_numbers, results):
+        page.rendered_dpis = rendered_dpis[number]
+    # The task's timings are reported once, with its first page.
+    results[0].timings = timings
+    return results
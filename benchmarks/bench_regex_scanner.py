@@ -0,0 +1,76 @@
+"""Compare the single-pass regex scanner with one scan per field.
+
+Usage: python -m benchmarks.bench_regex_scanner [--repeat N]
+
+Columns: ``per-field`` runs ``finditer`` once per field pattern (ten full
+scans), ``single-pass`` is ``RegexExtractor.scan``; both return every
+candidate. ``by_regex`` is ``extract_by_regex`` on a document where one field
+is missing, which forces a full scan.
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from app.services.regex_extractor import RegexExtractor
+
+
+PAGE = (
+    "Madde {page}. Taraflar arasinda asagidaki kosullar kararlastirilmistir.\n"
+    "Kiraci, kiralanan alani ozenle kullanmakla yukumludur ve bedeli TL olarak oder.\n"
+    "Mahal Kodu: B{page:03d}\n"
+    "Kiralanan alan 1{page:02d} m2 olup Asgari Kira: 12.500 TL olarak belirlenmistir.\n"
+    "Gecikme Faizi: %2 ve Ceza Bedeli: 50.000 TL uygulanir.\n"
+    + "Genel hukumler ve aciklamalar bu satirda yer alir. " * 20
+    + "\n"
+)
+
+
+def build_text(pages: int) -> str:
+    return "\f".join(PAGE.format(page=page) for page in range(1, pages + 1))
+
+
+def scan_per_field(extractor: RegexExtractor, text: str) -> int:
+    return sum(len(list(pattern.finditer(text))) for pattern in extractor.patterns.values())
+
+
+def run(repeat: int, page_counts: tuple[int, ...] = (1, 10, 50, 100, 200)) -> list[dict]:
+    extractor = RegexExtractor()
+    rows = []
+    for pages in page_counts:
+        text = build_text(pages)
+        per_field = timeit.timeit(lambda: scan_per_field(extractor, text), number=repeat)
+        single = timeit.timeit(lambda: extractor.scan(text), number=repeat)
+        by_regex = timeit.timeit(lambda: extractor.extract_by_regex(text), number=repeat)
+        rows.append(
+            {
+                "pages": pages,
+                "chars": len(text),
+                "per_field_ms": per_field / repeat * 1000,
+                "single_pass_ms": single / repeat * 1000,
+                "extract_by_regex_ms": by_regex / repeat * 1000,
+                "candidates": len(extractor.scan(text)),
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'pages':>6} {'chars':>10} {'per-field ms':>13} {'single-pass ms':>15} "
+        f"{'by_regex ms':>12} {'candidates':>11}"
+    )
+    for row in run(args.repeat):
+        print(
+            f"{row['pages']:>6} {row['chars']:>10} {row['per_field_ms']:>13.2f} "
+            f"{row['single_pass_ms']:>15.2f} {row['extract_by_regex_ms']:>12.2f} "
+            f"{row['candidates']:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
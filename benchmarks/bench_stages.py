@@ -0,0 +1,246 @@
+"""Per-stage benchmarks over the synthetic contract corpus.
+
+Usage: python -m benchmarks.bench_stages [--corpus DIR] [--repeat N] [--output FILE]
+
+Times ``TextExtractor.extract_text`` for every kind of document in the
+corpus (native PDF, scanned PDF per DPI and page count, PNG/JPEG photo),
+``TesseractOcrEngine.run`` on rendered pages per DPI,
+``RegexExtractor.extract_by_regex``, ``ResultMerger.merge_fields`` and
+``OllamaLlmClient.extract_fields`` against the local stub Ollama. Stages
+whose binaries (tesseract, poppler) are missing are reported as skipped.
+
+Results are written as JSON; compare two runs with ``benchmarks.compare``.
+The corpus is generated into a temporary directory unless ``--corpus``
+points at one made by ``benchmarks.corpus``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import cv2
+import numpy as np
+
+from app.core.config import get_settings
+from app.domain.models import FieldResult
+from app.services.llm.ollama_client import OllamaLlmClient
+from app.services.merger import ResultMerger
+from app.services.ocr.tesseract_engine import TesseractOcrEngine
+from app.services.regex_extractor import RegexExtractor
+from app.services.text_extractor import TextExtractor
+from benchmarks.corpus import build_corpus, load_manifest, make_contract, render_page
+from benchmarks.stub_ollama import StubOllama
+
+
+def measure(func: Callable[[], Any], repeat: int, warmup: int = 1) -> dict[str, Any]:
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "min_ms": samples[0],
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.fmean(samples),
+        "p95_ms": samples[min(len(samples) - 1, round(0.95 * (len(samples) - 1)))],
+    }
+
+
+def missing_binaries() -> dict[str, Optional[str]]:
+    """Why OCR stages cannot run here, per requirement (None when available)."""
+    tesseract = get_settings().tesseract_cmd or "tesseract"
+    return {
+        "tesseract": None if shutil.which(tesseract) else f"{tesseract} not found",
+        "poppler": None if shutil.which("pdftoppm") else "pdftoppm (poppler) not found",
+    }
+
+
+def bench_text_extraction(corpus: Path, repeat: int, missing: dict[str, Optional[str]]) -> list[dict]:
+    extractor = TextExtractor(ocr_engine=TesseractOcrEngine())
+    rows = []
+    for document in load_manifest(corpus):
+        case = {
+            "stage": "text_extractor.extract_text",
+            "case": document.file,
+            "kind": document.kind,
+            "pages": document.pages,
+            "dpi": document.dpi,
+        }
+        needs = {
+            "native_pdf": [],
+            "scanned_pdf": ["tesseract", "poppler"],
+            "photo": ["tesseract"],
+        }[document.kind]
+        reasons = [missing[name] for name in needs if missing[name]]
+        if reasons:
+            rows.append({**case, "skipped": "; ".join(reasons)})
+            continue
+        path = corpus / document.file
+        rows.append(
+            {**case, **measure(lambda: extractor.extract_text(path, document.file), repeat)}
+        )
+    return rows
+
+
+def bench_ocr_engine(repeat: int, missing: dict[str, Optional[str]], dpis: tuple[int, ...]) -> list[dict]:
+    engine = TesseractOcrEngine()
+    contract = make_contract(seed=7, pages=1)
+    rows = []
+    for dpi in dpis:
+        case = {"stage": "tesseract_engine.run", "case": f"page@{dpi}dpi", "dpi": dpi}
+        if missing["tesseract"]:
+            rows.append({**case, "skipped": missing["tesseract"]})
+            continue
+        image = cv2.cvtColor(np.asarray(render_page(contract.pages[0], dpi)), cv2.COLOR_GRAY2BGR)
+        rows.append({**case, **measure(lambda: engine.run(image), repeat)})
+    return rows
+
+
+def bench_regex(repeat: int, page_counts: tuple[int, ...]) -> list[dict]:
+    extractor = RegexExtractor()
+    rows = []
+    for pages in page_counts:
+        text = make_contract(seed=pages, pages=pages).text
+        rows.append(
+            {
+                "stage": "regex_extractor.extract_by_regex",
+                "case": f"{pages}p",
+                "pages": pages,
+                "chars": len(text),
+                **measure(lambda: extractor.extract_by_regex(text), repeat * 10),
+            }
+        )
+    return rows
+
+
+def bench_merge(repeat: int) -> list[dict]:
+    contract = make_contract(seed=1, pages=1)
+    regex_fields = RegexExtractor().extract_by_regex(contract.text)
+    # Half the fields regex-only, the rest answered by the LLM as well.
+    llm_fields = {
+        name: FieldResult(
+            name=name, value=value, confidence=0.7, source_quote=value, source="llm"
+        )
+        for index, (name, value) in enumerate(contract.expected.items())
+        if index % 2
+    }
+    weak_regex = {
+        name: field.model_copy(update={"confidence": 0.5}) for name, field in regex_fields.items()
+    }
+    return [
+        {
+            "stage": "merger.merge_fields",
+            "case": case,
+            **measure(lambda: ResultMerger.merge_fields(regex, llm_fields), repeat * 100),
+        }
+        for case, regex in (("regex_settled", regex_fields), ("llm_fallback", weak_regex))
+    ]
+
+
+def bench_llm_client(repeat: int, latency_ms: float) -> list[dict]:
+    contract = make_contract(seed=3, pages=4)
+    fields = list(contract.expected)
+    rows = []
+    with StubOllama(latency=latency_ms / 1000, answers=contract.expected) as stub:
+        client = OllamaLlmClient(endpoint=stub.url)
+        try:
+            for stream in (True, False):
+                client.stream = stream
+                rows.append(
+                    {
+                        "stage": "ollama_client.extract_fields",
+                        "case": "stream" if stream else "single",
+                        "stub_latency_ms": latency_ms,
+                        **measure(
+                            lambda: client.extract_fields(
+                                contract.text, "kira_sozlesmesi", fields=fields
+                            ),
+                            repeat,
+                        ),
+                    }
+                )
+        finally:
+            client.close()
+    return rows
+
+
+def environment() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run(
+    corpus: Path,
+    repeat: int,
+    llm_latency_ms: float = 0.0,
+    dpis: tuple[int, ...] = (150, 300),
+    page_counts: tuple[int, ...] = (1, 10, 50),
+) -> dict[str, Any]:
+    missing = missing_binaries()
+    results = []
+    results += bench_text_extraction(corpus, repeat, missing)
+    results += bench_ocr_engine(repeat, missing, dpis)
+    results += bench_regex(repeat, page_counts)
+    results += bench_merge(repeat)
+    results += bench_llm_client(repeat, llm_latency_ms)
+    return {"environment": {**environment(), "repeat": repeat}, "results": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", type=Path, default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--output", type=Path, default=Path("bench-stages.json"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="rda-corpus-") as scratch:
+        corpus = args.corpus
+        if corpus is None:
+            corpus = Path(scratch)
+            build_corpus(corpus)
+        report = run(corpus, args.repeat, args.llm_latency_ms)
+
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"{'stage':<34} {'case':<34} {'median ms':>10} {'p95 ms':>10}")
+    for row in report["results"]:
+        if "skipped" in row:
+            print(f"{row['stage']:<34} {row['case']:<34} skipped: {row['skipped']}")
+        else:
+            print(
+                f"{row['stage']:<34} {row['case']:<34} "
+                f"{row['median_ms']:>10.2f} {row['p95_ms']:>10.2f}"
+            )
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Compare two ``bench_stages`` result files and flag regressions.
+
+Usage: python -m benchmarks.compare BASELINE.json CURRENT.json [--threshold 0.15]
+
+Cases are matched on (stage, case) and compared by median. Exits with 1 when
+any case got slower than ``threshold`` (a fraction), so it can gate CI.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+
+def load(path: Path) -> dict[tuple[str, str], dict[str, Any]]:
+    report = json.loads(path.read_text(encoding="utf-8"))
+    return {
+        (row["stage"], row["case"]): row
+        for row in report["results"]
+        if "skipped" not in row
+    }
+
+
+def compare(
+    baseline: dict[tuple[str, str], dict[str, Any]],
+    current: dict[tuple[str, str], dict[str, Any]],
+    threshold: float,
+) -> list[dict[str, Any]]:
+    rows = []
+    for key in sorted(baseline.keys() & current.keys()):
+        before = baseline[key]["median_ms"]
+        after = current[key]["median_ms"]
+        change = (after - before) / before if before else 0.0
+        rows.append(
+            {
+                "stage": key[0],
+                "case": key[1],
+                "baseline_ms": before,
+                "current_ms": after,
+                "change": change,
+                "regression": change > threshold,
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.15)
+    args = parser.parse_args()
+
+    rows = compare(load(args.baseline), load(args.current), args.threshold)
+    print(f"{'stage':<34} {'case':<34} {'before ms':>10} {'after ms':>10} {'change':>8}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['stage']:<34} {row['case']:<34} {row['baseline_ms']:>10.2f} "
+            f"{row['current_ms']:>10.2f} {row['change']:>+8.1%}{flag}"
+        )
+    if any(row["regression"] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
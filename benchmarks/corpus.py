@@ -0,0 +1,300 @@
+"""Synthetic Turkish lease contracts with known field values.
+
+Usage: python -m benchmarks.corpus OUTPUT_DIR [--count N] [--seed S]
+
+Each contract is written as a native-text PDF, as scanned-image PDFs at
+several DPIs and as a PNG and a JPEG "photo" of its first page (rotated,
+unevenly lit and noisy). ``manifest.json`` lists every file with its kind,
+page count, DPI and the expected value of each ``TARGET_FIELDS`` entry.
+
+Text is ASCII-folded Turkish, as the regex patterns expect, so the native
+PDFs can use a standard PDF font without embedding one.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import textwrap
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from app.domain.models import TARGET_FIELDS
+
+
+PAGE_WIDTH_PT, PAGE_HEIGHT_PT = 595, 842  # A4
+MARGIN_PT = 56
+FONT_SIZE_PT = 11
+LEADING_PT = 15
+WRAP_CHARS = 88
+LINES_PER_PAGE = (PAGE_HEIGHT_PT - 2 * MARGIN_PT) // LEADING_PT
+
+FILLER = [
+    "Taraflar arasinda asagidaki kosullarla bir kira sozlesmesi akdedilmistir.",
+    "Kiraci, kiralanan alani ozenle kullanmak ve komsulara zarar vermemekle yukumludur.",
+    "Kiralanan alanin bakim ve onarim giderleri aksi kararlastirilmadikca kiraciya aittir.",
+    "Kira bedeli her ayin ilk bes is gunu icinde kiraya verenin hesabina odenir.",
+    "Ortak alan giderleri metrekare esasina gore paylastirilir ve ayrica faturalanir.",
+    "Taraflar bu sozlesmeden dogan uyusmazliklarda Istanbul mahkemelerinin yetkili oldugunu kabul eder.",
+    "Kiraci, kiraya verenin yazili izni olmadan kiralanani ucuncu kisilere devredemez.",
+    "Sozlesmenin feshi halinde kiralanan alan teslim alindigi sekilde iade edilir.",
+]
+
+
+@dataclass
+class Contract:
+    seed: int
+    pages: list[list[str]]
+    expected: dict[str, str]
+    # field -> index of the page it is printed on
+    field_pages: dict[str, int]
+
+    @property
+    def text(self) -> str:
+        return "\f".join("\n".join(lines) for lines in self.pages)
+
+
+@dataclass
+class CorpusDocument:
+    file: str
+    kind: str  # native_pdf, scanned_pdf or photo
+    pages: int
+    dpi: Optional[int]
+    expected: dict[str, str]
+
+
+def make_contract(
+    seed: int, pages: int = 3, fields: Sequence[str] = tuple(TARGET_FIELDS)
+) -> Contract:
+    """A contract of ``pages`` pages with ``fields`` spread over them.
+
+    Target fields left out of ``fields`` are not printed at all, so the
+    regexes miss them and the LLM is asked.
+    """
+    rng = random.Random(seed)
+    values = {
+        "Mahal_Kodu": f"{rng.choice('ABCDEFGK')}{rng.randint(100, 9999)}",
+        "M2": str(rng.randint(40, 2500)),
+        "Asgari_Kira": f"{rng.randint(5, 950)}.{rng.randint(0, 999):03d}",
+        "Ciro_Kira_Orani": f"{rng.randint(2, 15)}%",
+        "Dekorasyon_Koordinasyon": rng.choice(["Kiraci", "Kiraya Veren", "Ortak"]),
+        "Mali_Sorumluluk_Sigortasi": rng.choice(["Var", "Yok"]),
+        "Gecikme_Faizi": f"{rng.randint(1, 5)}%",
+        "Bir_Yil_Uzama_Artis": f"{rng.randint(5, 60)}%",
+        "Bir_Yil_Uzama_Ciro_Kira": f"{rng.randint(2, 15)}%",
+        "Ceza_Bedeli": f"{rng.randint(10, 500)}.000",
+    }
+    expected = {field: value for field, value in values.items() if field in fields}
+    field_lines = {
+        "Mahal_Kodu": f"Mahal Kodu: {values['Mahal_Kodu']}",
+        "M2": f"Kiralanan alan {values['M2']} m2 buyuklugundedir.",
+        "Asgari_Kira": f"Asgari Kira: {values['Asgari_Kira']} TL",
+        "Ciro_Kira_Orani": f"Ciro Kira Orani: {values['Ciro_Kira_Orani']}",
+        "Dekorasyon_Koordinasyon": (
+            f"Dekorasyon Koordinasyon: {values['Dekorasyon_Koordinasyon']}."
+        ),
+        "Mali_Sorumluluk_Sigortasi": (
+            f"Mali Sorumluluk Sigortasi: {values['Mali_Sorumluluk_Sigortasi']}."
+        ),
+        "Gecikme_Faizi": f"Gecikme Faizi: {values['Gecikme_Faizi']}",
+        "Bir_Yil_Uzama_Artis": f"Bir Yil Uzama Artis: {values['Bir_Yil_Uzama_Artis']}",
+        "Bir_Yil_Uzama_Ciro_Kira": (
+            f"Bir Yil Uzama Ciro Kira: {values['Bir_Yil_Uzama_Ciro_Kira']}"
+        ),
+        "Ceza_Bedeli": f"Ceza Bedeli: {values['Ceza_Bedeli']} TL",
+    }
+    # Fields go to pages round-robin, each one in a numbered clause.
+    by_page: list[list[str]] = [[] for _ in range(pages)]
+    for index, field in enumerate(expected):
+        by_page[index % pages].append(field_lines[field])
+
+    clause = 1
+    result: list[list[str]] = []
+    for number, fields in enumerate(by_page, start=1):
+        lines = ["KIRA SOZLESMESI", f"Sozlesme No: RDA-{seed:05d}", ""] if number == 1 else []
+        while len(lines) < LINES_PER_PAGE - 2:
+            if fields and rng.random() < 0.35:
+                lines.append(fields.pop(0))
+                continue
+            paragraph = f"Madde {clause}. " + " ".join(rng.sample(FILLER, 3))
+            wrapped = textwrap.wrap(paragraph, WRAP_CHARS)
+            if len(lines) + len(wrapped) + len(fields) > LINES_PER_PAGE - 2:
+                break
+            lines.extend(wrapped)
+            clause += 1
+        lines.extend(fields)
+        lines.append(f"Sayfa {number}/{pages}")
+        result.append(lines)
+    field_pages = {field: index % pages for index, field in enumerate(expected)}
+    return Contract(seed=seed, pages=result, expected=expected, field_pages=field_pages)
+
+
+def write_native_pdf(contract: Contract, path: Path) -> None:
+    """A text PDF using the standard Helvetica font (no embedding)."""
+    objects: list[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree exists
+    page_tree = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    kids = []
+    for lines in contract.pages:
+        ops = [f"BT /F1 {FONT_SIZE_PT} Tf {LEADING_PT} TL {MARGIN_PT} {PAGE_HEIGHT_PT - MARGIN_PT} Td"]
+        ops += [f"({_pdf_escape(line)}) '" for line in lines]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        kids.append(
+            add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                % (page_tree, PAGE_WIDTH_PT, PAGE_HEIGHT_PT, font, content)
+            )
+        )
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % page_tree
+    objects[page_tree - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids),
+        len(kids),
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        catalog,
+        xref,
+    )
+    path.write_bytes(bytes(out))
+
+
+def render_page(lines: Sequence[str], dpi: int, noise: float = 6.0, seed: int = 0) -> Image.Image:
+    """Grayscale A4 bitmap of ``lines`` at ``dpi``, with mild scanner noise."""
+    scale = dpi / 72
+    size = (round(PAGE_WIDTH_PT * scale), round(PAGE_HEIGHT_PT * scale))
+    image = Image.new("L", size, 255)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=round(FONT_SIZE_PT * scale))
+    for row, line in enumerate(lines, start=1):
+        y = (MARGIN_PT + (row - 1) * LEADING_PT) * scale
+        draw.text((MARGIN_PT * scale, y), line, fill=0, font=font)
+    if noise:
+        pixels = np.asarray(image, dtype=np.float32)
+        pixels += np.random.default_rng(seed).normal(0, noise, pixels.shape)
+        image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+    return image
+
+
+def write_scanned_pdf(contract: Contract, path: Path, dpi: int) -> None:
+    pages = [
+        render_page(lines, dpi, seed=contract.seed + index)
+        for index, lines in enumerate(contract.pages)
+    ]
+    pages[0].save(path, "PDF", save_all=True, append_images=pages[1:], resolution=dpi)
+
+
+def write_photo(contract: Contract, path: Path, dpi: int = 200, angle: float = 2.5) -> None:
+    """First page as a phone photo: slightly rotated, unevenly lit, noisy."""
+    page = render_page(contract.pages[0], dpi, noise=0, seed=contract.seed)
+    page = page.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=235)
+    pixels = np.asarray(page, dtype=np.float32)
+    height, width = pixels.shape
+    # Light falls off towards one corner.
+    gradient = np.linspace(1.0, 0.8, width)[None, :] * np.linspace(1.0, 0.9, height)[:, None]
+    pixels = pixels * gradient
+    pixels += np.random.default_rng(contract.seed).normal(0, 8, pixels.shape)
+    photo = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+    if path.suffix.lower() in (".jpg", ".jpeg"):
+        photo.save(path, "JPEG", quality=80)
+    else:
+        photo.save(path)
+
+
+def build_corpus(
+    directory: Path,
+    count: int = 2,
+    seed: int = 0,
+    page_counts: Sequence[int] = (1, 4),
+    dpis: Sequence[int] = (150, 300),
+) -> list[CorpusDocument]:
+    """Write ``count`` contracts per page count in every format, plus a manifest."""
+    directory.mkdir(parents=True, exist_ok=True)
+    documents: list[CorpusDocument] = []
+    for number in range(count):
+        for pages in page_counts:
+            contract = make_contract(seed + number * 1000 + pages, pages=pages)
+            stem = f"contract-{number:03d}-p{pages}"
+
+            def record(name: str, kind: str, dpi: Optional[int], page_count: int) -> Path:
+                documents.append(
+                    CorpusDocument(
+                        file=name,
+                        kind=kind,
+                        pages=page_count,
+                        dpi=dpi,
+                        expected=_expected_on(contract, page_count),
+                    )
+                )
+                return directory / name
+
+            write_native_pdf(contract, record(f"{stem}-native.pdf", "native_pdf", None, pages))
+            for dpi in dpis:
+                write_scanned_pdf(
+                    contract, record(f"{stem}-scan{dpi}.pdf", "scanned_pdf", dpi, pages), dpi
+                )
+            if pages == min(page_counts):
+                write_photo(contract, record(f"{stem}-photo.png", "photo", 200, 1))
+                write_photo(contract, record(f"{stem}-photo.jpg", "photo", 200, 1))
+
+    manifest = {"documents": [asdict(document) for document in documents]}
+    (directory / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return documents
+
+
+def load_manifest(directory: Path) -> list[CorpusDocument]:
+    data = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+    return [CorpusDocument(**document) for document in data["documents"]]
+
+
+def _expected_on(contract: Contract, page_count: int) -> dict[str, str]:
+    """Expected values of the fields printed on the first ``page_count`` pages."""
+    return {
+        field: value
+        for field, value in contract.expected.items()
+        if contract.field_pages[field] < page_count
+    }
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--count", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--dpi", type=int, nargs="+", default=[150, 300])
+    args = parser.parse_args()
+
+    documents = build_corpus(
+        args.output, count=args.count, seed=args.seed, page_counts=args.pages, dpis=args.dpi
+    )
+    print(f"wrote {len(documents)} documents to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""End-to-end load test of ``app.main:app`` with stub OCR and a stub Ollama.
+
+Requires the ``bench`` extra (``pip install .[bench]``) for httpx.
+
+Usage:
+    python -m benchmarks.loadtest --concurrency 8 --requests 200
+    python -m benchmarks.loadtest --rate 4 --duration 60 --ocr-cpu-ms 300 \\
+        --llm-latency-ms 500 --tokens-per-second 40 --output load.json
+
+The service runs under uvicorn in a child process, with its real middleware,
+worker pools and pipeline, so event-loop blocking, pool saturation and
+queueing show up as they would in a pod. The LLM is the stub Ollama from
+``benchmarks.stub_ollama`` (latency and token rate configurable), and with
+``--ocr-cpu-ms`` the OCR engine is replaced by one that burns that much CPU
+per page; otherwise the configured engine is used.
+
+``--concurrency`` runs a closed loop (each client sends its next upload when
+the previous one returns); ``--rate`` sends uploads as a Poisson process,
+which is what exposes queueing. Documents alternate between a native PDF
+and a page photo; ``--llm-fields`` target fields are left out of them so
+the LLM stage is exercised. Per-stage latencies come from the
+``Server-Timing`` response header.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+import httpx
+import numpy as np
+
+from app.core.metrics import timed
+from app.domain.models import TARGET_FIELDS
+from benchmarks.bench_stages import environment
+from benchmarks.corpus import make_contract, render_page, write_native_pdf
+from benchmarks.stub_ollama import StubOllama
+
+
+class FakeOcrEngine:
+    """Spends ``cpu_ms`` of CPU per page, then returns canned text."""
+
+    def __init__(self, cpu_ms: float, text: str, confidence: float = 0.9) -> None:
+        self.cpu_ms = cpu_ms
+        self.text = text
+        self.confidence = confidence
+
+    def run(self, image: np.ndarray) -> tuple[str, float]:
+        with timed("ocr"):
+            deadline = time.thread_time() + self.cpu_ms / 1000
+            while time.thread_time() < deadline:
+                pass
+        return self.text, self.confidence
+
+
+@dataclass
+class Sample:
+    kind: str
+    status: int
+    latency_ms: float
+    stages_ms: dict[str, float] = field(default_factory=dict)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile; ``q`` in 0-100."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def parse_server_timing(header: str) -> dict[str, float]:
+    stages = {}
+    for metric in filter(None, (part.strip() for part in header.split(","))):
+        name, _, params = metric.partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur":
+                stages[name.strip()] = float(value)
+    return stages
+
+
+def build_documents(llm_fields: int, directory: Path) -> list[tuple[str, str, bytes, str]]:
+    """(kind, filename, content, content type) for the uploads."""
+    fields = TARGET_FIELDS[: len(TARGET_FIELDS) - llm_fields]
+    contract = make_contract(seed=11, pages=3, fields=fields)
+    pdf = directory / "load.pdf"
+    write_native_pdf(contract, pdf)
+    photo = io.BytesIO()
+    render_page(contract.pages[0], dpi=150, seed=contract.seed).save(photo, "PNG")
+    return [
+        ("native_pdf", "load.pdf", pdf.read_bytes(), "application/pdf"),
+        ("photo", "load.png", photo.getvalue(), "image/png"),
+    ]
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict[str, Any]:
+    ok = [sample for sample in samples if sample.status == 200]
+
+    def stats(values: list[float]) -> dict[str, float]:
+        return {
+            "count": len(values),
+            "mean": sum(values) / len(values) if values else 0.0,
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "max": max(values, default=0.0),
+        }
+
+    stage_names = sorted({stage for sample in ok for stage in sample.stages_ms})
+    return {
+        "requests": len(samples),
+        "errors": dict(Counter(sample.status for sample in samples if sample.status != 200)),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(ok) / elapsed if elapsed else 0.0,
+        "latency_ms": stats([sample.latency_ms for sample in ok]),
+        "latency_ms_by_kind": {
+            kind: stats([sample.latency_ms for sample in ok if sample.kind == kind])
+            for kind in sorted({sample.kind for sample in ok})
+        },
+        "stages_ms": {
+            stage: stats([sample.stages_ms[stage] for sample in ok if stage in sample.stages_ms])
+            for stage in stage_names
+        },
+    }
+
+
+async def send(client: httpx.AsyncClient, document: tuple[str, str, bytes, str]) -> Sample:
+    kind, filename, content, content_type = document
+    start = time.perf_counter()
+    try:
+        response = await client.post("/v1/extract/", files={"file": (filename, content, content_type)})
+    except httpx.HTTPError:
+        return Sample(kind=kind, status=0, latency_ms=(time.perf_counter() - start) * 1000)
+    return Sample(
+        kind=kind,
+        status=response.status_code,
+        latency_ms=(time.perf_counter() - start) * 1000,
+        stages_ms=parse_server_timing(response.headers.get("server-timing", "")),
+    )
+
+
+async def closed_loop(
+    client: httpx.AsyncClient, documents: list, concurrency: int, requests: int, duration: float
+) -> list[Sample]:
+    samples: list[Sample] = []
+    deadline = time.perf_counter() + duration if duration else None
+    issued = 0
+
+    async def worker() -> None:
+        nonlocal issued
+        while (not requests or issued < requests) and (
+            deadline is None or time.perf_counter() < deadline
+        ):
+            document = documents[issued % len(documents)]
+            issued += 1
+            samples.append(await send(client, document))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+async def open_loop(
+    client: httpx.AsyncClient, documents: list, rate: float, requests: int, duration: float
+) -> list[Sample]:
+    rng = random.Random(0)
+    tasks = []
+    deadline = time.perf_counter() + duration if duration else None
+    while (not requests or len(tasks) < requests) and (
+        deadline is None or time.perf_counter() < deadline
+    ):
+        tasks.append(asyncio.create_task(send(client, documents[len(tasks) % len(documents)])))
+        await asyncio.sleep(rng.expovariate(rate))
+    return list(await asyncio.gather(*tasks))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, server: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"service exited with code {server.returncode}")
+        try:
+            if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("service did not become ready")
+
+
+def serve(port: int, ocr_cpu_ms: Optional[float], ocr_text: str) -> None:
+    """Child process entry point: run the app, with the fake OCR engine if asked."""
+    import logging
+
+    import uvicorn
+
+    from app.services import pipeline
+    # Imported by name, not through __main__, so pool workers can unpickle it.
+    from benchmarks.loadtest import FakeOcrEngine as Engine
+
+    if ocr_cpu_ms is not None:
+        pipeline.build_ocr_engine = lambda settings: Engine(ocr_cpu_ms, ocr_text)
+    from app.main import app
+
+    # One JSON line per request would swamp the terminal.
+    logging.getLogger("app.requests").setLevel(logging.WARNING)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="rda-load-") as scratch:
+        documents = build_documents(args.llm_fields, Path(scratch))
+        ocr_text = make_contract(
+            seed=11, pages=1, fields=TARGET_FIELDS[: len(TARGET_FIELDS) - args.llm_fields]
+        ).text
+        stub = StubOllama(
+            latency=args.llm_latency_ms / 1000,
+            tokens_per_second=args.tokens_per_second,
+            answers={name: "stub" for name in TARGET_FIELDS},
+        )
+        with stub:
+            port = _free_port()
+            env = {
+                **os.environ,
+                "OLLAMA_BASE_URL": stub.url,
+                # Every upload is the same document; caches and coalescing
+                # would hide the work.
+                "LLM_CACHE_ENABLED": "false",
+                "ARTIFACT_CACHE_ENABLED": "false",
+                "COALESCE_REQUESTS": "false",
+            }
+            if args.cpu_workers is not None:
+                env["CPU_POOL_WORKERS"] = str(args.cpu_workers)
+            if args.io_workers is not None:
+                env["IO_POOL_WORKERS"] = str(args.io_workers)
+            command = [sys.executable, "-m", "benchmarks.loadtest", "--serve", str(port)]
+            if args.ocr_cpu_ms is not None:
+                command += ["--ocr-cpu-ms", str(args.ocr_cpu_ms)]
+            server = subprocess.Popen(
+                command, env=env, stdin=subprocess.PIPE, text=True
+            )
+            # The canned OCR text goes over stdin rather than the command line.
+            server.stdin.write(ocr_text)
+            server.stdin.close()
+            url = f"http://127.0.0.1:{port}"
+            try:
+                _wait_ready(url, server)
+                samples, elapsed = asyncio.run(_drive(url, documents, args))
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+    return {
+        "environment": environment(),
+        "config": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("output", "serve")
+        },
+        "llm_requests": stub.requests,
+        **summarize(samples, elapsed),
+    }
+
+
+async def _drive(url: str, documents: list, args: argparse.Namespace) -> tuple[list[Sample], float]:
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+        start = time.perf_counter()
+        if args.rate:
+            samples = await open_loop(client, documents, args.rate, args.requests, args.duration)
+        else:
+            samples = await closed_loop(
+                client, documents, args.concurrency, args.requests, args.duration
+            )
+        return samples, time.perf_counter() - start
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(
+        f"{report['requests']} requests in {report['elapsed_s']:.1f}s, "
+        f"{report['throughput_rps']:.2f} req/s, errors: {report['errors'] or 'none'}, "
+        f"LLM calls: {report['llm_requests']}"
+    )
+    print(f"{'':<24} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    rows = [("request", report["latency_ms"])]
+    rows += [(f"request:{kind}", stats) for kind, stats in report["latency_ms_by_kind"].items()]
+    rows += [(f"stage:{stage}", stats) for stage, stats in report["stages_ms"].items()]
+    for name, stats in rows:
+        print(
+            f"{name:<24} {stats['p50']:>10.1f} {stats['p95']:>10.1f} "
+            f"{stats['p99']:>10.1f} {stats['max']:>10.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=4, help="closed-loop clients")
+    load.add_argument("--rate", type=float, default=None, help="open-loop arrivals per second")
+    parser.add_argument("--requests", type=int, default=100, help="0 for no limit")
+    parser.add_argument("--duration", type=float, default=0.0, help="seconds; 0 for no limit")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--ocr-cpu-ms", type=float, default=None)
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0)
+    parser.add_argument("--tokens-per-second", type=float, default=None)
+    parser.add_argument("--llm-fields", type=int, default=5, choices=range(len(TARGET_FIELDS) + 1))
+    parser.add_argument("--cpu-workers", type=int, default=None)
+    parser.add_argument("--io-workers", type=int, default=None)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--serve", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve is not None:
+        serve(args.serve, args.ocr_cpu_ms, sys.stdin.read())
+        return
+    if not args.requests and not args.duration:
+        parser.error("set --requests or --duration")
+
+    report = run(args)
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
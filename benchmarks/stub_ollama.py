@@ -0,0 +1,198 @@
+"""A local stand-in for Ollama's ``/api/generate``.
+
+Usage: python -m benchmarks.stub_ollama [--port 11434] [--latency-ms 200] [--tokens-per-second 40]
+
+Answers every requested field (taken from the ``format`` schema, or from the
+prompt's field list) with a fixed value, streamed as NDJSON or returned in
+one body like the real server. ``latency`` models time to first token and
+``tokens_per_second`` the generation rate, so LLM cost can be dialled in
+without a GPU. Client disconnects end the generation early, as in Ollama.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Mapping, Optional
+
+from app.services.llm.context import estimate_tokens
+
+
+FIELDS_LINE = re.compile(r"^Çıkarılacak alanlar: (?P<fields>.+)$", re.MULTILINE)
+TOKEN_CHARS = 4
+
+
+class StubOllama:
+    """Serve the stub on a background thread; use as a context manager.
+
+    ``answers`` maps field names to the value returned for them (None when
+    missing). ``requests`` counts generate calls, for assertions. Setting
+    ``fail_status`` makes every call fail with that HTTP status, as an
+    unhealthy host would.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        tokens_per_second: Optional[float] = None,
+        answers: Optional[Mapping[str, Optional[str]]] = None,
+        fail_status: Optional[int] = None,
+    ) -> None:
+        self.latency = latency
+        self.fail_status = fail_status
+        self.tokens_per_second = tokens_per_second
+        self.answers = dict(answers or {})
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> StubOllama:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="stub-ollama", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> StubOllama:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def answer(self, payload: Mapping[str, Any]) -> str:
+        """The JSON text generated for ``payload``."""
+        schema = payload.get("format")
+        if isinstance(schema, dict):
+            fields = list(schema.get("properties", {}))
+        else:
+            match = FIELDS_LINE.search(payload.get("prompt", ""))
+            fields = match.group("fields").split(", ") if match else []
+        output = {}
+        for field in fields:
+            value = self.answers.get(field)
+            output[field] = {
+                "value": value,
+                "confidence": 0.75 if value is not None else 0.0,
+                "source_quote": value,
+            }
+        return json.dumps(output, ensure_ascii=False)
+
+
+def _make_handler(stub: StubOllama) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this each
+        # response waits on a delayed ACK.
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            if stub.fail_status:
+                self.send_error(stub.fail_status)
+            elif self.path == "/api/tags":
+                self._send_json({"models": [{"name": "stub"}]})
+            else:
+                self.send_error(404)
+
+        def do_POST(self) -> None:
+            if self.path != "/api/generate":
+                self.send_error(404)
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            with stub._lock:
+                stub.requests += 1
+            if stub.fail_status:
+                self.send_error(stub.fail_status)
+                return
+            text = stub.answer(payload)
+            time.sleep(stub.latency)
+            stats = {
+                "prompt_eval_count": estimate_tokens(payload.get("prompt", "")),
+                "eval_count": max(1, len(text) // TOKEN_CHARS),
+            }
+            try:
+                if payload.get("stream", True):
+                    self._stream(text, stats)
+                else:
+                    self._pace(stats["eval_count"])
+                    self._send_json({"response": text, "done": True, **stats})
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client stopped reading, like an early-stopped stream
+
+        def _pace(self, tokens: int) -> None:
+            if stub.tokens_per_second:
+                time.sleep(tokens / stub.tokens_per_second)
+
+        def _stream(self, text: str, stats: dict[str, int]) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(text), TOKEN_CHARS):
+                self._pace(1)
+                self._chunk({"response": text[start:start + TOKEN_CHARS], "done": False})
+            self._chunk({"response": "", "done": True, **stats})
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+
+        def _chunk(self, message: dict[str, Any]) -> None:
+            line = json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+            self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            self.wfile.flush()
+
+        def _send_json(self, body: dict[str, Any]) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=None)
+    args = parser.parse_args()
+
+    stub = StubOllama(
+        host=args.host,
+        port=args.port,
+        latency=args.latency_ms / 1000,
+        tokens_per_second=args.tokens_per_second,
+    )
+    print(f"stub Ollama listening on {stub.url}")
+    with stub:
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_pipeline
+from app.core.executor import WorkerPools
+from app.main import app
+from app.services.merger import ResultMerger
+from app.services.ocr.tesseract_engine import TesseractOcrEngine
+from app.services.pipeline import ExtractionPipeline
+from app.services.regex_extractor import RegexExtractor
+from app.services.text_extractor import TextExtractor
+
+
+CONTRACT_TEXT = (
+    "Kira sozlesmesi\n"
+    "Mahal Kodu: ABC123\n"
+    "Asgari Kira: 5000 TL\n"
+    "Bu metin yeterince uzun olsun diye eklendi.\n"
+)
+
+
+class DummyLlmClient:
+    def __init__(self):
+        self.calls = 0
+        self.requested_fields = None
+
+    def extract_fields(self, raw_text, document_type, use_cache=True, fields=None):
+        self.calls += 1
+        self.requested_fields = fields
+        return {"M2": {"value": "120", "confidence": 0.7, "source_quote": "120 m2"}}
+
+
+@pytest.fixture
+def contract_text():
+    return CONTRACT_TEXT
+
+
+@pytest.fixture
+def llm_client():
+    return DummyLlmClient()
+
+
+@pytest.fixture
+def make_pipeline():
+    """Factory for pipelines with small pools, shut down after the test."""
+    pipelines = []
+
+    def make(llm_client=None):
+        pipeline = ExtractionPipeline(
+            text_extractor=TextExtractor(),
+            ocr_engine=TesseractOcrEngine(),
+            regex_extractor=RegexExtractor(),
+            llm_client=llm_client or DummyLlmClient(),
+            merger=ResultMerger(),
+            pools=WorkerPools(cpu_workers=0, io_workers=2),
+        )
+        pipelines.append(pipeline)
+        return pipeline
+
+    yield make
+    for pipeline in pipelines:
+        pipeline.worker_pools.shutdown()
+
+
+@pytest.fixture
+def make_client(make_pipeline):
+    """Factory for test clients of the app serving the given pipeline."""
+
+    def make(extraction_pipeline=None):
+        extraction_pipeline = extraction_pipeline or make_pipeline()
+        app.dependency_overrides[get_pipeline] = lambda: extraction_pipeline
+        return TestClient(app)
+
+    yield make
+    app.dependency_overrides.clear()
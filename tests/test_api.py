@@ -0,0 +1,303 @@
+from app.core.config import get_settings
+from app.services.text_extractor import ExtractedText
+
+
+def test_extract_endpoint_uses_shared_pipeline(
+    make_client, make_pipeline, llm_client, contract_text
+):
+    client = make_client(make_pipeline(llm_client))
+
+    for _ in range(2):
+        response = client.post(
+            "/v1/extract/",
+            files={"file": ("sample.txt", contract_text.encode("utf-8"), "text/plain")},
+        )
+        assert response.status_code == 200
+
+    body = response.json()
+    field_map = {field["name"]: field for field in body["fields"]}
+    assert body["document_type"] == "kira_sozlesmesi"
+    assert field_map["Mahal_Kodu"]["value"] == "ABC123"
+    assert llm_client.calls == 2
+    assert "Mahal_Kodu" not in llm_client.requested_fields
+    assert "M2" in llm_client.requested_fields
+    assert response.headers["X-Fields-Regex"] == "2"
+    assert response.headers["X-Fields-Llm"] == "1"
+
+
+def test_extract_endpoint_skips_llm_when_regex_resolves_everything(
+    make_client, make_pipeline, llm_client
+):
+    client = make_client(make_pipeline(llm_client))
+    content = "\n".join(
+        [
+            "Kira sozlesmesi",
+            "Mahal Kodu: ABC123",
+            "Kiralanan alan 120 m2",
+            "Asgari Kira: 5000",
+            "Ciro Kira Orani: 8%",
+            "Dekorasyon Koordinasyon: Kiraci\n",
+            "Mali Sorumluluk Sigortasi: Var\n",
+            "Gecikme Faizi: 2%",
+            "Bir Yil Uzama Artis: 10%",
+            "Bir Yil Uzama Ciro Kira: 9%",
+            "Ceza Bedeli: 10000",
+        ]
+    )
+
+    response = client.post(
+        "/v1/extract/",
+        files={"file": ("full.txt", content.encode("utf-8"), "text/plain")},
+    )
+
+    assert response.status_code == 200
+    assert llm_client.calls == 0
+    assert response.headers["X-Fields-Regex"] == "10"
+    assert response.headers["X-Fields-Llm"] == "0"
+
+
+def test_batch_endpoint_streams_results_and_isolates_failures(
+    make_client, make_pipeline, llm_client, contract_text
+):
+    import io
+    import json
+    import zipfile
+
+    class FlakyLlmClient:
+        def extract_fields(self, raw_text, document_type, use_cache=True, fields=None):
+            if "BOOM" in raw_text:
+                raise RuntimeError("LLM exploded")
+            return llm_client.extract_fields(raw_text, document_type, use_cache, fields)
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("leases/a.txt", contract_text)
+        zf.writestr("leases/b.txt", contract_text + "BOOM")
+        zf.writestr("__MACOSX/leases/._a.txt", "junk")
+    client = make_client(make_pipeline(FlakyLlmClient()))
+
+    response = client.post(
+        "/v1/extract/batch",
+        files=[
+            ("files", ("single.txt", contract_text.encode("utf-8"), "text/plain")),
+            ("files", ("leases.zip", archive.getvalue(), "application/zip")),
+        ],
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    items = {item["filename"]: item for item in map(json.loads, response.text.splitlines())}
+    assert set(items) == {"single.txt", "leases/a.txt", "leases/b.txt"}
+    assert items["leases/a.txt"]["status"] == "ok"
+    assert items["leases/a.txt"]["result"]["fields"]
+    assert items["leases/b.txt"]["status"] == "error"
+    assert "LLM exploded" in items["leases/b.txt"]["error"]
+
+
+def test_raw_pdf_endpoint_spools_body_to_a_temporary_file(
+    make_client, make_pipeline, contract_text
+):
+    extraction_pipeline = make_pipeline()
+    seen = []
+
+    def extract_document(source, document_type, on_page=None, digest=None):
+        seen.append((source, source.read_bytes(), document_type))
+        return ExtractedText(text=contract_text, confidence=None, source="native", pages=[])
+
+    extraction_pipeline.deps.text_extractor.extract_document = extract_document
+    client = make_client(extraction_pipeline)
+
+    response = client.post(
+        "/v1/extract/pdf?filename=lease",
+        content=b"%PDF-1.4 body",
+        headers={"Content-Type": "application/pdf"},
+    )
+
+    assert response.status_code == 200
+    path, content, document_type = seen[0]
+    assert content == b"%PDF-1.4 body"
+    assert document_type == "lease.pdf"
+    assert not path.exists()
+
+    response = client.post(
+        "/v1/extract/pdf", content=b"{}", headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 415
+
+
+def test_oversized_upload_is_rejected(monkeypatch, make_client, contract_text):
+    monkeypatch.setattr(get_settings(), "upload_max_bytes", 16)
+    client = make_client()
+
+    response = client.post(
+        "/v1/extract/",
+        files={"file": ("sample.txt", contract_text.encode("utf-8"), "text/plain")},
+    )
+
+    assert response.status_code == 413
+
+
+def test_profiled_request_is_retrievable_by_profile_id(
+    monkeypatch, tmp_path, make_client, contract_text
+):
+    monkeypatch.setattr(get_settings(), "profiling_enabled", True)
+    monkeypatch.setattr(get_settings(), "profile_dir", str(tmp_path))
+    client = make_client()
+    upload = {"file": ("sample.txt", contract_text.encode("utf-8"), "text/plain")}
+
+    plain = client.post("/v1/extract/", files=upload, headers={"X-Request-ID": "plain"})
+    response = client.post(
+        "/v1/extract/", files=upload, headers={"X-Request-ID": "slow-one", "X-Profile": "1"}
+    )
+
+    assert "X-Profile-ID" not in plain.headers
+    assert response.status_code == 200
+    assert response.headers["X-Profile-Status"] == "complete"
+    profile_id = response.headers["X-Profile-ID"]
+    # Named by the server, not after the client's request id.
+    assert profile_id != "slow-one"
+    assert [path.name for path in tmp_path.iterdir()] == [f"{profile_id}.prof"]
+    report = client.get(f"/v1/profiles/{profile_id}", params={"format": "text"})
+    assert report.status_code == 200
+    assert "extract_fields" in report.text
+    saved = (tmp_path / f"{profile_id}.prof").read_bytes()
+    assert client.get(f"/v1/profiles/{profile_id}").content == saved
+    assert client.get("/v1/profiles/slow-one").status_code == 404
+
+
+def test_request_is_marked_unprofiled_when_the_profiler_is_busy(
+    monkeypatch, tmp_path, caplog, make_client, contract_text
+):
+    import logging
+
+    from app.core import profiling
+
+    class BusyProfile:
+        # What Python 3.12+ does while another profiler is active.
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(get_settings(), "profiling_enabled", True)
+    monkeypatch.setattr(get_settings(), "profile_dir", str(tmp_path))
+    monkeypatch.setattr(profiling.cProfile, "Profile", BusyProfile)
+    client = make_client()
+
+    with caplog.at_level(logging.WARNING, logger="app.core.profiling"):
+        response = client.post(
+            "/v1/extract/",
+            files={"file": ("sample.txt", contract_text.encode("utf-8"), "text/plain")},
+            headers={"X-Profile": "1"},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["X-Profile-Status"] == "unprofiled"
+    assert "X-Profile-ID" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+    assert any("runs unprofiled" in record.getMessage() for record in caplog.records)
+
+
+def test_profile_flag_is_ignored_when_profiling_is_disabled(
+    monkeypatch, tmp_path, make_client, contract_text
+):
+    monkeypatch.setattr(get_settings(), "profile_dir", str(tmp_path))
+    client = make_client()
+
+    response = client.post(
+        "/v1/extract/?profile=1",
+        files={"file": ("sample.txt", contract_text.encode("utf-8"), "text/plain")},
+    )
+
+    assert response.status_code == 200
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_extract_response_can_leave_out_or_truncate_raw_text_and_project_fields(
+    make_client, contract_text
+):
+    client = make_client()
+    upload = {"file": ("sample.txt", contract_text.encode("utf-8"), "text/plain")}
+
+    lean = client.post("/v1/extract/?raw_text_chars=0&fields=Mahal_Kodu,M2", files=upload)
+    truncated = client.post("/v1/extract/?raw_text_chars=10", files=upload)
+    unknown = client.post("/v1/extract/?fields=Mahal_Kodu,Nope", files=upload)
+
+    assert lean.status_code == 200
+    assert "raw_text" not in lean.json()
+    assert {field["name"] for field in lean.json()["fields"]} == {"Mahal_Kodu", "M2"}
+    assert lean.headers["X-Fields-Regex"] == "2"
+    assert truncated.json()["raw_text"] == contract_text[:10]
+    assert truncated.headers["X-Raw-Text-Length"] == str(len(contract_text))
+    assert unknown.status_code == 422
+
+
+def test_extract_response_negotiates_msgpack_and_gzip(make_client, contract_text):
+    import msgpack
+
+    client = make_client()
+    content = (contract_text + "Ek madde.\n" * 200).encode("utf-8")
+
+    response = client.post(
+        "/v1/extract/",
+        files={"file": ("sample.txt", content, "text/plain")},
+        headers={"Accept": "application/msgpack", "Accept-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    assert response.headers["content-encoding"] == "gzip"
+    body = msgpack.unpackb(response.content)
+    assert body["raw_text"] == content.decode("utf-8")
+    assert any(field["name"] == "Mahal_Kodu" for field in body["fields"])
+
+
+def test_batch_rejects_oversized_zip_before_extracting(
+    monkeypatch, tmp_path, make_client, contract_text
+):
+    import io
+    import zipfile
+
+    monkeypatch.setattr(get_settings(), "batch_max_documents", 2)
+    monkeypatch.setattr(get_settings(), "upload_max_bytes", 1000)
+    monkeypatch.setattr(get_settings(), "upload_spool_dir", str(tmp_path))
+    many = io.BytesIO()
+    with zipfile.ZipFile(many, "w") as zf:
+        for index in range(3):
+            zf.writestr(f"{index}.txt", contract_text)
+    bomb = io.BytesIO()
+    with zipfile.ZipFile(bomb, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("big.txt", "0" * 100_000)
+    client = make_client()
+
+    for archive in (many, bomb):
+        response = client.post(
+            "/v1/extract/batch",
+            files=[("files", ("leases.zip", archive.getvalue(), "application/zip"))],
+        )
+        assert response.status_code == 413
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_run_extraction_uses_the_lazily_built_default_pipeline(
+    monkeypatch, make_pipeline, contract_text
+):
+    from app.services import pipeline as pipeline_module
+
+    built = []
+
+    def fake_build_pipeline():
+        built.append(make_pipeline())
+        return built[-1]
+
+    monkeypatch.setattr(pipeline_module, "build_pipeline", fake_build_pipeline)
+    pipeline_module.get_default_pipeline.cache_clear()
+    try:
+        for _ in range(2):
+            result = pipeline_module.run_extraction(
+                contract_text.encode("utf-8"), "kira_sozlesmesi", filename="sample.txt"
+            )
+            assert any(field.name == "Mahal_Kodu" for field in result.fields)
+    finally:
+        pipeline_module.get_default_pipeline.cache_clear()
+
+    assert len(built) == 1
@@ -0,0 +1,51 @@
+from app.services.llm.ollama_client import OllamaLlmClient
+from app.services.regex_extractor import RegexExtractor
+from app.services.text_extractor import TextExtractor
+from benchmarks.corpus import build_corpus, load_manifest
+from benchmarks.loadtest import Sample, parse_server_timing, percentile, summarize
+from benchmarks.stub_ollama import StubOllama
+
+
+def test_native_corpus_documents_carry_their_expected_fields(tmp_path):
+    build_corpus(tmp_path, count=1, page_counts=(2,), dpis=(100,))
+
+    documents = load_manifest(tmp_path)
+    assert {document.kind for document in documents} == {"native_pdf", "scanned_pdf", "photo"}
+    native = next(document for document in documents if document.kind == "native_pdf")
+    text, _, source = TextExtractor().extract_text(tmp_path / native.file, native.file)
+    extracted = RegexExtractor().extract(text)
+
+    assert source == "native"
+    assert len(native.expected) == 10
+    assert {name: extracted[name] for name in native.expected} == native.expected
+
+
+def test_stub_ollama_answers_requested_fields_streaming_and_not():
+    with StubOllama(answers={"M2": "120"}) as stub:
+        client = OllamaLlmClient(endpoint=stub.url)
+        try:
+            for stream in (True, False):
+                client.stream = stream
+                fields = client.extract_fields("Kiralanan alan 120 m2", "kira", fields=["M2"])
+                assert fields == {"M2": {"value": "120", "confidence": 0.75, "source_quote": "120"}}
+        finally:
+            client.close()
+
+    assert stub.requests == 2
+
+
+def test_load_report_uses_server_timing_stages_of_successful_requests():
+    assert parse_server_timing("llm;dur=12.5, ocr;desc=x;dur=3") == {"llm": 12.5, "ocr": 3.0}
+    assert percentile(list(range(1, 101)), 95) == 95
+    samples = [
+        Sample(kind="photo", status=200, latency_ms=100.0, stages_ms={"ocr": 60.0}),
+        Sample(kind="photo", status=200, latency_ms=300.0, stages_ms={"ocr": 250.0}),
+        Sample(kind="photo", status=503, latency_ms=5.0),
+    ]
+
+    report = summarize(samples, elapsed=2.0)
+
+    assert report["errors"] == {503: 1}
+    assert report["throughput_rps"] == 1.0
+    assert report["latency_ms"]["p50"] == 100.0
+    assert report["stages_ms"]["ocr"]["max"] == 250.0
@@ -0,0 +1,59 @@
+from app.services.cache import MemoryLruCache, SqliteCache, TieredCache
+from app.services.text_extractor import TextExtractor
+
+
+def test_memory_lru_evicts_least_recently_used_by_size():
+    cache = MemoryLruCache(max_bytes=10)
+    cache.set("a", b"1234")
+    cache.set("b", b"1234")
+    cache.get("a")
+    cache.set("c", b"1234")
+
+    assert cache.get("a") == b"1234"
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    SqliteCache(path, max_bytes=1024).set("key", b"value")
+
+    assert SqliteCache(path, max_bytes=1024).get("key") == b"value"
+
+
+def test_tiered_cache_promotes_disk_hits_and_counts(tmp_path):
+    disk = SqliteCache(str(tmp_path / "cache.sqlite3"), max_bytes=1024)
+    disk.set("key", b"value")
+    cache = TieredCache(MemoryLruCache(1024), disk)
+
+    assert cache.get("key") == b"value"
+    assert cache.get("key") == b"value"
+    assert cache.get("missing") is None
+    assert cache.stats.disk_hits == 1
+    assert cache.stats.memory_hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_text_extractor_cache_hit_skips_ocr():
+    class CountingOcrEngine:
+        language = "tur"
+
+        def __init__(self):
+            self.calls = 0
+
+        def run(self, image):
+            self.calls += 1
+            return "Mahal Kodu: ABC123", 0.9
+
+    engine = CountingOcrEngine()
+    extractor = TextExtractor(
+        ocr_engine=engine, cache=TieredCache(MemoryLruCache(1024 * 1024))
+    )
+    extractor._load_image = lambda file_bytes: object()
+
+    first = extractor.extract_text(b"image-bytes", document_type="scan.png")
+    second = extractor.extract_text(b"image-bytes", document_type="scan.png")
+
+    assert first == second == ("Mahal Kodu: ABC123", 0.9, "ocr")
+    assert engine.calls == 1
+    assert extractor.cache.stats.memory_hits == 1
@@ -0,0 +1,209 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.metrics import COALESCED_REQUESTS
+from app.services.coalescing import SingleFlight
+
+
+class Recorder:
+    def __init__(self):
+        self.stages = []
+
+    def on_stage(self, stage):
+        self.stages.append(stage)
+
+    def on_page(self, pages_done, pages_total):
+        pass
+
+
+def test_concurrent_calls_share_one_computation():
+    calls = []
+
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work(progress):
+            calls.append(progress)
+            progress.on_stage("ocr")
+            await release.wait()
+            return "result"
+
+        follower_progress = Recorder()
+        leader = asyncio.create_task(flights.run("doc", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.run("doc", work, follower_progress))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(leader, follower)
+        return results, follower_progress.stages, len(flights)
+
+    before = COALESCED_REQUESTS._value.get()
+    results, stages, in_flight = asyncio.run(scenario())
+
+    assert results == ["result", "result"]
+    assert len(calls) == 1
+    assert stages == ["ocr"]
+    assert in_flight == 0
+    assert COALESCED_REQUESTS._value.get() == before + 1
+
+
+def test_leader_failure_reaches_followers_and_is_not_kept():
+    calls = []
+
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def failing(progress):
+            calls.append("failing")
+            await release.wait()
+            raise ValueError("broken document")
+
+        async def working(progress):
+            calls.append("working")
+            return "result"
+
+        leader = asyncio.create_task(flights.run("doc", failing))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.run("doc", failing))
+        await asyncio.sleep(0)
+        release.set()
+        outcomes = await asyncio.gather(leader, follower, return_exceptions=True)
+        retry = await flights.run("doc", working)
+        return outcomes, retry
+
+    outcomes, retry = asyncio.run(scenario())
+
+    assert [str(outcome) for outcome in outcomes] == ["broken document"] * 2
+    assert retry == "result"
+    assert calls == ["failing", "working"]
+
+
+def test_follower_takes_over_when_the_leader_is_cancelled():
+    calls = []
+
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work(progress):
+            calls.append("run")
+            await release.wait()
+            return "result"
+
+        leader = asyncio.create_task(flights.run("doc", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.run("doc", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(scenario()) == "result"
+    assert calls == ["run", "run"]
+
+
+def test_cancelled_follower_does_not_disturb_the_leader():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work(progress):
+            await release.wait()
+            return "result"
+
+        leader = asyncio.create_task(flights.run("doc", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.run("doc", work))
+        await asyncio.sleep(0)
+        follower.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return await leader, follower.cancelled()
+
+    assert asyncio.run(scenario()) == ("result", True)
+
+
+def test_pipeline_coalesces_identical_documents(make_pipeline, contract_text):
+    class SlowLlmClient:
+        def __init__(self):
+            self.calls = 0
+            self.entered = threading.Event()
+            self.release = threading.Event()
+
+        def extract_fields(self, raw_text, document_type, use_cache=True, fields=None):
+            self.calls += 1
+            self.entered.set()
+            self.release.wait(5)
+            return {}
+
+    llm_client = SlowLlmClient()
+    pipeline = make_pipeline(llm_client)
+    pipeline.flights = SingleFlight()
+    document = contract_text.encode("utf-8")
+
+    async def scenario():
+        first = asyncio.create_task(
+            pipeline.run_async(document, filename="a.txt", document_type="kira_sozlesmesi")
+        )
+        await asyncio.get_running_loop().run_in_executor(None, llm_client.entered.wait, 5)
+        second = asyncio.create_task(
+            pipeline.run_async(document, filename="b.txt", document_type="kira_sozlesmesi")
+        )
+        other_type = asyncio.create_task(
+            pipeline.run_async(document, filename="c.txt", document_type="other")
+        )
+        await asyncio.sleep(0.1)
+        llm_client.release.set()
+        return await asyncio.gather(first, second, other_type)
+
+    try:
+        first, second, other_type = asyncio.run(scenario())
+    finally:
+        pipeline.worker_pools.shutdown()
+
+    assert second is first
+    assert other_type.document_type == "other"
+    assert llm_client.calls == 2
+
+
+def test_pipeline_hashes_each_document_once(monkeypatch, make_pipeline, contract_text):
+    import app.services.pipeline as pipeline_module
+    import app.services.text_extractor as text_extractor_module
+    from app.services.cache import MemoryLruCache, TieredCache
+    from app.services.text_extractor import PageText
+
+    digests = []
+    original = text_extractor_module.document_digest
+
+    def counting_digest(source):
+        digests.append(source)
+        return original(source)
+
+    monkeypatch.setattr(pipeline_module, "document_digest", counting_digest)
+    monkeypatch.setattr(text_extractor_module, "document_digest", counting_digest)
+    pipeline = make_pipeline()
+    pipeline.flights = SingleFlight()
+    extractor = pipeline.deps.text_extractor
+    extractor.cache = TieredCache(MemoryLruCache(max_bytes=1 << 20))
+    page = PageText(index=0, text=contract_text, confidence=0.9, source="ocr")
+    monkeypatch.setattr(extractor, "_extract_pages", lambda *args: ([page], "ocr"))
+
+    try:
+        result = asyncio.run(
+            pipeline.run_async(
+                b"\x89PNG scanned lease", filename="a.png", document_type="kira_sozlesmesi"
+            )
+        )
+    finally:
+        pipeline.worker_pools.shutdown()
+
+    assert result.raw_text
+    assert len(digests) == 1
+    assert extractor.cache.stats.misses == 1
@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+from app.eval.eval_runner import FieldScore, evaluate, load_dataset, normalize_value
+
+
+class FixedLlmClient:
+    def extract_fields(self, raw_text, document_type, use_cache=True, fields=None):
+        return {"M2": {"value": "120", "confidence": 0.7, "source_quote": "120 m2"}}
+
+
+def write_document(directory, name, text, expected):
+    (directory / f"{name}.txt").write_text(text, encoding="utf-8")
+    (directory / f"{name}.expected.json").write_text(json.dumps(expected), encoding="utf-8")
+
+
+def test_evaluate_scores_fields_per_document(tmp_path, make_pipeline):
+    body = "Kira sozlesmesi\nAsgari Kira: 5000 TL\nBu metin yeterince uzun olsun diye eklendi.\n"
+    write_document(
+        tmp_path, "a", "Mahal Kodu: ABC123\n" + body, {"Mahal_Kodu": "ABC123", "M2": "120"}
+    )
+    write_document(tmp_path, "b", "Mahal Kodu: XYZ9\n" + body, {"Mahal_Kodu": "XYZ1", "M2": "95"})
+    (tmp_path / "notes.txt").write_text("no expectations, not part of the set")
+
+    documents = load_dataset(tmp_path)
+    report = asyncio.run(evaluate(make_pipeline(FixedLlmClient()), documents, concurrency=2))
+    summary = report.to_dict()
+
+    assert [document.path.name for document in documents] == ["a.txt", "b.txt"]
+    assert report.fields["Mahal_Kodu"].snapshot()["precision"] == 0.5
+    assert report.fields["M2"].recall == 0.5
+    # Asgari_Kira is found but not expected in either document.
+    assert report.fields["Asgari_Kira"].precision == 0.0
+    assert summary["failed"] == 0
+    assert "regex" in summary["stages_s"]
+    errors = {outcome.file: outcome.errors for outcome in report.documents}
+    assert errors["b.txt"]["Mahal_Kodu"] == {"expected": "XYZ1", "predicted": "XYZ9"}
+
+
+def test_values_match_ignoring_case_spacing_and_edge_punctuation():
+    score = FieldScore()
+
+    assert normalize_value(" Kiraya  Veren. ") == "kiraya veren"
+    assert normalize_value("%8") != normalize_value("8%")
+    assert score.add("8 %", "8%")
+    assert score.add(None, None)
+    assert not score.add("Var", None)
+    assert (score.true_positives, score.false_positives, score.false_negatives) == (1, 0, 1)
+
+
+def test_run_eval_leaves_the_global_settings_alone(monkeypatch, tmp_path, make_pipeline):
+    from app.core.config import get_settings
+    from app.eval import eval_runner
+
+    write_document(tmp_path, "a", "Mahal Kodu: ABC123\n", {"Mahal_Kodu": "ABC123"})
+    before = get_settings().model_dump()
+    seen = {}
+
+    def fake_build_pipeline(pools, settings):
+        seen["settings"] = settings
+        return make_pipeline(FixedLlmClient())
+
+    monkeypatch.setattr(eval_runner, "build_pipeline", fake_build_pipeline)
+    eval_runner.run_eval(tmp_path, concurrency=1)
+
+    assert get_settings().model_dump() == before
+    assert seen["settings"].llm_cache_dir == str(tmp_path / ".eval-cache" / "llm")
+
+
+def test_build_pipeline_applies_the_settings_it_is_given():
+    from app.core.config import get_settings
+    from app.services.pipeline import build_pipeline
+
+    settings = get_settings().model_copy(
+        update={
+            "ocr_dpi": 300,
+            "ocr_dpi_steps": [],
+            "ocr_escalation_confidence": 0.55,
+            "ollama_model": "override-model",
+            "ollama_base_urls": ["http://llm-a:11434", "http://llm-b:11434"],
+            "artifact_cache_enabled": False,
+            "llm_cache_enabled": False,
+        }
+    )
+
+    pipeline = build_pipeline(settings=settings)
+    try:
+        extractor = pipeline.deps.text_extractor
+        llm_client = pipeline.deps.llm_client
+        assert extractor.dpi_steps == (150, 225, 300)
+        assert extractor.escalation_confidence == 0.55
+        assert llm_client.model == "override-model"
+        assert [endpoint.url for endpoint in llm_client.router.endpoints] == [
+            "http://llm-a:11434",
+            "http://llm-b:11434",
+        ]
+    finally:
+        llm_client.close()
+    assert get_settings().ollama_model != "override-model"
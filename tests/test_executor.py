@@ -0,0 +1,86 @@
+import asyncio
+import math
+
+from app.core.config import get_settings
+from app.core.executor import WorkerPools
+from app.core.profiling import profile_request
+from app.services.merger import ResultMerger
+from app.services.ocr.tesseract_engine import TesseractOcrEngine
+from app.services.pipeline import ExtractionPipeline
+from app.services.regex_extractor import RegexExtractor
+from app.services.text_extractor import TextExtractor
+
+
+def test_worker_pools_run_cpu_in_process_pool():
+    pools = WorkerPools(cpu_workers=1, io_workers=1)
+    try:
+        result = asyncio.run(pools.run_cpu(math.factorial, 10))
+    finally:
+        pools.shutdown()
+
+    assert result == 3628800
+
+
+def test_pipeline_run_async_offloads_stages():
+    class DummyLlmClient:
+        def extract_fields(self, raw_text, document_type, use_cache=True, fields=None):
+            return {"M2": {"value": "120", "confidence": 0.7, "source_quote": "120 m2"}}
+
+    content = (
+        "Kira sozlesmesi\nMahal Kodu: ABC123\nAsgari Kira: 5000 TL\n"
+        "Bu metin yeterince uzun olsun diye eklendi."
+    ).encode("utf-8")
+
+    pools = WorkerPools(cpu_workers=0, io_workers=2)
+    extraction_pipeline = ExtractionPipeline(
+        text_extractor=TextExtractor(),
+        ocr_engine=TesseractOcrEngine(),
+        regex_extractor=RegexExtractor(),
+        llm_client=DummyLlmClient(),
+        merger=ResultMerger(),
+        pools=pools,
+    )
+    try:
+        result = asyncio.run(
+            extraction_pipeline.run_async(
+                content, filename="sample.txt", document_type="kira_sozlesmesi"
+            )
+        )
+    finally:
+        pools.shutdown()
+
+    field_map = {field.name: field for field in result.fields}
+    assert result.document_type == "kira_sozlesmesi"
+    assert field_map["Mahal_Kodu"].value == "ABC123"
+    assert field_map["M2"].source == "llm"
+
+
+def test_run_cpu_ships_worker_profile_back_to_the_session(monkeypatch, tmp_path):
+    monkeypatch.setattr(get_settings(), "profile_dir", str(tmp_path))
+    pools = WorkerPools(cpu_workers=1, io_workers=1)
+    try:
+        with profile_request(True) as session:
+            result = asyncio.run(pools.run_cpu(math.factorial, 10))
+    finally:
+        pools.shutdown()
+
+    assert result == 3628800
+    functions = {name for _, _, name in session.stats().stats}
+    assert any("factorial" in name for name in functions)
+    assert (tmp_path / f"{session.id}.prof").is_file()
+
+
+def test_saved_profiles_are_capped(tmp_path):
+    import os
+
+    from app.core.profiling import prune_profiles
+
+    for index in range(5):
+        path = tmp_path / f"{index}.prof"
+        path.write_bytes(b"")
+        os.utime(path, (index, index))
+    (tmp_path / "notes.txt").write_text("kept")
+
+    prune_profiles(tmp_path, max_files=2)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["3.prof", "4.prof", "notes.txt"]
@@ -0,0 +1,69 @@
+import asyncio
+
+from app.services.jobs import JobManager, JobQueueFullError
+
+
+def test_job_runs_to_completion_with_progress(make_pipeline, contract_text):
+    async def scenario():
+        jobs = JobManager(make_pipeline(), max_queue=2, workers=1, retention_seconds=60)
+        await jobs.start()
+        try:
+            job = jobs.submit(contract_text.encode("utf-8"), "sample.txt", "kira_sozlesmesi")
+            assert jobs.get(job.id).status == "queued"
+            for _ in range(100):
+                if job.finished_at:
+                    break
+                await asyncio.sleep(0.01)
+            return jobs.get(job.id).to_info()
+        finally:
+            await jobs.stop()
+
+    info = asyncio.run(scenario())
+
+    assert info.status == "succeeded"
+    assert info.stage == "done"
+    assert any(field.name == "Mahal_Kodu" for field in info.result.fields)
+
+
+def test_full_queue_rejects_with_retry_after(make_pipeline):
+    async def scenario():
+        # Not started: nothing drains the queue.
+        jobs = JobManager(make_pipeline(), max_queue=1, workers=2, retention_seconds=60)
+        jobs.submit(b"a", "a.txt", "kira_sozlesmesi")
+        try:
+            jobs.submit(b"b", "b.txt", "kira_sozlesmesi")
+        except JobQueueFullError as exc:
+            return exc.retry_after
+        return None
+
+    assert asyncio.run(scenario()) == 5
+
+
+def test_finished_jobs_expire_after_retention(make_pipeline):
+    async def scenario():
+        jobs = JobManager(make_pipeline(), max_queue=1, workers=1, retention_seconds=-1)
+        job = jobs.submit(b"a", "a.txt", "kira_sozlesmesi")
+        job.finished_at = 0.0
+        return jobs.get(job.id)
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_stop_fails_queued_jobs_and_deletes_their_uploads(tmp_path, make_pipeline):
+    spooled = tmp_path / "upload.pdf"
+    spooled.write_bytes(b"%PDF-1.4")
+
+    async def scenario():
+        # Not started: the job stays queued until stop().
+        jobs = JobManager(make_pipeline(), max_queue=2, workers=1, retention_seconds=60)
+        job = jobs.submit(spooled, "upload.pdf", "kira_sozlesmesi")
+        await jobs.stop()
+        return job
+
+    job = asyncio.run(scenario())
+
+    assert job.status == "failed"
+    assert job.error == "cancelled"
+    assert job.finished_at is not None
+    assert job.document is None
+    assert not spooled.exists()
@@ -0,0 +1,55 @@
+from app.services.cache import MemoryLruCache, TieredCache
+from app.services.llm.cache import LlmResponseCache, make_cache_key
+from app.services.llm.ollama_client import OllamaLlmClient
+
+
+class CountingOllamaClient(OllamaLlmClient):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    def _generate(self, prompt, fields):
+        self.calls += 1
+        return {"M2": {"value": "120", "confidence": 0.8, "source_quote": "120 m2"}}
+
+
+def make_cache(ttl_seconds=None):
+    return LlmResponseCache(TieredCache(MemoryLruCache(1024 * 1024, ttl_seconds)))
+
+
+def test_cache_key_depends_on_prompt_model_and_options():
+    key = make_cache_key("prompt", "llama3.1:8b", {"temperature": 0})
+
+    assert key == make_cache_key("prompt", "llama3.1:8b", {"temperature": 0})
+    assert key != make_cache_key("prompt", "llama3.1:70b", {"temperature": 0})
+    assert key != make_cache_key("prompt", "llama3.1:8b", {"temperature": 0.5})
+    assert key != make_cache_key("other", "llama3.1:8b", {"temperature": 0})
+
+
+def test_extract_fields_reuses_cached_response():
+    client = CountingOllamaClient(cache=make_cache())
+
+    first = client.extract_fields("Metin", "kira_sozlesmesi")
+    second = client.extract_fields("Metin", "kira_sozlesmesi")
+
+    assert first == second
+    assert client.calls == 1
+    assert client.cache.stats.memory_hits == 1
+
+
+def test_extract_fields_bypass_forces_fresh_call():
+    client = CountingOllamaClient(cache=make_cache())
+
+    client.extract_fields("Metin", "kira_sozlesmesi")
+    client.extract_fields("Metin", "kira_sozlesmesi", use_cache=False)
+
+    assert client.calls == 2
+
+
+def test_expired_entries_are_misses():
+    client = CountingOllamaClient(cache=make_cache(ttl_seconds=-1))
+
+    client.extract_fields("Metin", "kira_sozlesmesi")
+    client.extract_fields("Metin", "kira_sozlesmesi")
+
+    assert client.calls == 2
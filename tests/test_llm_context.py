@@ -0,0 +1,48 @@
+from app.services.llm.context import ContextSelector, estimate_tokens, fold
+
+
+def test_fold_preserves_length_and_strips_turkish_letters():
+    text = "ASGARİ KİRA Oranı Şartı"
+
+    assert fold(text) == "asgari kira orani sarti"
+    assert len(fold(text)) == len(text)
+
+
+def test_strip_repeated_edges_drops_headers_and_page_numbers():
+    pages = [
+        "XYZ AVM KIRA SOZLESMESI\n"
+        + "\n".join(f"Madde {index}.{line}: {'icerik ' * line}{'xyzw'[index - 1]}" for line in range(1, 8))
+        + f"\nSayfa {index} / 4"
+        for index in range(1, 5)
+    ]
+
+    cleaned = ContextSelector.strip_repeated_edges("\f".join(pages))
+
+    assert "XYZ AVM" not in cleaned
+    assert "Sayfa" not in cleaned
+    assert "Madde 3.1: icerik" in cleaned
+    assert "Madde 3.7:" in cleaned
+
+
+def test_select_keeps_anchor_windows_within_budget():
+    filler = "\n".join(f"Genel hukum satiri {index} taraflar arasinda." for index in range(400))
+    text = (
+        filler
+        + "\nAsgari Kira: 12.500 TL olarak belirlenmistir.\n"
+        + filler
+        + "\nCeza Bedeli: 50.000 TL odenecektir.\n"
+        + filler
+    )
+    selector = ContextSelector(token_budget=200, window_chars=80)
+
+    context = selector.select(text, ["Asgari_Kira", "Ceza_Bedeli"])
+
+    assert "Asgari Kira: 12.500 TL" in context
+    assert "Ceza Bedeli: 50.000 TL" in context
+    assert estimate_tokens(context) <= 200
+
+
+def test_select_returns_short_text_unchanged():
+    selector = ContextSelector(token_budget=200, window_chars=80)
+
+    assert selector.select("Mahal Kodu: A12") == "Mahal Kodu: A12"
@@ -0,0 +1,116 @@
+import time
+
+import pytest
+
+from app.core.config import get_settings
+from app.services.llm.ollama_client import OllamaLlmClient
+from app.services.llm.routing import EndpointRouter, NoEndpointAvailable
+from benchmarks.stub_ollama import StubOllama
+
+
+ANSWER = {"M2": {"value": "120", "confidence": 0.75, "source_quote": "120"}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_router_prefers_the_endpoint_with_fewest_requests_in_flight():
+    router = EndpointRouter(["http://a", "http://b"])
+
+    first = router.acquire()
+    second = router.acquire()
+    router.release(first, seconds=0.1)
+    third = router.acquire()
+
+    assert {first.url, second.url} == {"http://a", "http://b"}
+    assert third is first
+
+
+def test_breaker_ejects_then_half_opens_for_one_trial():
+    clock = FakeClock()
+    router = EndpointRouter(
+        ["http://a", "http://b"], failure_threshold=2, eject_seconds=10, clock=clock
+    )
+    a = router.endpoints[0]
+    for _ in range(2):
+        router.release(router.acquire(exclude=[router.endpoints[1]]), failed=True)
+
+    with pytest.raises(NoEndpointAvailable):
+        router.acquire(exclude=[router.endpoints[1]])
+
+    clock.now += 10
+    trial = router.acquire(exclude=[router.endpoints[1]])
+    assert trial is a
+    with pytest.raises(NoEndpointAvailable):
+        router.acquire(exclude=[router.endpoints[1]])
+    # A failed trial reopens the breaker straight away.
+    router.release(trial, failed=True)
+    with pytest.raises(NoEndpointAvailable):
+        router.acquire(exclude=[router.endpoints[1]])
+
+
+def test_probe_readmits_an_ejected_endpoint():
+    healthy = set()
+    router = EndpointRouter(["http://a"], failure_threshold=1, probe=healthy.__contains__)
+    router.release(router.acquire(), failed=True)
+
+    router.probe_ejected()
+    with pytest.raises(NoEndpointAvailable):
+        router.acquire()
+
+    healthy.add("http://a")
+    router.probe_ejected()
+    assert router.acquire().url == "http://a"
+    router.close()
+
+
+def test_client_fails_over_to_a_healthy_host_and_ejects_the_bad_one(monkeypatch):
+    monkeypatch.setattr(get_settings(), "ollama_failure_threshold", 1)
+    with StubOllama(fail_status=503) as bad, StubOllama(answers={"M2": "120"}) as good:
+        client = OllamaLlmClient(endpoints=[bad.url, good.url], cache=None)
+        try:
+            for _ in range(3):
+                assert client.extract_fields("Kiralanan alan 120 m2", "kira", fields=["M2"]) == ANSWER
+        finally:
+            client.close()
+
+    assert bad.requests == 1
+    assert good.requests == 3
+
+
+def test_client_returns_empty_quickly_when_no_host_answers():
+    with StubOllama(fail_status=500) as first, StubOllama(fail_status=500) as second:
+        client = OllamaLlmClient(endpoints=[first.url, second.url], cache=None)
+        try:
+            assert client.extract_fields("Kiralanan alan 120 m2", "kira", fields=["M2"]) == {}
+        finally:
+            client.close()
+
+    assert first.requests == second.requests == 1
+
+
+def test_slow_call_is_hedged_to_another_host(monkeypatch):
+    monkeypatch.setattr(get_settings(), "ollama_hedge_percentile", 95)
+    monkeypatch.setattr(get_settings(), "ollama_hedge_min_samples", 5)
+    with StubOllama(latency=2.0, answers={"M2": "120"}) as slow, StubOllama(
+        answers={"M2": "120"}
+    ) as fast:
+        client = OllamaLlmClient(endpoints=[slow.url, fast.url], cache=None)
+        client.stream = True
+        for endpoint in client.router.endpoints:
+            endpoint.latencies.extend([0.05] * 5)
+        try:
+            start = time.perf_counter()
+            result = client.extract_fields("Kiralanan alan 120 m2", "kira", fields=["M2"])
+            elapsed = time.perf_counter() - start
+        finally:
+            client.close()
+
+    assert result == ANSWER
+    assert elapsed < 1.0
+    assert slow.requests == fast.requests == 1
@@ -0,0 +1,72 @@
+import json
+
+from app.services.llm.ollama_client import OllamaLlmClient
+from app.services.llm.streaming import IncrementalFieldParser
+
+
+OUTPUT = (
+    '{"M2": {"value": "120", "confidence": 0.8, "source_quote": "120 m2, {x}"},'
+    ' "Ceza_Bedeli": {"value": "5.000 \\"TL\\"", "confidence": 0.7, "source_quote": null}}'
+)
+
+
+def test_parser_emits_members_as_they_close():
+    parser = IncrementalFieldParser(["M2", "Ceza_Bedeli"])
+
+    for index in range(0, len(OUTPUT), 3):
+        parser.feed(OUTPUT[index : index + 3])
+        if "Ceza_Bedeli" not in OUTPUT[: index + 3]:
+            assert not parser.complete
+
+    assert parser.complete
+    assert parser.values == json.loads(OUTPUT)
+
+
+def test_parser_is_complete_before_closing_brace():
+    parser = IncrementalFieldParser(["M2"])
+
+    parser.feed(OUTPUT[: OUTPUT.index(', "Ceza_Bedeli"')])
+
+    assert parser.complete
+    assert parser.values["M2"]["value"] == "120"
+
+
+class FakeStreamResponse:
+    def __init__(self, chunks):
+        self.lines = [json.dumps({"response": chunk, "done": False}) for chunk in chunks]
+        self.consumed = 0
+        self.closed = False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        for line in self.lines:
+            self.consumed += 1
+            yield line.encode("utf-8")
+
+    def close(self):
+        self.closed = True
+
+
+def test_streaming_generation_stops_once_fields_are_complete():
+    chunks = [OUTPUT[index : index + 5] for index in range(0, len(OUTPUT), 5)]
+    chunks += [" trailing chatter"] * 10
+    fake_response = FakeStreamResponse(chunks)
+    client = OllamaLlmClient(cache=None)
+    client.stream = True
+    sent = {}
+
+    def fake_post(url, json=None, timeout=None, stream=False):
+        sent.update(json)
+        return fake_response
+
+    client.session.post = fake_post
+
+    result = client.extract_fields("Metin", "kira_sozlesmesi", fields=["M2"])
+
+    assert result["M2"]["value"] == "120"
+    assert sent["stream"] is True
+    assert list(sent["format"]["properties"]) == ["M2"]
+    assert fake_response.closed
+    assert fake_response.consumed < len(OUTPUT) // 5
@@ -0,0 +1,63 @@
+import json
+import logging
+
+from prometheus_client import generate_latest
+
+from app.core.metrics import REGISTRY, record_stage, register_ocr_stats, request_timings
+from app.services.text_extractor import OcrStats, PageText
+
+
+def test_requests_are_tagged_timed_and_exported(caplog, make_client, contract_text):
+    client = make_client()
+
+    with caplog.at_level(logging.INFO, logger="app.requests"):
+        response = client.post(
+            "/v1/extract/",
+            files={"file": ("sample.txt", contract_text.encode("utf-8"), "text/plain")},
+            headers={"X-Request-ID": "req-42"},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["X-Request-ID"] == "req-42"
+    assert "pipeline;dur=" in response.headers["Server-Timing"]
+    [record] = [
+        json.loads(record.getMessage())
+        for record in caplog.records
+        if record.name == "app.requests"
+    ]
+    assert record["request_id"] == "req-42"
+    assert record["status"] == 200
+    assert {"pipeline", "text_extraction", "regex", "llm", "merge"} <= set(record["stages_ms"])
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert 'rda_stage_duration_seconds_count{stage="regex"}' in metrics.text
+    assert 'rda_pages_total{source="native"}' in metrics.text
+    assert 'route="/v1/extract/"' in metrics.text
+
+
+def test_request_owner_does_not_join_an_inherited_collection():
+    with request_timings() as previous:
+        record_stage("ocr", 1.0)
+        # A keep-alive connection's next request may start in this context.
+        with request_timings(join=False) as current:
+            with request_timings() as nested:
+                record_stage("ocr", 0.5)
+
+    assert nested is current
+    assert current == {"ocr": 0.5}
+    assert previous == {"ocr": 1.0}
+
+
+def test_ocr_stats_are_exported():
+    stats = OcrStats()
+    stats.record(
+        PageText(index=0, text="a", confidence=0.9, source="ocr", dpi=300, rendered_dpis=[200, 300])
+    )
+    register_ocr_stats(stats)
+
+    exported = generate_latest(REGISTRY).decode()
+
+    assert 'rda_ocr_page_renders_total{dpi="200"} 1.0' in exported
+    assert 'rda_ocr_page_renders_total{dpi="300"} 1.0' in exported
+    assert "rda_ocr_escalation_ratio 1.0" in exported
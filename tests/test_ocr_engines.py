@@ -0,0 +1,44 @@
+import pytest
+
+from app.core.config import Settings
+from app.services.ocr import tesserocr_engine
+from app.services.ocr.tesseract_engine import TesseractOcrEngine
+from app.services.ocr.tesserocr_engine import TesserocrEngine
+from app.services.pipeline import build_ocr_engine
+
+
+def test_build_ocr_engine_follows_settings(monkeypatch):
+    assert type(build_ocr_engine(Settings(ocr_engine="tesseract"))) is TesseractOcrEngine
+
+    monkeypatch.setattr(tesserocr_engine, "tesserocr", object())
+    assert isinstance(build_ocr_engine(Settings(ocr_engine="TESSEROCR")), TesserocrEngine)
+
+    with pytest.raises(ValueError):
+        build_ocr_engine(Settings(ocr_engine="unknown"))
+
+
+def test_tesserocr_engine_requires_the_optional_package(monkeypatch):
+    monkeypatch.setattr(tesserocr_engine, "tesserocr", None)
+
+    with pytest.raises(RuntimeError, match="tesserocr"):
+        TesserocrEngine()
+
+
+def test_upscale_retry_defaults_on_only_for_the_warm_engine(monkeypatch):
+    monkeypatch.setattr(tesserocr_engine, "tesserocr", object())
+
+    assert TesseractOcrEngine().upscale_retry_confidence == 0.0
+    assert TesserocrEngine().upscale_retry_confidence == 0.6
+    assert TesseractOcrEngine(upscale_retry_confidence=0.5).upscale_retry_confidence == 0.5
+
+
+def test_build_ocr_engine_passes_upscale_retry_settings():
+    engine = build_ocr_engine(
+        Settings(
+            ocr_engine="tesseract",
+            ocr_upscale_retry_confidence=0.4,
+            ocr_upscale_retry_max_words=3,
+        )
+    )
+
+    assert (engine.upscale_retry_confidence, engine.upscale_retry_max_words) == (0.4, 3)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from app.services.ocr.tesseract_engine import PSM_SINGLE_WORD, TesseractOcrEngine
+from app.services.ocr.words import OcrWords
+
+
+def tesseract_data(rows):
+    """image_to_data DICT output for (line_num, text, conf, left) word rows."""
+    data = {
+        name: []
+        for name in (
+            "page_num", "block_num", "par_num", "line_num",
+            "left", "top", "width", "height", "conf", "text",
+        )
+    }
+    # A block-level row without text, as Tesseract emits.
+    rows = [(0, "", -1, 0)] + rows
+    for line_num, text, conf, left in rows:
+        values = (1, 1, 1, line_num, left, 20 * line_num, 40, 16, conf, text)
+        for name, value in zip(data, values):
+            data[name].append(value)
+    return data
+
+
+def test_words_keep_line_breaks_and_columns():
+    words = OcrWords.from_tesseract_data(
+        tesseract_data([(1, "Mahal", 90, 0), (1, "Kodu:", 80, 50), (2, "ABC123", 40, 0)])
+    )
+
+    assert words.text == "Mahal Kodu:\nABC123"
+    assert words.line_ids.tolist() == [0, 0, 1]
+    assert words.boxes.shape == (3, 4)
+    assert words.mean_confidence() == pytest.approx(0.7)
+    assert words.weak(0.6).tolist() == [2]
+
+
+def test_engine_rereads_only_weak_words():
+    page = OcrWords.from_tesseract_data(
+        tesseract_data([(1, "Asgari", 95, 0), (1, "Kira:", 90, 50), (2, "5OOO", 30, 0)])
+    )
+    regions = []
+
+    class FakeEngine(TesseractOcrEngine):
+        def _ocr_words(self, image, psm=None):
+            if psm is None:
+                return page
+            regions.append((psm, image.shape))
+            return OcrWords.from_tesseract_data(tesseract_data([(1, "5000", 93, 0)]))
+
+    engine = FakeEngine(
+        upscale_retry_confidence=0.6, upscale_retry_scale=2.0, upscale_retry_max_words=5
+    )
+    text, confidence = engine.run(np.full((100, 200), 255, dtype=np.uint8))
+
+    assert text == "Asgari Kira:\n5000"
+    assert confidence == pytest.approx((0.95 + 0.90 + 0.93) / 3)
+    # One 40x16 word box at the left edge, padded by 4px, upscaled twice.
+    assert regions == [(PSM_SINGLE_WORD, (48, 88))]
@@ -0,0 +1,104 @@
+import cv2
+import numpy as np
+
+from app.services.ocr.preprocess import PagePreprocessor
+from app.services.text_extractor import TextExtractor
+
+
+def make_page(skew=0.0):
+    page = np.full((800, 1000, 3), 255, dtype=np.uint8)
+    for row in range(8):
+        cv2.putText(
+            page, "Asgari Kira 5000 TL", (300, 300 + 40 * row),
+            cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2,
+        )
+    if skew:
+        matrix = cv2.getRotationMatrix2D((500, 400), skew, 1.0)
+        page = cv2.warpAffine(page, matrix, (1000, 800), borderValue=(255, 255, 255))
+    return page
+
+
+def test_blank_pages_are_detected_despite_scanner_noise():
+    rng = np.random.default_rng(0)
+    page = np.clip(rng.normal(245, 3, (800, 1000)), 0, 255).astype(np.uint8)
+    page[100:102, 100:102] = 0  # dust speck
+
+    prepared = PagePreprocessor().run(page)
+
+    assert prepared.blank
+    assert prepared.image is None
+    assert prepared.ocr_pixels == 0
+
+
+def test_page_is_cropped_to_text_and_deskewed():
+    straight = PagePreprocessor().run(make_page())
+    skewed = PagePreprocessor(deskew=True).run(make_page(skew=4))
+
+    assert not straight.blank
+    assert straight.image.ndim == 2
+    assert straight.ocr_pixels < straight.page_pixels / 3
+    assert abs(abs(skewed.skew_angle) - 4) < 0.5
+
+
+def test_extractor_skips_blank_pages_and_reports_trimming(monkeypatch):
+    class CountingOcrEngine:
+        def __init__(self):
+            self.calls = 0
+
+        def run(self, image):
+            self.calls += 1
+            return "Asgari Kira 5000 TL", 0.9
+
+    pages = {1: make_page(), 2: np.full((800, 1000, 3), 255, dtype=np.uint8)}
+    monkeypatch.setattr(TextExtractor, "_count_pdf_pages", staticmethod(lambda path: 2))
+    monkeypatch.setattr(
+        TextExtractor,
+        "_load_pdf_page",
+        staticmethod(lambda pdf_path, page_number, dpi: pages[page_number]),
+    )
+    engine = CountingOcrEngine()
+    extractor = TextExtractor(ocr_engine=engine, dpi=200, preprocessor=PagePreprocessor())
+
+    extracted = extractor.extract_document(b"%PDF-1.4 scanned", document_type="scan.pdf")
+
+    assert engine.calls == 1
+    assert [page.blank for page in extracted.pages] == [False, True]
+    stats = extractor.ocr_stats.snapshot()
+    assert stats["blank_pages"] == 1
+    assert stats["trimmed_ratio"] > 0.8
+
+
+def test_one_line_signature_page_is_still_read(monkeypatch):
+    rng = np.random.default_rng(1)
+    # A4 at 200 DPI with light scanner noise and a single line of text.
+    page = np.clip(rng.normal(245, 3, (2339, 1654)), 0, 255).astype(np.uint8)
+    cv2.putText(page, "Kiraci: Ahmet Yilmaz", (200, 2000), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2)
+
+    class SignatureOcrEngine:
+        def run(self, image):
+            return "Kiraci: Ahmet Yilmaz", 0.9
+
+    monkeypatch.setattr(TextExtractor, "_count_pdf_pages", staticmethod(lambda path: 1))
+    monkeypatch.setattr(
+        TextExtractor, "_load_pdf_page", staticmethod(lambda pdf_path, page_number, dpi: page)
+    )
+    extractor = TextExtractor(
+        ocr_engine=SignatureOcrEngine(), dpi=200, preprocessor=PagePreprocessor()
+    )
+
+    extracted = extractor.extract_document(b"%PDF-1.4 scanned", document_type="annex.pdf")
+
+    assert extracted.text == "Kiraci: Ahmet Yilmaz"
+    assert not extracted.pages[0].blank
+    assert extracted.pages[0].ocr_pixels < extracted.pages[0].page_pixels / 100
+
+
+def test_blank_thresholds_come_from_settings():
+    from app.core.config import Settings
+    from app.services.pipeline import build_page_preprocessor
+
+    preprocessor = build_page_preprocessor(
+        Settings(ocr_blank_ink_ratio=0.001, ocr_blank_min_contrast=16)
+    )
+
+    assert (preprocessor.blank_ink_ratio, preprocessor.min_contrast) == (0.001, 16)
@@ -0,0 +1,58 @@
+from app.services.regex_extractor import RegexExtractor
+
+
+def test_scan_returns_every_candidate_with_offsets_and_pages():
+    text = "Mahal Kodu: A1\nAlan 120 m2\fEk protokol\nMahal Kodu: B2\nAlan 95,5 m2"
+    extractor = RegexExtractor()
+
+    candidates = extractor.scan(text)
+
+    assert [(c.name, c.value, c.page) for c in candidates] == [
+        ("Mahal_Kodu", "A1", 0),
+        ("M2", "120", 0),
+        ("Mahal_Kodu", "B2", 1),
+        ("M2", "95,5", 1),
+    ]
+    for candidate in candidates:
+        assert text[candidate.start : candidate.end] == candidate.value
+
+
+def test_extract_by_regex_keeps_first_hit_and_overlapping_labels():
+    text = (
+        "Dekorasyon Koordinasyon: Kiraci\n"
+        "Mali Sorumluluk Sigortasi: Var\n"
+        "Asgari Kira: 5000\n"
+        "Asgari Kira: 9999\n"
+    )
+
+    results = RegexExtractor().extract_by_regex(text)
+
+    assert results["Asgari_Kira"].value == "5000"
+    assert results["Asgari_Kira"].source_quote == "Asgari Kira: 5000"
+    assert results["Mali_Sorumluluk_Sigortasi"].value.startswith("Var")
+    assert results["Dekorasyon_Koordinasyon"].confidence == 0.95
+
+
+def scan_per_field(extractor, text):
+    """Reference result: one finditer per field, as before the single pass."""
+    return sorted(
+        (match.start("value"), name, match.group("value").strip())
+        for name, pattern in extractor.patterns.items()
+        for match in pattern.finditer(text)
+    )
+
+
+def test_iter_scan_matches_per_field_scan_on_overlapping_and_nested_labels():
+    extractor = RegexExtractor()
+    texts = [
+        "Bir Yil Uzama Ciro Kira Orani: 5%",
+        "Bir Yil Uzama Ciro Kira: 3% Ciro Kira Orani: 7%",
+        "Dekorasyon Koordinasyon: Mahal Kodu: X9 Gecikme Faizi: 2%",
+        "Alan 120 m2, depo 35,5 m2\fMahal_Kodu A7 Ceza Bedeli 1.000",
+    ]
+
+    for text in texts:
+        single = sorted((c.start, c.name, c.value) for c in extractor.iter_scan(text))
+        assert single == scan_per_field(extractor, text), text
+
+    assert extractor.extract(texts[0])["Ciro_Kira_Orani"] == "5%"
@@ -1,3 +1,5 @@
+import pytest
+
 from app.services.text_extractor import TextExtractor
 
 
@@ -29,3 +31,209 @@ def test_extract_text_from_plain_text():
     assert text == "Mahal Kodu: ABC123"
     assert confidence is None
     assert source == "native"
+
+
+def test_extract_text_reads_spooled_file_by_path(tmp_path):
+    extractor = TextExtractor()
+    path = tmp_path / "upload.txt"
+    path.write_bytes("Mahal Kodu: ABC123".encode("utf-8"))
+
+    text, _, source = extractor.extract_text(path, document_type="sample.txt")
+    assert (text, source) == ("Mahal Kodu: ABC123", "native")
+
+    empty = tmp_path / "empty.pdf"
+    empty.write_bytes(b"")
+    assert extractor.extract_text(empty, document_type="empty.pdf") == ("", None, "ocr")
+
+
+def test_extract_text_ocrs_every_pdf_page_in_order(monkeypatch):
+    import numpy as np
+
+    class PageNumberOcrEngine:
+        def run(self, image):
+            page_number = int(image[0, 0, 0])
+            return f"Sayfa {page_number}", page_number / 10
+
+    rendered = []
+
+    def fake_load_pdf_page(pdf_path, page_number, dpi):
+        rendered.append((page_number, dpi))
+        return np.full((2, 2, 3), page_number, dtype=np.uint8)
+
+    monkeypatch.setattr(TextExtractor, "_count_pdf_pages", staticmethod(lambda path: 3))
+    monkeypatch.setattr(TextExtractor, "_load_pdf_page", staticmethod(fake_load_pdf_page))
+
+    extractor = TextExtractor(ocr_engine=PageNumberOcrEngine(), dpi=200, max_pages_in_flight=2)
+    text, confidence, source = extractor.extract_text(b"%PDF-1.4 scanned", document_type="scan.pdf")
+
+    assert text == "Sayfa 1\fSayfa 2\fSayfa 3"
+    assert source == "ocr"
+    assert confidence == pytest.approx(0.2)
+    assert rendered == [(1, 200), (2, 200), (3, 200)]
+
+
+def test_extract_document_ocrs_only_pages_without_a_text_layer(monkeypatch):
+    import numpy as np
+
+    digital = "Kira sozlesmesi madde 1: Mahal Kodu ABC123, Asgari Kira 5000 TL."
+
+    class PageNumberOcrEngine:
+        def run(self, image):
+            return f"Imza sayfasi {int(image[0, 0, 0])}", 0.8
+
+    def fail_pypdf(file_obj):
+        raise AssertionError("pypdf must not reparse a PDF pdfplumber could read")
+
+    rendered = []
+
+    def fake_load_pdf_page(pdf_path, page_number, dpi):
+        rendered.append(page_number)
+        return np.full((2, 2, 3), page_number, dtype=np.uint8)
+
+    monkeypatch.setattr(
+        TextExtractor,
+        "_extract_pdfplumber",
+        staticmethod(lambda file_obj: [digital, "(cid:3)(cid:4) ", digital]),
+    )
+    monkeypatch.setattr(TextExtractor, "_extract_pypdf", staticmethod(fail_pypdf))
+    monkeypatch.setattr(TextExtractor, "_load_pdf_page", staticmethod(fake_load_pdf_page))
+
+    extractor = TextExtractor(ocr_engine=PageNumberOcrEngine())
+    extracted = extractor.extract_document(b"%PDF-1.4 mixed", document_type="mixed.pdf")
+
+    assert rendered == [2]
+    assert extracted.source == "hybrid"
+    assert [page.source for page in extracted.pages] == ["native", "ocr", "native"]
+    assert extracted.text == f"{digital}\fImza sayfasi 2\f{digital}"
+    assert extracted.confidence == pytest.approx(0.8)
+
+
+def test_adaptive_ocr_rerenders_only_low_confidence_pages(monkeypatch):
+    import numpy as np
+
+    class BlurryPageOcrEngine:
+        # Page 2 only reads well from the 300 DPI render.
+        def run(self, image):
+            page_number, dpi = int(image[0, 0, 0]), int(image[0, 0, 1]) * 100
+            confidence = 0.5 if page_number == 2 and dpi < 300 else 0.9
+            return f"Sayfa {page_number} @{dpi}", confidence
+
+    rendered = []
+
+    def fake_load_pdf_page(pdf_path, page_number, dpi):
+        rendered.append((page_number, dpi))
+        image = np.zeros((2, 2, 3), dtype=np.uint8)
+        image[0, 0] = (page_number, dpi // 100, 0)
+        return image
+
+    monkeypatch.setattr(TextExtractor, "_count_pdf_pages", staticmethod(lambda path: 3))
+    monkeypatch.setattr(TextExtractor, "_load_pdf_page", staticmethod(fake_load_pdf_page))
+
+    extractor = TextExtractor(
+        ocr_engine=BlurryPageOcrEngine(), dpi_steps=[200, 300, 400], escalation_confidence=0.8
+    )
+    extracted = extractor.extract_document(b"%PDF-1.4 scanned", document_type="scan.pdf")
+
+    assert sorted(rendered) == [(1, 200), (2, 200), (2, 300), (3, 200)]
+    assert [page.dpi for page in extracted.pages] == [200, 300, 200]
+    assert extracted.text == "Sayfa 1 @200\fSayfa 2 @300\fSayfa 3 @200"
+    assert extractor.ocr_stats.snapshot() == {
+        "pages": 3,
+        "escalated": 1,
+        "escalation_rate": pytest.approx(1 / 3),
+        "blank_pages": 0,
+        "trimmed_ratio": 0.0,
+        "renders": {200: 3, 300: 1},
+    }
+
+
+def test_escalation_is_counted_when_the_first_render_reads_best(monkeypatch):
+    import numpy as np
+
+    from app.core.metrics import OCR_ESCALATIONS
+
+    class SharperIsWorseOcrEngine:
+        # Confidence drops at higher DPI: every page escalates to the end,
+        # yet the 200 DPI read wins.
+        def run(self, image):
+            dpi = int(image[0, 0, 1]) * 100
+            return f"Sayfa @{dpi}", {200: 0.6, 300: 0.5, 400: 0.4}[dpi]
+
+    def fake_load_pdf_page(pdf_path, page_number, dpi):
+        image = np.zeros((2, 2, 3), dtype=np.uint8)
+        image[0, 0] = (page_number, dpi // 100, 0)
+        return image
+
+    monkeypatch.setattr(TextExtractor, "_count_pdf_pages", staticmethod(lambda path: 2))
+    monkeypatch.setattr(TextExtractor, "_load_pdf_page", staticmethod(fake_load_pdf_page))
+    extractor = TextExtractor(
+        ocr_engine=SharperIsWorseOcrEngine(), dpi_steps=[200, 300, 400], escalation_confidence=0.8
+    )
+    before = OCR_ESCALATIONS._value.get()
+
+    extracted = extractor.extract_document(b"%PDF-1.4 scanned", document_type="scan.pdf")
+
+    assert [page.dpi for page in extracted.pages] == [200, 200]
+    assert [page.rendered_dpis for page in extracted.pages] == [[200, 300, 400]] * 2
+    stats = extractor.ocr_stats.snapshot()
+    assert stats["escalated"] == 2
+    assert stats["renders"] == {200: 2, 300: 2, 400: 2}
+    assert OCR_ESCALATIONS._value.get() == before + 2
+
+
+def test_artifact_cache_key_follows_the_upscale_retry_settings():
+    from app.services.ocr.tesseract_engine import TesseractOcrEngine
+
+    plain = TextExtractor(ocr_engine=TesseractOcrEngine(upscale_retry_confidence=0))
+    retrying = TextExtractor(ocr_engine=TesseractOcrEngine(upscale_retry_confidence=0.6))
+
+    key = plain._cache_key(b"%PDF", is_pdf=True)
+    assert key.startswith("text:v3:")
+    assert key != retrying._cache_key(b"%PDF", is_pdf=True)
+
+
+def test_pages_are_ocred_in_batches_per_task(monkeypatch):
+    import numpy as np
+
+    from app.services.ocr.words import OcrWords
+
+    class BatchingOcrEngine:
+        def __init__(self):
+            self.batches = []
+
+        def read_batch(self, images):
+            self.batches.append([int(image[0, 0, 0]) for image in images])
+            return [
+                OcrWords(
+                    words=["Sayfa", str(int(image[0, 0, 0]))],
+                    boxes=np.zeros((2, 4), dtype=np.int32),
+                    confidences=np.full(2, 0.9, dtype=np.float32),
+                    line_ids=np.zeros(2, dtype=np.int32),
+                )
+                for image in images
+            ]
+
+    monkeypatch.setattr(TextExtractor, "_count_pdf_pages", staticmethod(lambda path: 3))
+    monkeypatch.setattr(
+        TextExtractor,
+        "_load_pdf_page",
+        staticmethod(lambda path, number, dpi: np.full((2, 2, 3), number, dtype=np.uint8)),
+    )
+    engine = BatchingOcrEngine()
+    extractor = TextExtractor(ocr_engine=engine, dpi=200, pages_per_task=2)
+
+    extracted = extractor.extract_document(b"%PDF-1.4 scanned", document_type="scan.pdf")
+
+    assert engine.batches == [[1, 2], [3]]
+    assert extracted.text == "Sayfa 1\fSayfa 2\fSayfa 3"
+    # The word columns stay available on the pages.
+    assert extracted.pages[2].words.words == ["Sayfa", "3"]
+
+
+def test_dpi_steps_follow_ocr_dpi(monkeypatch):
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "ocr_dpi", 300)
+    monkeypatch.setattr(get_settings(), "ocr_dpi_steps", [])
+
+    assert TextExtractor().dpi_steps == (150, 225, 300)